@@ -11,6 +11,7 @@ be used to build database driven apps.
 Read the documentation: https://frappeframework.com/docs
 """
 
+import copy
 import faulthandler
 import functools
 import gc
@@ -91,6 +92,10 @@ STANDARD_USERS = ("Guest", "Administrator")
 _one_time_setup = {}
 _dev_server = int(sbool(os.environ.get("DEV_SERVER", False)))
 _tune_gc = bool(sbool(os.environ.get("FRAPPE_TUNE_GC", True)))
+# set in workers that run jobs in their own process, see `frappe.utils.background_jobs.WarmFrappeWorker`
+_warm_worker = False
+# (sites_path, site_path) -> (mtimes of config files, site config), used by warm workers
+_site_config_cache: dict[tuple[str, str], tuple[tuple, dict]] = {}
 
 if _dev_server:
 	warnings.simplefilter("always", DeprecationWarning)
@@ -225,7 +230,7 @@ def init(site: str, sites_path: str = ".", new_site: bool = False, force=False)
 	local.response = _dict({"docs": []})
 	local.task_id = None
 
-	local.conf = _dict(get_site_config())
+	local.conf = _dict(_get_warm_site_config() if _warm_worker else get_site_config())
 	local.lang = local.conf.lang or "en"
 
 	local.module_app = None
@@ -379,6 +384,32 @@ def get_site_config(sites_path: str | None = None, site_path: str | None = None)
 	return config
 
 
+def _get_warm_site_config() -> dict[str, Any]:
+	"""`get_site_config` kept across jobs of a warm worker until config files are modified."""
+
+	def get_mtime(path):
+		try:
+			return os.stat(path).st_mtime_ns
+		except FileNotFoundError:
+			return None
+
+	key = (local.sites_path, local.site_path)
+	mtimes = (
+		get_mtime(os.path.join(local.sites_path, "common_site_config.json")),
+		get_mtime(os.path.join(local.site_path, "site_config.json")),
+	)
+
+	cached = _site_config_cache.get(key)
+	if cached and cached[0] == mtimes:
+		return copy.deepcopy(cached[1])
+
+	config = get_site_config()
+	# config of hooks can change without changes to files
+	if not config.get("extra_config"):
+		_site_config_cache[key] = (mtimes, copy.deepcopy(config))
+	return config
+
+
 def get_common_site_config(sites_path: str | None = None) -> dict[str, Any]:
 	"""Returns common site config as dictionary.
 
@@ -883,9 +914,11 @@ def read_only():
 		def wrapper_fn(*args, **kwargs):
 			# frappe.read_only could be called from nested functions, in such cases don't swap the
 			# connection again.
-			switched_connection = False
+			switched_connection = routed_reads = False
 			if conf.read_from_replica:
 				switched_connection = connect_replica()
+			elif db := getattr(local, "db", None):
+				routed_reads = db.route_reads_to_replica()
 
 			try:
 				retval = fn(*args, **get_newargs(fn, kwargs))
@@ -893,6 +926,8 @@ def read_only():
 				if switched_connection and local and hasattr(local, "primary_db"):
 					local.db.close()
 					local.db = local.primary_db
+				elif routed_reads:
+					local.db.stop_routing_reads_to_replica()
 
 			return retval
 
@@ -1215,14 +1250,19 @@ def get_document_cache_key(doctype: str, name: str):
 	return f"document_cache::{doctype}::{name}"
 
 
-def clear_document_cache(doctype: str, name: str | None = None) -> None:
+def clear_document_cache(doctype: str, name: str | list[str] | None = None) -> None:
 	def clear_in_redis():
-		if name is not None:
-			cache.delete_value(get_document_cache_key(doctype, name))
-		else:
+		if name is None:
 			cache.delete_keys(get_document_cache_key(doctype, ""))
+		elif isinstance(name, list | tuple | set):
+			cache.delete_value([get_document_cache_key(doctype, n) for n in name])
+		else:
+			cache.delete_value(get_document_cache_key(doctype, name))
 
 	clear_in_redis()
+	if hasattr(db, "value_loader"):
+		db.value_loader.clear(doctype, name)
+
 	if hasattr(db, "after_commit"):
 		db.after_commit.add(clear_in_redis)
 		db.after_rollback.add(clear_in_redis)
@@ -1235,6 +1275,13 @@ def clear_document_cache(doctype: str, name: str | None = None) -> None:
 
 
 def get_cached_value(doctype: str, name: str, fieldname: str = "name", as_dict: bool = False) -> Any:
+	if db and not (as_dict and isinstance(fieldname, str)):
+		from frappe.database.loader import NOT_LOADED
+
+		value = db.value_loader.get_value(doctype, name, fieldname, as_dict=as_dict)
+		if value is not NOT_LOADED:
+			return value
+
 	try:
 		doc = get_cached_doc(doctype, name)
 	except DoesNotExistError:
@@ -2248,6 +2295,20 @@ def enqueue(*args, **kwargs):
 	return frappe.utils.background_jobs.enqueue(*args, **kwargs)
 
 
+def enqueue_many(*args, **kwargs):
+	"""
+	Enqueue many methods to be executed using background workers with a few round trips to redis
+
+	:param jobs: list of dicts with `method`, `kwargs` and optionally other arguments of `enqueue`
+	:param queue: (optional) should be either long, default or short
+	:param timeout: (optional) should be set according to the functions
+	:param deduplicate: (optional) do not re-queue jobs that are already queued, requires `job_id` in jobs
+	"""
+	import frappe.utils.background_jobs
+
+	return frappe.utils.background_jobs.enqueue_many(*args, **kwargs)
+
+
 def task(**task_kwargs):
 	def decorator_task(f):
 		f.enqueue = lambda **fun_kwargs: enqueue(f, **task_kwargs, **fun_kwargs)
@@ -43,6 +43,7 @@ global_cache_keys = (
 	"information_schema:counts",
 	"db_tables",
 	"server_script_autocompletion_items",
+	"report_result_sources",
 	*doctype_map_keys,
 )
 
@@ -87,7 +88,7 @@ def clear_user_cache(user=None):
 	if user:
 		for name in user_cache_keys:
 			frappe.cache.hdel(name, user)
-		frappe.cache.delete_keys("user:" + user)
+		frappe.cache.delete_keys(f"user:{user}:")
 		clear_defaults_cache(user)
 	else:
 		for name in user_cache_keys:
@@ -102,12 +103,14 @@ def clear_domain_cache(user=None):
 
 
 def clear_global_cache():
+	from frappe.utils.process_cache import clear_process_cache
 	from frappe.website.utils import clear_website_cache
 
 	clear_doctype_cache()
 	clear_website_cache()
 	frappe.cache.delete_value(global_cache_keys)
 	frappe.cache.delete_value(bench_cache_keys)
+	clear_process_cache(frappe.cache)
 	frappe.setup_module_map()
 
 
@@ -127,13 +130,22 @@ def clear_doctype_cache(doctype=None):
 		frappe.db.after_commit.add(lambda: _clear_doctype_cache_from_redis(doctype))
 		frappe.db.after_rollback.add(lambda: _clear_doctype_cache_from_redis(doctype))
 
+		if frappe.conf.shared_meta_cache and not (frappe.flags.in_install or frappe.flags.in_migrate):
+			from frappe.model.meta_snapshot import enqueue_write_snapshot
+
+			frappe.db.after_commit.add(enqueue_write_snapshot)
+
 
 def _clear_doctype_cache_from_redis(doctype: str | None = None):
 	from frappe.desk.notifications import delete_notification_count_for
+	from frappe.model.meta import bump_meta_cache_version
 
 	for key in ("is_table", "doctype_modules"):
 		frappe.cache.delete_value(key)
 
+	# invalidates process wide meta caches and meta snapshot
+	bump_meta_cache_version()
+
 	def clear_single(dt):
 		frappe.clear_document_cache(dt)
 		for name in doctype_cache_keys:
@@ -195,8 +195,8 @@ def start_scheduler():
 @click.option(
 	"--strategy",
 	required=False,
-	type=click.Choice(["round_robin", "random"]),
-	help="Dequeuing strategy to use",
+	type=click.Choice(["round_robin", "random", "fair"]),
+	help="Dequeuing strategy to use, fair picks jobs fairly across sites",
 )
 def start_worker(queue, quiet=False, rq_username=None, rq_password=None, burst=False, strategy=None):
 	"""Start a background worker"""
@@ -221,11 +221,25 @@ def start_worker(queue, quiet=False, rq_username=None, rq_password=None, burst=F
 @click.option("--num-workers", type=int, default=2, help="Number of workers to spawn in pool.")
 @click.option("--quiet", is_flag=True, default=False, help="Hide Log Outputs")
 @click.option("--burst", is_flag=True, default=False, help="Run Worker in Burst mode.")
-def start_worker_pool(queue, quiet=False, num_workers=2, burst=False):
+@click.option(
+	"--strategy",
+	required=False,
+	type=click.Choice(["fair"]),
+	help="Dequeuing strategy to use, fair picks jobs fairly across sites",
+)
+@click.option(
+	"--warm",
+	is_flag=True,
+	default=False,
+	help="Run jobs in worker processes and keep site state across jobs.",
+)
+def start_worker_pool(queue, quiet=False, num_workers=2, burst=False, strategy=None, warm=False):
 	"""Start a backgrond worker"""
 	from frappe.utils.background_jobs import start_worker_pool
 
-	start_worker_pool(queue=queue, quiet=quiet, burst=burst, num_workers=num_workers)
+	start_worker_pool(
+		queue=queue, quiet=quiet, burst=burst, num_workers=num_workers, strategy=strategy, warm=warm
+	)
 
 
 @click.command("ready-for-migration")
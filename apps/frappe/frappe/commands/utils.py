@@ -369,6 +369,34 @@ def export_csv(context, doctype, path):
 		raise SiteNotSpecifiedError
 
 
+@click.command("export-monitor-profile")
+@click.option(
+	"--endpoint", help="Export stacks of only this endpoint, e.g. /api/method/frappe.client.get_list"
+)
+@click.option("--output", type=click.Path(dir_okay=False, writable=True), help="File to write stacks to")
+@click.option("--list-endpoints", is_flag=True, default=False, help="List endpoints with sampled stacks")
+@pass_context
+def export_monitor_profile(context, endpoint=None, output=None, list_endpoints=False):
+	"Export stacks sampled by monitor's sampling profiler in collapsed stack format for flamegraphs"
+	from frappe.utils.sampling_profiler import export_collapsed_stacks, get_endpoints
+
+	site = get_site(context)
+	try:
+		frappe.init(site=site)
+		if list_endpoints:
+			click.echo("\n".join(get_endpoints()))
+			return
+
+		stacks = export_collapsed_stacks(endpoint)
+		if output:
+			with open(output, "w") as f:
+				f.write(stacks + "\n")
+		else:
+			click.echo(stacks)
+	finally:
+		frappe.destroy()
+
+
 @click.command("export-fixtures")
 @click.option("--app", default=None, help="Export fixtures of a specific app")
 @pass_context
@@ -1182,6 +1210,7 @@ commands = [
 	export_doc,
 	export_fixtures,
 	export_json,
+	export_monitor_profile,
 	get_version,
 	data_import,
 	import_doc,
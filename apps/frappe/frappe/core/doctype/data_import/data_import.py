@@ -8,12 +8,13 @@ from rq.timeouts import JobTimeoutException
 import frappe
 from frappe import _
 from frappe.core.doctype.data_import.exporter import Exporter
-from frappe.core.doctype.data_import.importer import Importer
+from frappe.core.doctype.data_import.importer import Importer, is_chunked_import_running
 from frappe.model import CORE_DOCTYPES
 from frappe.model.document import Document
 from frappe.modules.import_file import import_file_by_path
 from frappe.utils.background_jobs import enqueue, is_job_enqueued
 from frappe.utils.csvutils import validate_google_sheets_url
+from frappe.utils.streaming_export import enqueue_export, is_large_export
 
 BLOCKED_DOCTYPES = CORE_DOCTYPES - {"User", "Role", "Print Format"}
 
@@ -98,7 +99,7 @@ class DataImport(Document):
 
 		job_id = f"data_import::{self.name}"
 
-		if not is_job_enqueued(job_id):
+		if not is_job_enqueued(job_id) and not is_chunked_import_running(self.name):
 			enqueue(
 				start_import,
 				queue="default",
@@ -175,6 +176,18 @@ def download_template(doctype, export_fields=None, export_records=None, export_f
 	export_fields = frappe.parse_json(export_fields)
 	export_filters = frappe.parse_json(export_filters)
 	export_data = export_records != "blank_template"
+	export_page_length = 5 if export_records == "5_records" else None
+
+	if export_data and not export_page_length and is_large_export(get_export_count(doctype, export_filters)):
+		enqueue_export(
+			"frappe.core.doctype.data_import.exporter.write_export",
+			_(doctype),
+			doctype=doctype,
+			export_fields=export_fields,
+			export_filters=export_filters,
+			file_type=file_type,
+		)
+		return
 
 	e = Exporter(
 		doctype,
@@ -182,11 +195,16 @@ def download_template(doctype, export_fields=None, export_records=None, export_f
 		export_data=export_data,
 		export_filters=export_filters,
 		file_type=file_type,
-		export_page_length=5 if export_records == "5_records" else None,
+		export_page_length=export_page_length,
+		stream=export_data,
 	)
 	e.build_response()
 
 
+def get_export_count(doctype, export_filters=None) -> int:
+	return frappe.get_list(doctype, filters=export_filters, fields=["count(*) as count"])[0].count
+
+
 @frappe.whitelist()
 def download_errored_template(data_import_name: str):
 	data_import: DataImport = frappe.get_doc("Data Import", data_import_name)
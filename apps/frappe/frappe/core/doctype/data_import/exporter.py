@@ -5,8 +5,9 @@ import frappe
 from frappe import _
 from frappe.model import display_fieldtypes, no_value_fields
 from frappe.model import table_fields as table_fieldtypes
-from frappe.utils import flt, format_duration, groupby_metric
+from frappe.utils import flt, format_duration, groupby_metric, make_filter_tuple
 from frappe.utils.csvutils import build_csv_response
+from frappe.utils.streaming_export import EXPORT_BATCH_SIZE, ExportWriter, get_export_writer, send_export
 from frappe.utils.xlsxutils import build_xlsx_response
 
 
@@ -19,6 +20,7 @@ class Exporter:
 		export_filters=None,
 		export_page_length=None,
 		file_type="CSV",
+		stream=False,
 	):
 		"""
 		Exports records of a DocType for use with Importer
@@ -27,6 +29,7 @@ class Exporter:
 		        :param export_data=False: Whether to export data as well
 		        :param export_filters=None: The filters (dict or list) which is used to query the records
 		        :param file_type: One of 'Excel' or 'CSV'
+		        :param stream=False: Write rows to file as they are read, instead of to `csv_array`
 		"""
 		self.doctype = doctype
 		self.meta = frappe.get_meta(doctype)
@@ -34,6 +37,8 @@ class Exporter:
 		self.export_filters = export_filters
 		self.export_page_length = export_page_length
 		self.file_type = file_type
+		self.export_data = export_data
+		self.stream = stream
 
 		# this will contain the csv content
 		self.csv_array = []
@@ -43,7 +48,7 @@ class Exporter:
 		self.fields = self.serialize_exportable_fields()
 		self.add_header()
 
-		if export_data:
+		if export_data and not stream:
 			self.data = self.get_data_to_export()
 		else:
 			self.data = []
@@ -111,21 +116,22 @@ class Exporter:
 
 	def get_data_to_export(self):
 		table_fields = [f for f in self.exportable_fields if f != self.doctype]
-		data = self.get_data_as_docs()
 
+		owner_only = False
 		if not frappe.permissions.can_export(self.doctype):
 			if frappe.permissions.can_export(self.doctype, is_owner=True):
-				for doc in data:
-					if doc.get("owner") != frappe.session.user:
-						raise frappe.PermissionError(
-							_("You are not allowed to export {} doctype").format(self.doctype)
-						)
+				owner_only = True
 			else:
 				raise frappe.PermissionError(
 					_("You are not allowed to export {} doctype").format(self.doctype)
 				)
 
-		for doc in data:
+		for doc in self.get_data_as_docs():
+			if owner_only and doc.get("owner") != frappe.session.user:
+				raise frappe.PermissionError(
+					_("You are not allowed to export {} doctype").format(self.doctype)
+				)
+
 			rows = []
 			rows = self.add_data_row(self.doctype, None, doc, rows, 0)
 
@@ -159,26 +165,64 @@ class Exporter:
 		return rows
 
 	def get_data_as_docs(self):
-		def format_column_name(df):
-			return f"`tab{df.parent}`.`{df.fieldname}`"
-
-		filters = self.export_filters
+		# batches are read after the last record of the previous batch (keyset pagination) and not
+		# by offset, so that records inserted during the export don't shift later batches
+		filters = self.export_filters or []
+		if isinstance(filters, dict):
+			filters = [make_filter_tuple(self.doctype, key, value) for key, value in filters.items()]
 
 		if self.meta.is_nested_set():
+			sort_field = "lft"
 			order_by = f"`tab{self.doctype}`.`lft` ASC"
 		else:
-			order_by = f"`tab{self.doctype}`.`creation` DESC"
-
-		parent_fields = [format_column_name(df) for df in self.fields if df.parent == self.doctype]
-		parent_data = frappe.db.get_list(
-			self.doctype,
-			filters=filters,
-			fields=["name", "owner", *parent_fields],
-			limit_page_length=self.export_page_length,
-			order_by=order_by,
-			as_list=0,
-		)
+			sort_field = "creation"
+			# name keeps order of records with same creation stable across batches
+			order_by = f"`tab{self.doctype}`.`creation` DESC, `tab{self.doctype}`.`name` DESC"
+
+		parent_fields = [self.format_column_name(df) for df in self.fields if df.parent == self.doctype]
+
+		# read parents in batches, with children of each batch
+		exported = 0
+		last_value = None
+		# exported records with the same creation as the last one
+		names_at_last_value = []
+		while True:
+			page_length = EXPORT_BATCH_SIZE
+			if self.export_page_length:
+				page_length = min(page_length, self.export_page_length - exported)
+				if page_length <= 0:
+					break
+
+			batch_filters = list(filters)
+			if last_value is not None and sort_field == "lft":
+				batch_filters.append([self.doctype, "lft", ">", last_value])
+			elif last_value is not None:
+				batch_filters.append([self.doctype, "creation", "<=", last_value])
+				batch_filters.append([self.doctype, "name", "not in", names_at_last_value])
+
+			parent_data = frappe.db.get_list(
+				self.doctype,
+				filters=batch_filters,
+				fields=["name", "owner", sort_field, *parent_fields],
+				limit_page_length=page_length,
+				order_by=order_by,
+				as_list=0,
+			)
+			yield from self.add_children_data(parent_data)
+
+			if len(parent_data) < page_length:
+				break
+
+			exported += len(parent_data)
+			if parent_data[-1][sort_field] != last_value:
+				last_value = parent_data[-1][sort_field]
+				names_at_last_value = []
+			names_at_last_value += [d.name for d in parent_data if d[sort_field] == last_value]
+
+	def add_children_data(self, parent_data):
 		parent_names = [p.name for p in parent_data]
+		if not parent_names:
+			return
 
 		child_data = {}
 		for key in self.exportable_fields:
@@ -191,7 +235,9 @@ class Exporter:
 				"idx",
 				"parent",
 				"parentfield",
-				*list({format_column_name(df) for df in self.fields if df.parent == child_table_doctype}),
+				*list(
+					{self.format_column_name(df) for df in self.fields if df.parent == child_table_doctype}
+				),
 			]
 			data = frappe.get_all(
 				child_table_doctype,
@@ -250,10 +296,41 @@ class Exporter:
 		return csv_array
 
 	def build_response(self):
-		if self.file_type == "CSV":
+		if self.stream:
+			send_export(self.write_file(), _(self.doctype))
+		elif self.file_type == "CSV":
 			build_csv_response(self.get_csv_array_for_export(), _(self.doctype))
 		elif self.file_type == "Excel":
 			build_xlsx_response(self.get_csv_array_for_export(), _(self.doctype))
 
+	@staticmethod
+	def format_column_name(df):
+		return f"`tab{df.parent}`.`{df.fieldname}`"
+
+	def write_file(self) -> ExportWriter:
+		"""Write header and rows to an export file, reading records in batches."""
+		writer = get_export_writer(self.file_type, _(self.doctype))
+		writer.write_rows(self.csv_array)
+		if self.export_data:
+			writer.write_rows(self.get_data_to_export())
+
+		if writer.rows == len(self.csv_array):
+			# add 2 empty rows
+			writer.write_rows([[]] * 2)
+
+		return writer
+
 	def group_children_data_by_parent(self, children_data: dict[str, list]):
 		return groupby_metric(children_data, key="parent")
+
+
+def write_export(doctype, export_fields, export_filters=None, file_type="CSV") -> ExportWriter:
+	"""Export all records of `doctype` to a file, used by background exports."""
+	return Exporter(
+		doctype,
+		export_fields=export_fields,
+		export_data=True,
+		export_filters=export_filters,
+		file_type=file_type,
+		stream=True,
+	).write_file()
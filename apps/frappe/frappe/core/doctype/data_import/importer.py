@@ -6,11 +6,13 @@ import os
 import re
 import timeit
 from datetime import date, datetime, time
+from time import monotonic
 
 import frappe
 from frappe import _
 from frappe.core.doctype.version.version import get_diff
 from frappe.model import no_value_fields
+from frappe.model.utils import prefetch_links
 from frappe.utils import cint, cstr, duration_to_seconds, flt, update_progress_bar
 from frappe.utils.csvutils import get_csv_content_from_google_sheets, read_csv_content
 from frappe.utils.xlsxutils import (
@@ -23,12 +25,19 @@ MAX_ROWS_IN_PREVIEW = 10
 INSERT = "Insert New Records"
 UPDATE = "Update Existing Records"
 DURATION_PATTERN = re.compile(r"^(?:(\d+d)?((^|\s)\d+h)?((^|\s)\d+m)?((^|\s)\d+s)?)$")
+# seconds between progress updates of an import
+PROGRESS_INTERVAL = 1
+CHUNK_JOB_TIMEOUT = 10000
+CHUNK_PROGRESS_TTL = 24 * 60 * 60
 
 
 class Importer:
-	def __init__(self, doctype, data_import=None, file_path=None, import_type=None, console=False):
+	def __init__(
+		self, doctype, data_import=None, file_path=None, import_type=None, console=False, *, load_file=True
+	):
 		self.doctype = doctype
 		self.console = console
+		self.progress_published_at = 0
 
 		self.data_import = data_import
 		if not self.data_import:
@@ -39,6 +48,11 @@ class Importer:
 		self.template_options = frappe.parse_json(self.data_import.template_options or "{}")
 		self.import_type = self.data_import.import_type
 
+		if not load_file:
+			# importing payloads parsed by another job, see `import_chunk`
+			self.import_file = None
+			return
+
 		self.import_file = ImportFile(
 			doctype,
 			file_path or data_import.google_sheets_url or data_import.import_file,
@@ -121,6 +135,16 @@ class Importer:
 
 		# start import
 		total_payload_count = len(payloads)
+		chunk_size = cint(frappe.conf.data_import_chunk_size)
+		if (
+			chunk_size
+			and not self.console
+			and total_payload_count > chunk_size
+			and self.can_import_in_parallel()
+		):
+			self.enqueue_chunks(payloads, imported_rows, chunk_size)
+			return import_log
+
 		batch_size = frappe.conf.data_import_batch_size or 1000
 
 		for batch_index, batched_payloads in enumerate(frappe.utils.create_batch(payloads, batch_size)):
@@ -131,7 +155,9 @@ class Importer:
 
 				if set(row_indexes).intersection(set(imported_rows)):
 					print("Skipping imported rows", row_indexes)
-					if total_payload_count > 5:
+					if total_payload_count > 5 and self.should_publish_progress(
+						current_index, total_payload_count
+					):
 						frappe.publish_realtime(
 							"data_import_progress",
 							{
@@ -156,7 +182,9 @@ class Importer:
 							current_index - 1,
 							total_payload_count,
 						)
-					elif total_payload_count > 5:
+					elif total_payload_count > 5 and self.should_publish_progress(
+						current_index, total_payload_count
+					):
 						frappe.publish_realtime(
 							"data_import_progress",
 							{
@@ -205,6 +233,12 @@ class Importer:
 
 					log_index += 1
 
+		import_log = self.set_import_status(total_payload_count)
+		self.after_import()
+
+		return import_log
+
+	def set_import_status(self, total_payload_count):
 		# Logs are db inserted directly so will have to be fetched again
 		import_log = (
 			frappe.get_all(
@@ -238,10 +272,141 @@ class Importer:
 		else:
 			self.data_import.db_set("status", status)
 
-		self.after_import()
-
 		return import_log
 
+	def should_publish_progress(self, current, total):
+		"""Publish progress at most once every `PROGRESS_INTERVAL` seconds, and for the last row."""
+		if current < total and monotonic() - self.progress_published_at < PROGRESS_INTERVAL:
+			return False
+
+		self.progress_published_at = monotonic()
+		return True
+
+	def can_import_in_parallel(self) -> bool:
+		"""Rows of tree DocTypes (nested set) and of DocTypes that link to themselves depend on rows
+		imported before them, they are imported in order by one job."""
+		meta = frappe.get_meta(self.doctype)
+		if meta.is_tree:
+			return False
+
+		link_fields = list(meta.get_link_fields())
+		for table_field in meta.get_table_fields():
+			link_fields.extend(frappe.get_meta(table_field.options).get_link_fields())
+		return all(df.options != self.doctype for df in link_fields)
+
+	def enqueue_chunks(self, payloads, imported_rows, chunk_size):
+		"""Import payloads that aren't imported yet in chunks, by parallel background jobs."""
+		imported_rows = set(imported_rows)
+		pending = []
+		for index, payload in enumerate(payloads):
+			row_indexes = [row.row_number for row in payload.rows]
+			if not imported_rows.intersection(row_indexes):
+				pending.append((index, payload.doc, row_indexes))
+
+		chunks = list(frappe.utils.create_batch(pending, chunk_size))
+		if not chunks:
+			self.set_import_status(len(payloads))
+			return
+
+		key = frappe.cache.make_key(get_chunk_progress_key(self.data_import.name))
+		pipeline = frappe.cache.pipeline()
+		pipeline.delete(key)
+		pipeline.hset(
+			key,
+			mapping={
+				"chunks": 0,
+				"total_chunks": len(chunks),
+				"payloads": len(payloads) - len(pending),
+				"total": len(payloads),
+			},
+		)
+		pipeline.expire(key, CHUNK_PROGRESS_TTL)
+		pipeline.execute()
+
+		frappe.enqueue_many(
+			[
+				{
+					"method": import_chunk,
+					"job_id": get_chunk_job_id(self.data_import.name, chunk_index),
+					"kwargs": {
+						"data_import": self.data_import.name,
+						"payloads": list(chunk),
+						"total_chunks": len(chunks),
+					},
+				}
+				for chunk_index, chunk in enumerate(chunks)
+			],
+			queue="long",
+			timeout=CHUNK_JOB_TIMEOUT,
+			now=frappe.flags.in_test,
+			deduplicate=True,
+		)
+
+	def import_chunk(self, payloads):
+		"""Import payloads and commit them with their import logs, a failed row doesn't fail the chunk."""
+		self.before_import()
+
+		if self.import_type == INSERT:
+			docs = [self.make_new_doc(doc) for _, doc, _ in payloads]
+			for doc in docs:
+				doc.flags.batch_child_inserts = True
+			prefetch_links(docs)
+		else:
+			docs = [doc for _, doc, _ in payloads]
+
+		imported = False
+		for (log_index, _doc, row_indexes), doc in zip(payloads, docs, strict=True):
+			frappe.db.savepoint("data_import_row")
+			try:
+				doc = self.insert_new_doc(doc) if self.import_type == INSERT else self.update_record(doc)
+				create_import_log(
+					self.data_import.name,
+					log_index,
+					{"success": True, "docname": doc.name, "row_indexes": row_indexes},
+				)
+				imported = True
+			except Exception:
+				messages = frappe.local.message_log
+				frappe.clear_messages()
+				frappe.db.rollback(save_point="data_import_row")
+				create_import_log(
+					self.data_import.name,
+					log_index,
+					{
+						"success": False,
+						"exception": frappe.get_traceback(),
+						"messages": messages,
+						"row_indexes": row_indexes,
+					},
+				)
+
+		if imported and self.data_import.status != "Partial Success":
+			self.data_import.db_set("status", "Partial Success")
+
+		frappe.db.commit()
+
+	def chunk_done(self, payload_count, total_chunks):
+		"""Publish progress of import and set its status once all chunks are done."""
+		key = frappe.cache.make_key(get_chunk_progress_key(self.data_import.name))
+		pipeline = frappe.cache.pipeline()
+		pipeline.hincrby(key, "chunks", 1)
+		pipeline.hincrby(key, "payloads", payload_count)
+		pipeline.hget(key, "total")
+		done_chunks, done_payloads, total = pipeline.execute()
+		total = cint(total)
+
+		frappe.publish_realtime(
+			"data_import_progress",
+			{"current": done_payloads, "total": total, "data_import": self.data_import.name},
+			user=frappe.session.user,
+		)
+
+		if done_chunks >= total_chunks:
+			frappe.cache.delete_value(get_chunk_progress_key(self.data_import.name))
+			self.set_import_status(total)
+			frappe.db.commit()
+			frappe.publish_realtime("data_import_refresh", {"data_import": self.data_import.name})
+
 	def after_import(self):
 		frappe.flags.in_import = False
 		frappe.flags.mute_emails = False
@@ -253,6 +418,9 @@ class Importer:
 			return self.update_record(doc)
 
 	def insert_record(self, doc):
+		return self.insert_new_doc(self.make_new_doc(doc))
+
+	def make_new_doc(self, doc):
 		meta = frappe.get_meta(self.doctype)
 		new_doc = frappe.new_doc(self.doctype)
 		new_doc.update(doc)
@@ -266,9 +434,11 @@ class Importer:
 			"docname": self.data_import.name,
 			"label": _("via Data Import"),
 		}
+		return new_doc
 
+	def insert_new_doc(self, new_doc):
 		new_doc.insert()
-		if meta.is_submittable and self.data_import.submit_after_import:
+		if new_doc.meta.is_submittable and self.data_import.submit_after_import:
 			new_doc.submit()
 		return new_doc
 
@@ -1260,6 +1430,56 @@ def get_select_options(df):
 	return [d for d in (df.options or "").split("\n") if d]
 
 
+def get_chunk_progress_key(data_import):
+	return f"data_import_chunks:{data_import}"
+
+
+def get_chunk_job_id(data_import, chunk_index):
+	return f"data_import::{data_import}::{chunk_index}"
+
+
+def is_chunked_import_running(data_import):
+	"""Return True while a chunk of the import is queued or being imported.
+
+	A chunk whose worker is killed never reports back, so the import can be started again once
+	none of its chunk jobs are left; it then only imports rows that aren't logged yet."""
+	from frappe.utils.background_jobs import is_job_enqueued
+
+	key = frappe.cache.make_key(get_chunk_progress_key(data_import))
+	total_chunks = cint(frappe.cache.hmget(key, ["total_chunks"])[0])
+	return any(is_job_enqueued(get_chunk_job_id(data_import, idx)) for idx in range(total_chunks))
+
+
+def import_chunk(data_import, payloads, total_chunks):
+	"""Import a chunk of payloads of a Data Import, runs in background job.
+
+	:param payloads: list of (payload index, doc, row indexes)
+	"""
+	data_import = frappe.get_doc("Data Import", data_import)
+	importer = Importer(data_import.reference_doctype, data_import=data_import, load_file=False)
+	try:
+		importer.import_chunk(payloads)
+	except Exception:
+		frappe.db.rollback()
+		exception = frappe.get_traceback()
+		messages = frappe.local.message_log
+		frappe.clear_messages()
+		data_import.log_error("Data import chunk failed")
+
+		# none of the rows of the chunk are imported
+		for log_index, _doc, row_indexes in payloads:
+			create_import_log(
+				data_import.name,
+				log_index,
+				{"success": False, "exception": exception, "messages": messages, "row_indexes": row_indexes},
+			)
+		frappe.db.commit()
+	finally:
+		importer.after_import()
+
+	importer.chunk_done(len(payloads), total_chunks)
+
+
 def create_import_log(data_import, log_index, log_details):
 	frappe.get_doc(
 		{
@@ -1,9 +1,14 @@
 # Copyright (c) 2015, Nexelya Technologies and Contributors
 # License: MIT. See LICENSE
+from unittest.mock import patch
+
 import frappe
+from frappe.core.doctype.data_import.data_import import download_template
 from frappe.core.doctype.data_import.exporter import Exporter
 from frappe.core.doctype.data_import.test_importer import create_doctype_if_not_exists
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import streaming_export
+from frappe.utils.csvutils import to_csv
 
 doctype_name = "DocType for Export"
 
@@ -98,3 +103,61 @@ class TestExporter(FrappeTestCase):
 		self.assertTrue(frappe.response["result"])
 		self.assertEqual(frappe.response["doctype"], doctype_name)
 		self.assertEqual(frappe.response["type"], "csv")
+
+	def test_streamed_export(self):
+		for i in range(5):
+			frappe.get_doc(doctype=doctype_name, title=f"Streamed {i}", description="x" * 1000).insert()
+
+		export_fields = {doctype_name: ["title", "description"]}
+		e = Exporter(doctype_name, export_fields=export_fields, export_data=True)
+
+		# read in batches of 2 records
+		with patch("frappe.core.doctype.data_import.exporter.EXPORT_BATCH_SIZE", 2):
+			streamed = Exporter(doctype_name, export_fields=export_fields, export_data=True, stream=True)
+			streamed.build_response()
+
+		self.assertEqual(frappe.response["type"], "binary")
+		self.assertEqual(frappe.response["filecontent"].decode(), to_csv(e.get_csv_array()))
+
+		# large files are streamed from disk
+		with patch.object(streaming_export, "SPOOL_MAX_SIZE", 1024):
+			streamed = Exporter(doctype_name, export_fields=export_fields, export_data=True, stream=True)
+			streamed.build_response()
+
+		self.assertEqual(frappe.response["type"], "stream")
+		with frappe.response["filecontent"] as file:
+			self.assertEqual(file.read().decode(), to_csv(e.get_csv_array()))
+
+	def test_background_export(self):
+		frappe.get_doc(doctype=doctype_name, title="Exported in background").insert()
+
+		with patch.dict(frappe.conf, {"export_background_threshold": 0}):
+			download_template(
+				doctype_name, export_fields={doctype_name: ["title"]}, export_records="all", file_type="Excel"
+			)
+
+		# the form post that started the export gets a page saying so
+		self.assertEqual(frappe.response["type"], "page")
+
+		file = frappe.get_last_doc("File", filters={"file_name": ("like", f"{doctype_name}%.xlsx")})
+		self.assertTrue(file.is_private)
+		self.assertTrue(file.file_size)
+		self.assertEqual(file.file_size, len(file.get_content()))
+
+	def test_export_batches(self):
+		frappe.db.delete(doctype_name)
+		names = {frappe.get_doc(doctype=doctype_name, title=f"Batched {i}").insert().name for i in range(5)}
+		# records with the same creation are split across batches
+		frappe.db.set_value(
+			doctype_name, {"name": ("in", names)}, "creation", "2020-01-01", update_modified=False
+		)
+
+		e = Exporter(doctype_name, export_fields={doctype_name: ["title"]}, export_data=True)
+		with patch("frappe.core.doctype.data_import.exporter.EXPORT_BATCH_SIZE", 2):
+			docs = e.get_data_as_docs()
+			exported = [next(docs)["name"]]
+			# records inserted during an export don't shift later batches
+			frappe.get_doc(doctype=doctype_name, title="Inserted during export").insert()
+			exported += [doc["name"] for doc in docs]
+
+		self.assertCountEqual(exported, names)
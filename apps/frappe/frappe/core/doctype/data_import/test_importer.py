@@ -127,6 +127,68 @@ class TestImporter(FrappeTestCase):
 		self.assertEqual(updated_doc.table_field_1[0].child_description, "child description")
 		self.assertEqual(updated_doc.table_field_1_again[0].child_title, "child title again")
 
+	def test_chunked_import(self):
+		from unittest.mock import patch
+
+		for name in ("Test", "Test 2", "Test 3"):
+			frappe.delete_doc_if_exists(doctype_name, name)
+		frappe.db.commit()
+
+		import_file = get_import_file("sample_import_file")
+		data_import = self.get_importer(doctype_name, import_file)
+		with patch.dict(frappe.conf, {"data_import_chunk_size": 2}):
+			data_import.start_import()
+
+		data_import.reload()
+		self.assertEqual(data_import.status, "Success")
+		self.assertEqual(
+			frappe.get_all(
+				"Data Import Log",
+				filters={"data_import": data_import.name},
+				pluck="log_index",
+				order_by="log_index",
+			),
+			[0, 1, 2],
+		)
+
+		doc1 = frappe.get_doc(doctype_name, "Test")
+		self.assertEqual(len(doc1.table_field_1), 2)
+		self.assertEqual(doc1.table_field_2[1].child_2_date, getdate("2019-10-30"))
+		self.assertEqual(frappe.db.get_value(doctype_name, "Test 3", "another_number"), 5)
+
+	def test_failed_chunk(self):
+		from unittest.mock import patch
+
+		for name in ("Test", "Test 2", "Test 3"):
+			frappe.delete_doc_if_exists(doctype_name, name)
+		frappe.db.commit()
+
+		import_file = get_import_file("sample_import_file")
+		data_import = self.get_importer(doctype_name, import_file)
+		with (
+			patch.dict(frappe.conf, {"data_import_chunk_size": 2}),
+			patch.object(Importer, "import_chunk", side_effect=frappe.ValidationError),
+		):
+			data_import.start_import()
+
+		# rows of failed chunks are logged as failed
+		data_import.reload()
+		self.assertEqual(data_import.status, "Error")
+		logs = frappe.get_all(
+			"Data Import Log", filters={"data_import": data_import.name}, fields=["success"]
+		)
+		self.assertEqual(len(logs), 3)
+		self.assertFalse(any(log.success for log in logs))
+
+	def test_chunked_import_of_self_linked_doctype(self):
+		def can_import_in_parallel(doctype):
+			importer = Importer(doctype, data_import=frappe.new_doc("Data Import"), load_file=False)
+			return importer.can_import_in_parallel()
+
+		self.assertTrue(can_import_in_parallel(doctype_name))
+		# rows can link to rows imported by another chunk
+		self.assertFalse(can_import_in_parallel("Energy Point Log"))
+
 	def get_importer(self, doctype, import_file, update=False):
 		data_import = frappe.new_doc("Data Import")
 		data_import.import_type = "Insert New Records" if not update else "Update Existing Records"
@@ -102,7 +102,10 @@ class File(Document):
 		if self.is_remote_file:
 			self.validate_remote_file()
 		else:
-			self.save_file(content=self.get_content())
+			if not self.flags.written_to_disk:
+				# files written by the caller at file_url, with content_hash and file_size set, aren't
+				# read into memory again
+				self.save_file(content=self.get_content())
 			self.flags.new_file = True
 			frappe.db.after_rollback.add(self.on_rollback)
 
@@ -0,0 +1,255 @@
+# Copyright (c) 2015, Nexelya Technologies and contributors
+# License: MIT. See LICENSE
+"""
+Columnar storage of Prepared Report results.
+
+A result is stored as a zip archive. Rows are split in groups of `ROW_GROUP_SIZE` and each key
+of a group is stored as a separately compressed JSON array of values, so that a page of rows or
+all values of one key (to sort or filter on) can be read without decompressing the whole result:
+
+        meta.json             number of rows, keys, columns and all other data of the result
+        0/0.json, 0/1.json    values of first, second... key of rows 0 to ROW_GROUP_SIZE - 1
+        1/0.json, 1/1.json    values of first, second... key of the next ROW_GROUP_SIZE rows
+
+Only results with rows as dicts are stored in columns; other results are stored as JSON.
+"""
+
+import json
+import zipfile
+from collections import defaultdict
+from collections.abc import Iterator
+from functools import cached_property
+from typing import IO
+
+import frappe
+from frappe.utils import flt
+
+FORMAT_VERSION = 1
+EXTENSION = ".columnar.zip"
+ROW_GROUP_SIZE = 10_000
+META_FILE = "meta.json"
+DEFAULT_PAGE_LENGTH = 5000
+
+
+def can_store(data: dict) -> bool:
+	result = data.get("result") or []
+	if result and isinstance(result[-1], list | tuple):
+		# total row
+		result = result[:-1]
+
+	return all(isinstance(row, dict) for row in result)
+
+
+def write_columnar_result(data: dict, file: IO[bytes]) -> None:
+	"""Write report result `data` (as returned by `generate_report_result`) to `file`."""
+	result = data.get("result") or []
+	total_row = None
+	if result and isinstance(result[-1], list | tuple):
+		result, total_row = result[:-1], result[-1]
+
+	keys = list(dict.fromkeys(key for row in result for key in row))
+	meta = {
+		"version": FORMAT_VERSION,
+		"row_count": len(result),
+		"row_group_size": ROW_GROUP_SIZE,
+		"keys": keys,
+		"total_row": total_row,
+		"data": {key: value for key, value in data.items() if key != "result"},
+	}
+
+	with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+		archive.writestr(META_FILE, dumps(meta))
+		for group, start in enumerate(range(0, len(result), ROW_GROUP_SIZE)):
+			rows = result[start : start + ROW_GROUP_SIZE]
+			for key_idx, key in enumerate(keys):
+				archive.writestr(f"{group}/{key_idx}.json", dumps([row.get(key) for row in rows]))
+
+
+def dumps(value) -> str:
+	return frappe.as_json(value, indent=None, separators=(",", ":"))
+
+
+class ColumnarResult:
+	"""Read access to a result stored by `write_columnar_result`."""
+
+	def __init__(self, file: str | IO[bytes]):
+		self.archive = zipfile.ZipFile(file)
+		self.meta = json.loads(self.archive.read(META_FILE))
+		if self.meta["version"] != FORMAT_VERSION:
+			frappe.throw(frappe._("Unsupported format of prepared report result"))
+
+		self.keys: list[str] = self.meta["keys"]
+		self.row_count: int = self.meta["row_count"]
+		self.row_group_size: int = self.meta["row_group_size"]
+		self._groups: dict[int, list[list]] = {}
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def close(self):
+		self.archive.close()
+
+	@cached_property
+	def is_tree(self) -> bool:
+		# rows of tree reports only make sense with their parents
+		return "indent" in self.keys
+
+	def get_data(self, page_length: int | None = None) -> dict:
+		"""Return result with all rows, or only the first `page_length` rows if there are more."""
+		if not page_length or self.row_count <= page_length or self.is_tree:
+			return self.meta["data"] | {"result": self.with_total_row(list(self.iter_rows()))}
+
+		rows = self.read_rows(range(page_length))
+		return self.meta["data"] | {
+			"result": self.with_total_row(rows),
+			"paged": True,
+			"total_count": self.row_count,
+			"page_length": page_length,
+		}
+
+	def get_page(
+		self,
+		start: int = 0,
+		page_length: int | None = None,
+		sort_by: str | None = None,
+		sort_order: str = "asc",
+		filters: dict | None = None,
+	) -> tuple[list[dict], int]:
+		"""Return rows of page and number of rows that match `filters`.
+
+		:param filters: key -> filter text, as in inline filters of the report view ("text",
+		        ">5", "<=10", "!=0", "5:10")
+		"""
+		indexes = range(self.row_count)
+		for key, text in (filters or {}).items():
+			if key in self.keys and (text := str(text).strip()):
+				values = self.read_key(key)
+				indexes = [idx for idx in indexes if match_filter(values[idx], text)]
+
+		if sort_by in self.keys:
+			values = self.read_key(sort_by)
+			indexes = sorted(indexes, key=lambda idx: sort_key(values[idx]), reverse=sort_order == "desc")
+
+		page_length = page_length or get_page_length()
+		return self.read_rows(indexes[start : start + page_length]), len(indexes)
+
+	def iter_rows(self) -> Iterator[dict]:
+		for group in range(self.group_count):
+			yield from self._make_rows(self._read_group(group), range(self.get_group_length(group)))
+			self._groups.pop(group, None)
+
+	def read_rows(self, indexes) -> list[dict]:
+		"""Return rows at `indexes`, reading only the row groups they are in."""
+		rows_by_group = defaultdict(list)
+		for idx in indexes:
+			rows_by_group[idx // self.row_group_size].append(idx % self.row_group_size)
+
+		rows = {}
+		for group, positions in rows_by_group.items():
+			group_rows = self._make_rows(self._read_group(group), positions)
+			for position, row in zip(positions, group_rows, strict=True):
+				rows[group * self.row_group_size + position] = row
+
+		return [rows[idx] for idx in indexes]
+
+	def read_key(self, key: str) -> list:
+		"""Return values of `key` of all rows."""
+		key_idx = self.keys.index(key)
+		values = []
+		for group in range(self.group_count):
+			values.extend(json.loads(self.archive.read(f"{group}/{key_idx}.json")))
+		return values
+
+	def with_total_row(self, rows: list) -> list:
+		if self.meta["total_row"] is not None:
+			rows.append(self.meta["total_row"])
+		return rows
+
+	@property
+	def group_count(self) -> int:
+		return -(-self.row_count // self.row_group_size)
+
+	def get_group_length(self, group: int) -> int:
+		return min(self.row_group_size, self.row_count - group * self.row_group_size)
+
+	def _read_group(self, group: int) -> list[list]:
+		if group not in self._groups:
+			self._groups[group] = [
+				json.loads(self.archive.read(f"{group}/{key_idx}.json")) for key_idx in range(len(self.keys))
+			]
+		return self._groups[group]
+
+	def _make_rows(self, columns: list[list], positions) -> Iterator[dict]:
+		for position in positions:
+			# keys missing in a row are stored as null
+			yield {
+				key: column[position]
+				for key, column in zip(self.keys, columns, strict=True)
+				if column[position] is not None
+			}
+
+
+def get_page_length() -> int:
+	return frappe.conf.prepared_report_page_length or DEFAULT_PAGE_LENGTH
+
+
+def sort_key(value):
+	# None first, then numbers, then everything else as text
+	if value is None:
+		return (0, 0, "")
+	if isinstance(value, int | float) and not isinstance(value, bool):
+		return (1, value, "")
+	return (2, 0, str(value).lower())
+
+
+def match_filter(value, text: str) -> bool:
+	"""Match value like inline filters of the report view do."""
+	for operator in (">=", "<=", "!=", ">", "<", "="):
+		if text.startswith(operator):
+			return compare(value, operator, text[len(operator) :].strip())
+
+	if ":" in text:
+		lower, _, upper = text.partition(":")
+		if is_number(lower) and is_number(upper):
+			return is_number(value) and flt(lower) <= flt(value) <= flt(upper)
+
+	return value is not None and text.lower() in str(value).lower()
+
+
+def compare(value, operator: str, text: str) -> bool:
+	if value is None:
+		return operator == "!=" and text != ""
+
+	if is_number(value) and is_number(text):
+		value, text = flt(value), flt(text)
+	else:
+		value, text = str(value).lower(), text.lower()
+
+	match operator:
+		case "=":
+			return value == text
+		case "!=":
+			return value != text
+		case ">":
+			return value > text
+		case "<":
+			return value < text
+		case ">=":
+			return value >= text
+		case "<=":
+			return value <= text
+
+
+def is_number(value) -> bool:
+	if isinstance(value, bool):
+		return False
+	if isinstance(value, int | float):
+		return True
+	try:
+		float(value)
+	except (TypeError, ValueError):
+		return False
+	return True
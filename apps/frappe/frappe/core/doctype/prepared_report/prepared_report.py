@@ -4,17 +4,24 @@ import gzip
 import json
 import resource
 from contextlib import suppress
+from io import BytesIO
 from typing import Any
 
 from rq import get_current_job
 
 import frappe
+from frappe.core.doctype.prepared_report.columnar import (
+	EXTENSION,
+	ColumnarResult,
+	can_store,
+	write_columnar_result,
+)
 from frappe.database.utils import dangerously_reconnect_on_connection_abort
 from frappe.desk.form.load import get_attachments
 from frappe.desk.query_report import generate_report_result
 from frappe.model.document import Document
 from frappe.monitor import add_data_to_monitor
-from frappe.utils import add_to_date, now
+from frappe.utils import add_to_date, cint, now
 from frappe.utils.background_jobs import enqueue
 
 # If prepared report runs for longer than this time it's automatically considered as failed
@@ -83,18 +90,32 @@ class PreparedReport(Document):
 		)
 
 	def get_prepared_data(self, with_file_name=False):
-		if attachments := get_attachments(self.doctype, self.name):
-			attachment = None
-			for f in attachments or []:
-				if f.file_url.endswith(".gz"):
-					attachment = f
-					break
-
+		if attachment := self.get_result_attachment():
 			attached_file = frappe.get_doc("File", attachment.name)
 
+			if attachment.file_url.endswith(EXTENSION):
+				with ColumnarResult(attached_file.get_full_path()) as result:
+					data = json.dumps(result.get_data(), separators=(",", ":"))
+				data = frappe.safe_encode(data)
+				file_name = attachment.file_name.removesuffix(EXTENSION) + ".json"
+			else:
+				data = gzip.decompress(attached_file.get_content())
+				file_name = attachment.file_name
+
 			if with_file_name:
-				return (gzip.decompress(attached_file.get_content()), attachment.file_name)
-			return gzip.decompress(attached_file.get_content())
+				return (data, file_name)
+			return data
+
+	def get_result_attachment(self):
+		for f in get_attachments(self.doctype, self.name) or []:
+			if f.file_url.endswith((".gz", EXTENSION)):
+				return f
+
+	def get_columnar_result(self) -> ColumnarResult | None:
+		"""Return stored result, if it's stored in columns."""
+		attachment = self.get_result_attachment()
+		if attachment and attachment.file_url.endswith(EXTENSION):
+			return ColumnarResult(frappe.get_doc("File", attachment.name).get_full_path())
 
 
 def generate_report(prepared_report):
@@ -118,7 +139,10 @@ def generate_report(prepared_report):
 					report.custom_columns = data["columns"]
 
 		result = generate_report_result(report=report, filters=instance.filters, user=instance.owner)
-		create_json_gz_file(result, instance.doctype, instance.name, instance.report_name)
+		if can_store(result):
+			create_columnar_file(result, instance.doctype, instance.name, instance.report_name)
+		else:
+			create_json_gz_file(result, instance.doctype, instance.name, instance.report_name)
 
 		instance.status = "Completed"
 	except Exception:
@@ -257,6 +281,51 @@ def create_json_gz_file(data, dt, dn, report_name):
 	_file.save(ignore_permissions=True)
 
 
+def create_columnar_file(data, dt, dn, report_name):
+	file_name = "{}_{}{}".format(
+		frappe.scrub(report_name),
+		frappe.utils.data.format_datetime(frappe.utils.now(), "Y-m-d-H-M"),
+		EXTENSION,
+	)
+	content = BytesIO()
+	write_columnar_result(data, content)
+
+	frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"attached_to_doctype": dt,
+			"attached_to_name": dn,
+			"content": content.getvalue(),
+			"is_private": 1,
+		}
+	).save(ignore_permissions=True)
+
+
+@frappe.whitelist()
+def get_prepared_report_page(
+	dn, start=0, page_length=None, sort_by=None, sort_order="asc", filters=None
+) -> dict:
+	"""Return a page of rows of a prepared report result, sorted and filtered on the server.
+
+	:param filters: fieldname -> filter text, as in inline filters of the report view.
+	"""
+	pr = frappe.get_doc("Prepared Report", dn)
+	if not pr.has_permission("read"):
+		frappe.throw(frappe._("Insufficient permissions to view this report"), frappe.PermissionError)
+
+	result = pr.get_columnar_result()
+	if not result:
+		frappe.throw(frappe._("Result of this prepared report can't be paged, rebuild the report."))
+
+	with result:
+		rows, total_count = result.get_page(
+			cint(start), cint(page_length), sort_by, sort_order, frappe.parse_json(filters)
+		)
+
+	return {"result": rows, "total_count": total_count}
+
+
 @frappe.whitelist()
 def download_attachment(dn):
 	pr = frappe.get_doc("Prepared Report", dn)
@@ -264,7 +333,7 @@ def download_attachment(dn):
 		frappe.throw(frappe._("Cannot Download Report due to insufficient permissions"))
 
 	data, file_name = pr.get_prepared_data(with_file_name=True)
-	frappe.local.response.filename = file_name[:-3]
+	frappe.local.response.filename = file_name.removesuffix(".gz")
 	frappe.local.response.filecontent = data
 	frappe.local.response.type = "binary"
 
@@ -310,48 +379,49 @@ def enqueue_json_to_csv_conversion(prepared_report_name):
 
 
 def convert_json_to_csv(prepared_report_name):
-	"""Background job: Fetch JSON file, convert to CSV, attach CSV to Prepared Report."""
+	"""Background job: Fetch JSON file, convert to CSV, attach CSV to Prepared Report.
+
+	Results stored in columns are converted one row group at a time."""
+	from csv import QUOTE_MINIMAL
 
-	import csv
-	from io import StringIO
+	from frappe.utils.streaming_export import CSVWriter, save_export
 
 	doc = frappe.get_doc("Prepared Report", prepared_report_name)
-	json_content, file_name = doc.get_prepared_data(with_file_name=True)
+	attachment = doc.get_result_attachment()
 
-	if not json_content:
+	if not attachment:
 		frappe.log_error(f"No JSON content found for {prepared_report_name}", "CSV Conversion")
 		return
 
-	parsed = json.loads(json_content)
+	file_name = attachment.file_name.removesuffix(EXTENSION).removesuffix(".json.gz")
+	writer = CSVWriter({"quoting": QUOTE_MINIMAL})
 
-	columns = parsed.get("columns", [])
-	result = parsed.get("result", [])
+	if result := doc.get_columnar_result():
+		with result:
+			columns = result.meta["data"].get("columns") or []
+			if not columns or not result.row_count:
+				frappe.log_error("Columns or result is empty", "CSV Conversion")
+				return
 
-	if not columns or not result:
-		frappe.log_error("Columns or result is empty", "CSV Conversion")
-		return
+			write_csv_rows(writer, columns, result.iter_rows())
+	else:
+		parsed = json.loads(doc.get_prepared_data())
 
-	fieldnames = [col.get("fieldname") for col in columns if col.get("fieldname")]
+		columns = parsed.get("columns", [])
+		result = parsed.get("result", [])
 
-	output = StringIO()
-	writer = csv.DictWriter(output, fieldnames=fieldnames)
-	writer.writeheader()
-	for row in result:
-		writer.writerow({key: row.get(key, "") for key in fieldnames})
+		if not columns or not result:
+			frappe.log_error("Columns or result is empty", "CSV Conversion")
+			return
 
-	csv_content = output.getvalue().encode("utf-8")
+		write_csv_rows(writer, columns, (row for row in result if isinstance(row, dict)))
 
-	_file = frappe.get_doc(
-		{
-			"doctype": "File",
-			"file_name": f"csv_{file_name[:-8]}.csv",
-			"attached_to_doctype": "Prepared Report",
-			"attached_to_name": prepared_report_name,
-			"content": csv_content,
-			"is_private": 1,
-		}
+	_file = save_export(
+		writer,
+		f"csv_{file_name}",
+		attached_to_doctype="Prepared Report",
+		attached_to_name=prepared_report_name,
 	)
-	_file.save(ignore_permissions=True)
 
 	frappe.get_doc(
 		{
@@ -365,3 +435,9 @@ def convert_json_to_csv(prepared_report_name):
 			"link": _file.file_url,
 		}
 	).insert(ignore_permissions=True)
+
+
+def write_csv_rows(writer, columns, rows):
+	fieldnames = [col.get("fieldname") for col in columns if col.get("fieldname")]
+	writer.write_rows([fieldnames])
+	writer.write_rows([row.get(key, "") for key in fieldnames] for row in rows)
@@ -3,8 +3,12 @@
 import json
 import time
 from contextlib import contextmanager
+from io import BytesIO
+from unittest.mock import patch
 
 import frappe
+from frappe.core.doctype.prepared_report import columnar
+from frappe.core.doctype.prepared_report.columnar import ColumnarResult, write_columnar_result
 from frappe.desk.query_report import generate_report_result, get_report_doc
 from frappe.query_builder.utils import db_type_is
 from frappe.tests.test_query_builder import run_only_if
@@ -63,6 +67,55 @@ class TestPreparedReport(FrappeTestCase):
 		self.assertEqual(len(prepared_data["result"]), len(generated_data["result"]))
 		self.assertEqual(len(prepared_data), len(generated_data))
 
+	def test_csv_conversion(self):
+		from frappe.core.doctype.prepared_report.prepared_report import convert_json_to_csv
+
+		doc = self.create_prepared_report()
+		self.wait_for_status(doc, "Completed")
+		convert_json_to_csv(doc.name)
+
+		csv_file = frappe.get_last_doc(
+			"File", filters={"attached_to_doctype": "Prepared Report", "attached_to_name": doc.name}
+		)
+		rows = json.loads(doc.get_prepared_data())["result"]
+		self.assertTrue(csv_file.file_name.startswith("csv_"))
+		self.assertEqual(csv_file.file_size, len(csv_file.get_content()))
+		# header and all rows
+		self.assertEqual(len(csv_file.get_content().splitlines()), len(rows) + 1)
+
+	def test_columnar_result(self):
+		rows = [
+			{"name": f"row-{i}", "amount": i % 7, **({"note": "even"} if i % 2 == 0 else {})}
+			for i in range(50)
+		]
+		data = {"result": [*rows, ["Total", 147]], "columns": [{"fieldname": "name"}], "message": None}
+
+		file = BytesIO()
+		with patch.object(columnar, "ROW_GROUP_SIZE", 8):
+			write_columnar_result(data, file)
+
+		with ColumnarResult(file) as result:
+			self.assertEqual(result.row_count, 50)
+			self.assertEqual(result.group_count, 7)
+			self.assertEqual(result.get_data()["result"], [*rows, ["Total", 147]])
+
+			first_page = result.get_data(page_length=10)
+			self.assertTrue(first_page["paged"])
+			self.assertEqual(first_page["total_count"], 50)
+			self.assertEqual(first_page["result"], [*rows[:10], ["Total", 147]])
+
+			page, count = result.get_page(
+				start=2, page_length=3, sort_by="amount", sort_order="desc", filters={"note": "even"}
+			)
+			expected = sorted(
+				(row for row in rows if row.get("note")), key=lambda row: row["amount"], reverse=True
+			)
+			self.assertEqual(count, 25)
+			self.assertEqual([row["amount"] for row in page], [row["amount"] for row in expected[2:5]])
+
+			_, count = result.get_page(filters={"amount": ">=5"})
+			self.assertEqual(count, len([row for row in rows if row["amount"] >= 5]))
+
 	@run_only_if(db_type_is.MARIADB)
 	def test_start_status_and_kill_jobs(self):
 		with test_report(report_type="Query Report", query="select sleep(10)") as report:
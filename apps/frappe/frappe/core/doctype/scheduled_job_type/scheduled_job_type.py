@@ -13,6 +13,7 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import get_datetime, now_datetime
 from frappe.utils.background_jobs import enqueue, is_job_enqueued
+from frappe.utils.scheduler import bump_schedule_version
 
 
 class ScheduledJobType(Document):
@@ -182,9 +183,15 @@ class ScheduledJobType(Document):
 	def get_queue_name(self):
 		return "long" if ("Long" in self.frequency or "Maintenance" in self.frequency) else "default"
 
+	def on_update(self):
+		bump_schedule_version()
+
 	def on_trash(self):
 		frappe.db.delete("Scheduled Job Log", {"scheduled_job_type": self.name})
 
+	def after_delete(self):
+		bump_schedule_version()
+
 
 @frappe.whitelist()
 def execute_event(doc: str):
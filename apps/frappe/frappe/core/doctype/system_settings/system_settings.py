@@ -7,6 +7,7 @@ from frappe import _
 from frappe.model import no_value_fields
 from frappe.model.document import Document
 from frappe.utils import cint, today
+from frappe.utils.scheduler import bump_schedule_version
 
 
 class SystemSettings(Document):
@@ -180,6 +181,9 @@ class SystemSettings(Document):
 
 		frappe.cache.delete_value("system_settings")
 		frappe.cache.delete_value("time_zone")
+		if self.has_value_changed("time_zone"):
+			# schedules are kept in system time zone
+			bump_schedule_version()
 
 		if frappe.flags.update_last_reset_password_date:
 			update_last_reset_password_date()
@@ -8,9 +8,10 @@ import random
 import re
 import string
 import traceback
+from collections import defaultdict
 from collections.abc import Iterable, Sequence
 from contextlib import contextmanager, suppress
-from time import time
+from time import perf_counter, time
 from typing import TYPE_CHECKING, Any, Union
 
 from pypika.dialects import MySQLQueryBuilder, PostgreSQLQueryBuilder
@@ -19,6 +20,7 @@ from pypika.terms import Criterion, NullValue
 import frappe
 import frappe.defaults
 from frappe import _
+from frappe.database.loader import NOT_LOADED, DeferredValue, ValueLoader
 from frappe.database.utils import (
 	DefaultOrderBy,
 	EmptyQueryValues,
@@ -29,7 +31,7 @@ from frappe.database.utils import (
 	is_query_type,
 )
 from frappe.exceptions import DoesNotExistError, ImplicitCommitError
-from frappe.monitor import get_trace_id
+from frappe.monitor import add_query_to_monitor, get_trace_id
 from frappe.query_builder import Case
 from frappe.query_builder.functions import Count
 from frappe.utils import CallbackManager, cint, get_datetime, get_table_name, getdate, now, sbool
@@ -42,6 +44,9 @@ if TYPE_CHECKING:
 	from pymysql.connections import Connection as MariadbConnection
 	from pymysql.cursors import Cursor as MariadbCursor
 
+	from frappe.database.pool import PooledConnection
+	from frappe.database.replica import ReplicaRouter
+
 
 IFNULL_PATTERN = re.compile(r"ifnull\(", flags=re.IGNORECASE)
 INDEX_PATTERN = re.compile(r"\s*\([^)]+\)\s*")
@@ -88,11 +93,14 @@ class Database:
 		self.password = password
 		self.cur_db_name = cur_db_name
 		self._conn = None
+		self._pooled_connection: "PooledConnection | None" = None
 
 		self.transaction_writes = 0
 		self.auto_commit_on_many_writes = 0
 
 		self.value_cache = {}
+		self.value_loader = ValueLoader()
+		self.replica_router: "ReplicaRouter | None" = None
 		self.logger = frappe.logger("database")
 		self.logger.setLevel("WARNING")
 
@@ -109,7 +117,13 @@ class Database:
 
 	def connect(self):
 		"""Connects to a database as set in `site_config.json`."""
-		self._conn: "MariadbConnection" | "PostgresConnection" = self.get_connection()
+		from frappe.database.pool import get_pool, is_pooling_enabled
+
+		if is_pooling_enabled():
+			self._pooled_connection = get_pool().acquire(self)
+			self._conn: "MariadbConnection" | "PostgresConnection" = self._pooled_connection.conn
+		else:
+			self._conn: "MariadbConnection" | "PostgresConnection" = self.get_connection()
 		self._cursor: "MariadbCursor" | "PostgresCursor" = self._conn.cursor()
 
 		try:
@@ -132,6 +146,18 @@ class Database:
 		"""Returns a Database connection object that conforms with https://peps.python.org/pep-0249/#connection-objects"""
 		raise NotImplementedError
 
+	def get_pool_key(self) -> tuple:
+		"""Connections with same key can be shared using the connection pool."""
+		return (self.db_type, self.host, self.port, self.socket, self.user, self.cur_db_name, self.password)
+
+	def is_connection_usable(self, conn) -> bool:
+		"""Check if idle pooled connection is still alive."""
+		raise NotImplementedError
+
+	def reset_connection(self, conn):
+		"""Reset transaction and session state of `conn` before it's returned to the pool."""
+		raise NotImplementedError
+
 	def get_database_size(self):
 		raise NotImplementedError
 
@@ -159,6 +185,7 @@ class Database:
 		run=True,
 		pluck=False,
 		as_iterator=False,
+		as_columns=False,
 	):
 		"""Execute a SQL query and fetch all rows.
 
@@ -176,6 +203,8 @@ class Database:
 		:param as_iterator: Returns iterator over results instead of fetching all results at once.
 		        This should be used with unbuffered cursor as default cursors used by pymysql and postgres
 		        buffer the results internally. See `Database.unbuffered_cursor`.
+		:param as_columns: Return a dict of column name and list of values of that column. Avoids
+		        creating an object per row, use this for aggregating large results.
 		Examples:
 
 		        # return customer names as dicts
@@ -203,6 +232,23 @@ class Database:
 		# replaces ifnull in query with coalesce
 		query = IFNULL_PATTERN.sub("coalesce(", query)
 
+		if self.replica_router and (replica := self.replica_router.route(query)):
+			# query is already transformed, skip overrides of the replica's class
+			return Database.sql(
+				replica,
+				query,
+				values,
+				as_dict=as_dict,
+				as_list=as_list,
+				debug=debug,
+				ignore_ddl=ignore_ddl,
+				update=update,
+				explain=explain,
+				pluck=pluck,
+				as_iterator=as_iterator,
+				as_columns=as_columns,
+			)
+
 		if not self._conn:
 			self.connect()
 
@@ -226,6 +272,7 @@ class Database:
 		if trace_id := get_trace_id():
 			query += f" /* FRAPPE_TRACE_ID: {trace_id} */"
 
+		query_start = perf_counter()
 		try:
 			self._cursor.execute(query, values)
 		except Exception as e:
@@ -265,6 +312,8 @@ class Database:
 			):
 				raise
 
+		add_query_to_monitor(query, perf_counter() - query_start)
+
 		if debug:
 			time_end = time()
 			frappe.log(f"Execution time: {time_end - time_start:.2f} sec")
@@ -274,7 +323,7 @@ class Database:
 		if auto_commit:
 			self.commit()
 
-		if not self._cursor.description:
+		if not self._has_result_set():
 			return ()
 
 		if as_iterator:
@@ -287,7 +336,10 @@ class Database:
 			return last_result
 
 		# scrub output if required
-		if as_dict:
+		if as_columns:
+			last_result = self.fetch_as_columns(last_result)
+
+		elif as_dict:
 			last_result = self.fetch_as_dict(last_result)
 			if update:
 				for r in last_result:
@@ -299,6 +351,40 @@ class Database:
 		self._clean_up()
 		return last_result
 
+	def _has_result_set(self) -> bool:
+		return bool(self._cursor.description)
+
+	def stream(self, query: Query, values: QueryValues = EmptyQueryValues, *, batch_size: int = 0, **kwargs):
+		"""Execute a SQL query on an unbuffered (server side) cursor and yield rows as they are read.
+
+		Memory usage stays flat irrespective of number of rows returned, use this for exports and
+		scans of large tables. Accepts same keyword arguments as `sql`, rows are returned as lists
+		unless `as_dict` or `pluck` is passed.
+
+		:param batch_size: Yield lists of `batch_size` rows instead of single rows.
+
+		NOTE: Other queries can not be run on this connection until the stream is exhausted.
+
+		Usage:
+		        for row in frappe.db.stream("select name, grand_total from `tabSales Invoice`", as_dict=True):
+		                ...
+
+		        for rows in frappe.db.stream(query, batch_size=1000):
+		                ...
+		"""
+		if not (kwargs.get("as_dict") or kwargs.get("pluck")):
+			kwargs["as_list"] = True
+
+		with self.unbuffered_cursor():
+			rows = self.sql(query, values, as_iterator=True, **kwargs)
+			if not batch_size:
+				yield from rows
+				return
+
+			rows = iter(rows)
+			while batch := list(itertools.islice(rows, batch_size)):
+				yield batch
+
 	def _return_as_iterator(self, *, pluck, as_dict, as_list, update):
 		while result := self._transform_result(self._cursor.fetchmany(SQL_ITERATOR_BATCH_SIZE)):
 			if pluck:
@@ -446,6 +532,14 @@ class Database:
 
 		return [frappe._dict(zip(keys, row, strict=False)) for row in result]
 
+	def fetch_as_columns(self, result) -> frappe._dict:
+		"""Internal. Convert results to dict of column name and list of values of that column."""
+		keys = [column[0] for column in self._cursor.description]
+		if not result:
+			return frappe._dict((key, []) for key in keys)
+
+		return frappe._dict(zip(keys, map(list, zip(*result, strict=True)), strict=True))
+
 	@staticmethod
 	def clear_db_table_cache(query):
 		if query and is_query_type(query, ("drop", "create")):
@@ -583,8 +677,14 @@ class Database:
 		        user = frappe.db.get_values("User", "test@example.com", "*")[0]
 		"""
 		out = None
-		if cache and isinstance(filters, str) and (doctype, filters, fieldname) in self.value_cache:
-			return self.value_cache[(doctype, filters, fieldname)]
+		if cache and isinstance(filters, str):
+			if (doctype, filters, fieldname) in self.value_cache:
+				return self.value_cache[(doctype, filters, fieldname)]
+
+			if not (update or pluck or for_update or not run):
+				loaded = self._get_loaded_values(doctype, filters, fieldname, as_dict)
+				if loaded is not None:
+					return loaded
 
 		if distinct:
 			order_by = None
@@ -657,6 +757,43 @@ class Database:
 
 		return out
 
+	def _get_loaded_values(self, doctype, name, fieldname, as_dict) -> list | None:
+		if isinstance(fieldname, str):
+			fields = [fieldname]
+		elif isinstance(fieldname, list | tuple):
+			fields = list(fieldname)
+		else:
+			return
+
+		loaded = self.value_loader.get_value(doctype, name, fields, as_dict=True)
+		if loaded is NOT_LOADED:
+			return
+		if loaded is None:
+			return []
+		return [loaded if as_dict else tuple(loaded.values())]
+
+	def prefetch_values(self, doctype: str, names: list[str], fields: list[str]) -> None:
+		"""Load `fields` of documents `names` with one query.
+
+		Following `get_value(..., cache=True)` and `frappe.get_cached_value` lookups of these
+		fields are served without querying. See `frappe.database.loader`."""
+		self.value_loader.prefetch(doctype, names, fields)
+
+	def prefetch(self, lookups: Iterable[tuple[str, str, list[str]]]) -> None:
+		"""Prefetch values for a list of `(doctype, name, fields)`, one query per DocType."""
+		names, fields = defaultdict(list), defaultdict(set)
+		for doctype, name, fieldnames in lookups:
+			names[doctype].append(name)
+			fields[doctype].update(fieldnames)
+
+		for doctype in names:
+			self.prefetch_values(doctype, names[doctype], list(fields[doctype]))
+
+	def defer_value(self, doctype: str, name: str, fieldname: str | list[str]) -> DeferredValue:
+		"""Lookup value of a document lazily, all deferred lookups of `doctype` are loaded with
+		one query when any of them is accessed."""
+		return self.value_loader.defer(doctype, name, fieldname)
+
 	def get_values_from_single(
 		self,
 		fields,
@@ -874,7 +1011,9 @@ class Database:
 		distinct=False,
 		limit=None,
 	):
-		query = frappe.qb.get_query(
+		from frappe.database.query import get_cached_query
+
+		query = get_cached_query(
 			table=doctype,
 			filters=filters,
 			order_by=order_by,
@@ -1006,7 +1145,7 @@ class Database:
 		"""
 		:param doctype: DocType to update
 		:param doc_updates: Dictionary of key (docname) and values to update
-		:param chunk_size: Number of documents to update in a single transaction
+		:param chunk_size: Number of documents to update in a single query
 		:param modified: Use this as the `modified` timestamp.
 		:param modified_by: Set this user as `modified_by`.
 		:param update_modified: default True. Update `modified` and `modified_by` fields
@@ -1041,13 +1180,14 @@ class Database:
 				{}, None, modified=modified, modified_by=modified_by, update_modified=update_modified
 			)
 
-		total_docs = len(doc_updates)
 		iterator = iter(doc_updates.items())
-
-		for __ in range(0, total_docs, chunk_size):
-			doc_chunk = dict(itertools.islice(iterator, chunk_size))
+		while doc_chunk := dict(itertools.islice(iterator, chunk_size)):
 			self._build_and_run_bulk_update_query(doctype, doc_chunk, modified_dict, debug)
 
+		frappe.clear_document_cache(doctype, list(doc_updates))
+		if doctype in self.value_cache:
+			del self.value_cache[doctype]
+
 	@staticmethod
 	def _build_and_run_bulk_update_query(
 		doctype: str, doc_updates: dict, modified_dict: dict | None = None, debug: bool = False
@@ -1107,13 +1247,14 @@ class Database:
 		docnames = list(doc_updates.keys())
 
 		for docname, row in doc_updates.items():
+			name_matches = dt.name == docname
 			for field, value in row.items():
 				# CASE
 				if field not in conditions:
 					conditions[field] = Case()
 
 				# WHEN
-				conditions[field].when(dt.name == docname, value)
+				conditions[field].when(name_matches, value)
 
 		for field in conditions:
 			# ELSE
@@ -1352,9 +1493,41 @@ class Database:
 	def get_system_setting(self, key):
 		return frappe.get_system_settings(key)
 
+	def route_reads_to_replica(self) -> bool:
+		"""Send reads of this connection to a read replica until the first write.
+
+		Returns True if routing was enabled by this call."""
+		from frappe.database.replica import ReplicaRouter, is_routing_enabled
+
+		if self.replica_router or not is_routing_enabled():
+			return False
+
+		self.replica_router = ReplicaRouter(self)
+		return True
+
+	def stop_routing_reads_to_replica(self):
+		if self.replica_router:
+			self.replica_router.close()
+			self.replica_router = None
+
+	def get_replication_lag(self) -> float | None:
+		"""Seconds this server is behind its primary, None if replication is broken."""
+		raise NotImplementedError
+
 	def close(self):
 		"""Close database connection."""
-		if self._conn:
+		self.stop_routing_reads_to_replica()
+		if self._pooled_connection:
+			from frappe.database.pool import get_pool
+
+			if self._cursor:
+				self._cursor.close()
+			get_pool().release(self, self._pooled_connection)
+			self._pooled_connection = None
+			self._cursor = None
+			self._conn = None
+
+		elif self._conn:
 			self._conn.close()
 			self._cursor = None
 			self._conn = None
@@ -0,0 +1,143 @@
+# Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Batched loading of document values.
+
+Code that looks up values of many documents in a loop (e.g. item details of every row of a
+transaction) runs one query per lookup. `ValueLoader` collects such lookups and resolves all
+of them for a DocType with a single `WHERE name IN (...)` query:
+
+        # prefetch values used in the loop below with one query
+        frappe.db.prefetch_values("Item", [d.item_code for d in doc.items], ["stock_uom", "is_stock_item"])
+
+        for d in doc.items:
+                # served from prefetched values, no query
+                stock_uom = frappe.get_cached_value("Item", d.item_code, "stock_uom")
+
+        # or defer lookups, all pending lookups are resolved on first access
+        uoms = [frappe.db.defer_value("Item", d.item_code, "stock_uom") for d in doc.items]
+        print(uoms[0].get())
+
+Loaded values live as long as the database connection (i.e. the request or job) and are
+dropped when the document's cache is cleared.
+"""
+
+from collections import defaultdict
+
+import frappe
+from frappe.utils import create_batch
+
+# sentinel for lookups that can't be served from loaded values
+NOT_LOADED = object()
+
+LOAD_BATCH_SIZE = 1000
+
+
+class DeferredValue:
+	"""Value of a document field that is loaded along with other pending lookups on first access."""
+
+	__slots__ = ("loader", "doctype", "name", "fieldname")
+
+	def __init__(self, loader: "ValueLoader", doctype: str, name: str, fieldname: str | list[str]):
+		self.loader = loader
+		self.doctype = doctype
+		self.name = name
+		self.fieldname = fieldname
+
+	def get(self):
+		value = self.loader.get_value(self.doctype, self.name, self.fieldname)
+		return None if value is NOT_LOADED else value
+
+
+class ValueLoader:
+	def __init__(self):
+		# doctype -> name -> row, None if document doesn't exist
+		self.rows: dict[str, dict[str, frappe._dict | None]] = defaultdict(dict)
+		# doctype -> fields that are loaded for all rows of the doctype
+		self.fields: dict[str, set[str]] = defaultdict(set)
+		self.pending: dict[str, set[str]] = defaultdict(set)
+
+	def defer(self, doctype: str, name: str, fieldname: str | list[str]) -> DeferredValue:
+		"""Register lookup of `fieldname` of a document, loaded in batch on first access."""
+		fields = [fieldname] if isinstance(fieldname, str) else fieldname
+		self._add_fields(doctype, fields)
+		if name not in self.rows[doctype]:
+			self.pending[doctype].add(name)
+
+		return DeferredValue(self, doctype, name, fieldname)
+
+	def prefetch(self, doctype: str, names: list[str], fields: list[str]):
+		"""Load `fields` of all `names` with one query."""
+		self._add_fields(doctype, fields)
+		loaded = self.rows[doctype]
+		self.pending[doctype].update(name for name in names if name not in loaded)
+		self.load(doctype)
+
+	def load(self, doctype: str):
+		names = self.pending.pop(doctype, None)
+		if not names:
+			return
+
+		fields = ["name", *sorted(self.fields[doctype] - {"name"})]
+		rows = self.rows[doctype]
+
+		for batch in create_batch(list(names), LOAD_BATCH_SIZE):
+			query = frappe.qb.get_query(doctype, fields=fields, filters={"name": ("in", batch)})
+			found = {row.name: row for row in query.run(as_dict=True)}
+			folded = None
+
+			for name in batch:
+				row = found.get(name)
+				if row is None and found:
+					# names are case insensitive in MariaDB
+					if folded is None:
+						folded = {str(key).casefold(): value for key, value in found.items()}
+					row = folded.get(str(name).casefold())
+				rows[name] = row
+
+	def get_value(self, doctype: str, name: str, fieldname: str | list[str], as_dict: bool = False):
+		"""Return loaded value(s) of a document or `NOT_LOADED`.
+
+		Values are returned like `frappe.get_cached_value`."""
+		if doctype in self.pending and name in self.pending[doctype]:
+			self.load(doctype)
+
+		rows = self.rows.get(doctype)
+		if not rows or name not in rows:
+			return NOT_LOADED
+
+		fields = [fieldname] if isinstance(fieldname, str) else fieldname
+		if not self.fields[doctype].issuperset(fields):
+			return NOT_LOADED
+
+		row = rows[name]
+		if row is None:
+			return None
+
+		if isinstance(fieldname, str):
+			return row[fieldname]
+
+		if as_dict:
+			return frappe._dict((field, row[field]) for field in fields)
+		return [row[field] for field in fields]
+
+	def clear(self, doctype: str, name: str | list[str] | None = None):
+		if doctype not in self.rows:
+			return
+
+		if name is None:
+			del self.rows[doctype]
+			self.fields.pop(doctype, None)
+			self.pending.pop(doctype, None)
+			return
+
+		names = name if isinstance(name, list | tuple | set) else (name,)
+		rows = self.rows[doctype]
+		for name in names:
+			rows.pop(name, None)
+
+	def _add_fields(self, doctype: str, fields: list[str]):
+		if new_fields := set(fields).difference(self.fields[doctype]):
+			# rows loaded earlier don't have new fields, load them again
+			self.pending[doctype].update(self.rows.pop(doctype, {}))
+			self.fields[doctype].update(new_fields)
@@ -11,6 +11,8 @@ from frappe.database.mariadb.schema import MariaDBTable
 from frappe.utils import UnicodeWithAttrs, cstr, get_datetime, get_table_name
 
 _PARAM_COMP = re.compile(r"%\([\w]*\)s")
+# resets session of a connection without reconnecting, not exposed by pymysql
+COM_RESET_CONNECTION = 0x1F
 
 
 class MariaDBExceptionUtil:
@@ -119,6 +121,22 @@ class MariaDBConnectionUtil:
 	def set_execution_timeout(self, seconds: int):
 		self.sql("set session max_statement_time = %s", int(seconds))
 
+	def is_connection_usable(self, conn) -> bool:
+		try:
+			conn.ping(reconnect=False)
+		except Exception:
+			return False
+		return True
+
+	def reset_connection(self, conn):
+		# rolls back pending transaction, releases locks, drops temporary tables and user variables
+		# and resets session variables to their global values, like on a new connection
+		conn._execute_command(COM_RESET_CONNECTION, "")
+		conn._read_ok_packet()
+		# character set and autocommit mode set on connect are reset too
+		conn.set_character_set(conn.charset, conn.collation)
+		conn.autocommit(conn.autocommit_mode)
+
 	def get_connection_settings(self) -> dict:
 		conn_settings = {
 			"user": self.user,
@@ -216,6 +234,15 @@ class MariaDBDatabase(MariaDBConnectionUtil, MariaDBExceptionUtil, Database):
 
 		return db_size[0].get("database_size")
 
+	def get_replication_lag(self) -> float | None:
+		status = self.sql("SHOW SLAVE STATUS", as_dict=True)
+		if not status:
+			# not a replica
+			return 0.0
+
+		lag = status[0].get("Seconds_Behind_Master")
+		return None if lag is None else float(lag)
+
 	def log_query(self, query, values, debug, explain):
 		self.last_query = self._cursor._executed
 		self._log_query(self.last_query, debug, explain, query)
@@ -0,0 +1,150 @@
+# Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Per process pool of database connections.
+
+Without the pool every request and background job opens (and authenticates) a new database
+connection. With the pool, `Database.close` hands the connection back to the pool after
+resetting it, and the next `Database.connect` for the same site and credentials reuses it.
+
+Site config:
+
+        "db_connection_pool": 1,
+        "db_pool_size": 5,  # idle connections kept per site
+        "db_pool_max_lifetime": 3600,  # seconds after which a connection is recycled
+
+Connections inherited from a parent process are never reused (or closed) by the child, so
+the pool is safe to use in pre-forking servers and forking job workers. Warm job workers
+(`bench worker-pool --warm`) always use the pool.
+"""
+
+import os
+import threading
+from collections import defaultdict
+from time import monotonic
+from typing import TYPE_CHECKING
+
+import frappe
+
+if TYPE_CHECKING:
+	from frappe.database.database import Database
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_LIFETIME = 60 * 60
+# connections idle for longer than this are checked before being reused
+HEALTH_CHECK_AFTER = 30
+
+_pool: "ConnectionPool | None" = None
+
+
+class PooledConnection:
+	__slots__ = ("conn", "key", "created_at", "released_at")
+
+	def __init__(self, conn, key: tuple):
+		self.conn = conn
+		self.key = key
+		self.created_at = monotonic()
+		self.released_at = self.created_at
+
+
+class ConnectionPool:
+	def __init__(self):
+		self.pid = os.getpid()
+		self._idle: dict[tuple, list[PooledConnection]] = defaultdict(list)
+		self._lock = threading.Lock()
+		# connections of parent process, referenced so that they are never finalized in this process
+		self._inherited: list[PooledConnection] = []
+
+	def acquire(self, db: "Database") -> PooledConnection:
+		"""Return a usable idle connection for `db` or a new one."""
+		key = db.get_pool_key()
+
+		while pooled := self._pop(key):
+			if self.is_expired(pooled):
+				self.discard(db, pooled)
+				continue
+
+			if monotonic() - pooled.released_at > HEALTH_CHECK_AFTER and not db.is_connection_usable(
+				pooled.conn
+			):
+				self.discard(db, pooled)
+				continue
+
+			return pooled
+
+		return PooledConnection(db.get_connection(), key)
+
+	def release(self, db: "Database", pooled: PooledConnection):
+		"""Reset `pooled` and keep it for reuse, close it if it can't be reused."""
+		if (
+			self._check_pid()
+			or pooled.key != db.get_pool_key()  # switched database with `use`
+			or self.is_expired(pooled)
+			or len(self._idle[pooled.key]) >= (frappe.conf.db_pool_size or DEFAULT_POOL_SIZE)
+		):
+			return self.discard(db, pooled)
+
+		try:
+			db.reset_connection(pooled.conn)
+		except Exception:
+			return self.discard(db, pooled)
+
+		pooled.released_at = monotonic()
+		with self._lock:
+			self._idle[pooled.key].append(pooled)
+
+	def discard(self, db: "Database", pooled: PooledConnection):
+		try:
+			pooled.conn.close()
+		except Exception:
+			db.logger.warning("Failed to close pooled connection", exc_info=True)
+
+	def is_expired(self, pooled: PooledConnection) -> bool:
+		max_lifetime = frappe.conf.db_pool_max_lifetime or DEFAULT_MAX_LIFETIME
+		return monotonic() - pooled.created_at > max_lifetime
+
+	def clear(self):
+		"""Close all idle connections."""
+		with self._lock:
+			idle = [pooled for connections in self._idle.values() for pooled in connections]
+			self._idle.clear()
+
+		for pooled in idle:
+			try:
+				pooled.conn.close()
+			except Exception:
+				pass
+
+	def get_info(self) -> dict[str, int]:
+		return {f"{key[1] or key[3]}/{key[5]}": len(idle) for key, idle in self._idle.items()}
+
+	def _pop(self, key: tuple) -> PooledConnection | None:
+		self._check_pid()
+		with self._lock:
+			if idle := self._idle.get(key):
+				# most recently used connection is the least likely to have been dropped by server
+				return idle.pop()
+
+	def _check_pid(self) -> bool:
+		"""Drop connections inherited from parent process, returns True if they were dropped."""
+		if self.pid == os.getpid():
+			return False
+
+		with self._lock:
+			self._inherited.extend(pooled for connections in self._idle.values() for pooled in connections)
+			self._idle.clear()
+			self.pid = os.getpid()
+		return True
+
+
+def is_pooling_enabled() -> bool:
+	# warm workers run many jobs in one process, connections are always reused
+	return bool(frappe.conf.db_connection_pool or frappe._warm_worker)
+
+
+def get_pool() -> ConnectionPool:
+	global _pool
+
+	if _pool is None:
+		_pool = ConnectionPool()
+	return _pool
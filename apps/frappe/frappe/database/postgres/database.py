@@ -1,4 +1,5 @@
 import re
+from contextlib import contextmanager
 
 import psycopg2
 import psycopg2.extensions
@@ -22,7 +23,7 @@ from psycopg2.errors import (
 from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
 
 import frappe
-from frappe.database.database import Database
+from frappe.database.database import SQL_ITERATOR_BATCH_SIZE, Database
 from frappe.database.postgres.schema import PostgresTable
 from frappe.database.utils import EmptyQueryValues, LazyDecode
 from frappe.utils import cstr, get_table_name
@@ -169,6 +170,25 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 	def last_query(self):
 		return LazyDecode(self._cursor.query)
 
+	def _has_result_set(self) -> bool:
+		# named cursors only describe results after first fetch
+		return bool(self._cursor.description or self._cursor.name)
+
+	@contextmanager
+	def unbuffered_cursor(self):
+		if not self._conn:
+			self.connect()
+
+		original_cursor = self._cursor
+		# named cursors are server side cursors, they can only execute one query
+		new_cursor = self._cursor = self._conn.cursor(name=f"frappe_{frappe.generate_hash(length=10)}")
+		new_cursor.itersize = SQL_ITERATOR_BATCH_SIZE
+		try:
+			yield
+		finally:
+			self._cursor = original_cursor
+			new_cursor.close()
+
 	def get_connection(self):
 		conn_settings = {
 			"user": self.user,
@@ -186,6 +206,27 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 
 		return conn
 
+	def is_connection_usable(self, conn) -> bool:
+		if conn.closed:
+			return False
+
+		try:
+			with conn.cursor() as cursor:
+				cursor.execute("select 1")
+			conn.rollback()
+		except psycopg2.Error:
+			return False
+		return True
+
+	def reset_connection(self, conn):
+		conn.rollback()
+		# DISCARD ALL also drops temporary tables, prepared statements and advisory locks, which
+		# RESET ALL (`conn.reset()`) keeps; it can't run in a transaction
+		conn.autocommit = True
+		with conn.cursor() as cursor:
+			cursor.execute("discard all")
+		conn.set_isolation_level(ISOLATION_LEVEL_REPEATABLE_READ)
+
 	def set_execution_timeout(self, seconds: int):
 		# Postgres expects milliseconds as input
 		self.sql("set local statement_timeout = %s", int(seconds) * 1000)
@@ -215,6 +256,13 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 		)
 		return db_size[0].get("database_size")
 
+	def get_replication_lag(self) -> float | None:
+		lag = self.sql(
+			"""SELECT CASE WHEN pg_is_in_recovery()
+			THEN EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) ELSE 0 END"""
+		)[0][0]
+		return None if lag is None else float(lag)
+
 	# pylint: disable=W0221
 	def sql(self, query, values=EmptyQueryValues, *args, **kwargs):
 		return super().sql(modify_query(query), modify_values(values), *args, **kwargs)
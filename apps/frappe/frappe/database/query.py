@@ -30,6 +30,13 @@ COMMA_PATTERN = re.compile(r",\s*(?![^()]*\))")
 # to allow table names like __Auth
 TABLE_NAME_PATTERN = re.compile(r"^[\w -]*$", flags=re.ASCII)
 
+# operators whose SQL only depends on the type of value, string values become query parameters
+CACHEABLE_OPERATORS = frozenset(("=", "!=", "<", ">", "<=", ">=", "like", "not like", "in", "not in"))
+QUERY_CACHE_SIZE = 1024
+# every length of `IN (...)` lists is a separate shape, don't let long lists flood the cache
+QUERY_CACHE_MAX_IN_VALUES = 50
+QUERY_SLOT_PREFIX = "\x00frappe-query-slot:"
+
 
 class Engine:
 	def get_query(
@@ -506,6 +513,292 @@ class ChildQuery:
 		)
 
 
+class _Slot:
+	"""Placeholder for a string value in a cached query's shape."""
+
+	__slots__ = ()
+
+	def __repr__(self) -> str:
+		return "<slot>"
+
+
+SLOT = _Slot()
+_uncacheable_queries = 0
+
+
+class CachedQuery:
+	"""Rendered SQL of a query along with its parameters, runs like a query builder object."""
+
+	__slots__ = ("sql", "params")
+
+	def __init__(self, sql: str, params: dict) -> None:
+		self.sql = sql
+		self.params = params
+
+	def get_sql(self, **kwargs) -> str:
+		return self.sql
+
+	def run(self, *args, **kwargs):
+		return frappe.db.sql(self.sql, self.params, *args, **kwargs)
+
+
+def get_cached_query(
+	table: str,
+	fields: list | tuple | str | None = None,
+	filters: dict | list | tuple | str | int | None = None,
+	order_by: str | None = None,
+	limit: int | None = None,
+	distinct: bool = False,
+	for_update: bool = False,
+	*,
+	validate_filters: bool = False,
+	skip_locked: bool = False,
+	wait: bool = True,
+) -> CachedQuery | QueryBuilder:
+	"""Same as `frappe.qb.get_query` for SELECT queries but only returns an object that can be `run`.
+
+	Queries are cached by their shape: the doctype, fields, filter fields, operators and non-string
+	values. String values are passed as query parameters, so repeated queries with the same shape
+	skip building the pypika tree and rendering SQL entirely. Queries that can't be cached are
+	built with `Engine` as usual.
+
+	Only queries built with `Engine` can be cached, i.e. `frappe.db.get_value` / `get_values`.
+	`frappe.get_all` / `get_list` and list views go through `DatabaseQuery`, which doesn't use
+	pypika and isn't cached.
+
+	Disable with `disable_query_cache` in site config."""
+	query_kwargs = dict(
+		table=table,
+		fields=fields,
+		filters=filters,
+		order_by=order_by,
+		limit=limit,
+		distinct=distinct,
+		for_update=for_update,
+		validate_filters=validate_filters,
+		skip_locked=skip_locked,
+		wait=wait,
+	)
+
+	shape = None
+	if not (frappe.flags.in_safe_exec or frappe.conf.disable_query_cache):
+		shape, values = _get_query_shape(**query_kwargs)
+
+	if shape and (template := _get_query_template(shape)):
+		sql, params = template
+		return CachedQuery(sql, {key: values[value] if slot else value for key, slot, value in params})
+
+	global _uncacheable_queries
+	_uncacheable_queries += 1
+	return Engine().get_query(**query_kwargs)
+
+
+def get_query_cache_info() -> dict:
+	"""Hit / miss counters of `get_cached_query` in this process."""
+	info = _get_query_template.cache_info()
+	lookups = info.hits + info.misses
+	return {
+		"hits": info.hits,
+		"misses": info.misses,
+		"uncacheable": _uncacheable_queries,
+		"size": info.currsize,
+		"hit_rate": info.hits / lookups if lookups else 0,
+	}
+
+
+def clear_query_cache():
+	global _uncacheable_queries
+	_uncacheable_queries = 0
+	_get_query_template.cache_clear()
+
+
+class _Uncacheable(Exception):
+	pass
+
+
+def _get_query_shape(
+	table, fields, filters, order_by, limit, distinct, for_update, validate_filters, skip_locked, wait
+) -> tuple[tuple | None, list | None]:
+	"""Return normalized, hashable shape of query and string values of filters in order.
+	Returns `(None, None)` if the query can't be cached."""
+	values = []
+	try:
+		if not isinstance(table, str):
+			raise _Uncacheable
+
+		if isinstance(fields, list | tuple):
+			if not all(isinstance(f, str) for f in fields):
+				raise _Uncacheable
+			fields = tuple(fields)
+		elif fields is not None and not isinstance(fields, str):
+			raise _Uncacheable
+
+		# dynamic fields like `link_field.fieldname` depend on meta
+		if fields and any("." in f for f in (fields if isinstance(fields, tuple) else (fields,))):
+			raise _Uncacheable
+
+		if not (order_by is None or isinstance(order_by, str)):
+			raise _Uncacheable
+
+		if not (limit is None or isinstance(limit, int)):
+			raise _Uncacheable
+
+		filters = _get_filters_shape(table, filters, values)
+	except _Uncacheable:
+		return None, None
+
+	shape = (
+		frappe.db.db_type,
+		table,
+		fields,
+		filters,
+		order_by,
+		limit,
+		bool(distinct),
+		bool(for_update),
+		bool(validate_filters),
+		bool(skip_locked),
+		bool(wait),
+	)
+	return shape, values
+
+
+def _get_filters_shape(doctype: str, filters, values: list) -> tuple:
+	"""Normalize filters to a tuple of (fieldname, operator, value shape) in the order `Engine`
+	applies them. String values are replaced by `SLOT` and collected in `values`."""
+	if filters is None:
+		return ()
+
+	if isinstance(filters, str | int) and not isinstance(filters, bool):
+		filters = {"name": str(filters)}
+
+	conditions = []
+	if isinstance(filters, dict):
+		conditions.extend(_iter_dict_conditions(filters))
+
+	elif isinstance(filters, list | tuple):
+		if filters and all(isinstance(d, str | int) for d in filters):
+			conditions.append(("name", "in", filters))
+		else:
+			for condition in filters:
+				if isinstance(condition, dict):
+					conditions.extend(_iter_dict_conditions(condition))
+				elif not isinstance(condition, list | tuple):
+					raise _Uncacheable
+				elif len(condition) == 2:
+					conditions.append((condition[0], "=", condition[1]))
+				elif len(condition) == 3:
+					conditions.append(tuple(condition))
+				elif len(condition) == 4 and condition[0] == doctype:
+					conditions.append(tuple(condition[1:]))
+				else:
+					raise _Uncacheable
+	else:
+		raise _Uncacheable
+
+	shape = []
+	for field, operator, value in conditions:
+		if (
+			not isinstance(field, str)
+			or "." in field
+			or not isinstance(operator, str)
+			or operator.casefold() not in CACHEABLE_OPERATORS
+		):
+			raise _Uncacheable
+
+		if operator.casefold() in ("in", "not in"):
+			if not isinstance(value, list | tuple) or len(value) > QUERY_CACHE_MAX_IN_VALUES:
+				raise _Uncacheable
+			value = tuple(_get_value_shape(v, values, allow_null=False) for v in value)
+		else:
+			value = _get_value_shape(value, values)
+
+		shape.append((field, operator, value))
+
+	return tuple(shape)
+
+
+def _iter_dict_conditions(filters: dict):
+	for field, value in filters.items():
+		operator = "="
+		if isinstance(value, list | tuple):
+			if len(value) != 2:
+				raise _Uncacheable
+			operator, value = value
+		yield field, operator, value
+
+
+def _get_value_shape(value, values: list, allow_null: bool = True):
+	if isinstance(value, str):
+		values.append(value)
+		return SLOT
+	if isinstance(value, bool):
+		return int(value)
+	if isinstance(value, int | float) or (value is None and allow_null):
+		return value
+	raise _Uncacheable
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _get_query_template(shape: tuple) -> tuple[str, tuple] | None:
+	"""Build query of given shape with sentinel values and find out which query parameter
+	belongs to which filter value. Returns None if values end up anywhere else in the query."""
+	from frappe.query_builder.terms import NamedParameterWrapper
+
+	(
+		_db_type,
+		table,
+		fields,
+		filters,
+		order_by,
+		limit,
+		distinct,
+		for_update,
+		validate_filters,
+		skip_locked,
+		wait,
+	) = shape
+	slot_count = 0
+
+	def fill(value):
+		nonlocal slot_count
+		if value is SLOT:
+			slot_count += 1
+			return f"{QUERY_SLOT_PREFIX}{slot_count - 1}"
+		if isinstance(value, tuple):
+			return tuple(fill(v) for v in value)
+		return value
+
+	query = Engine().get_query(
+		table,
+		fields=list(fields) if isinstance(fields, tuple) else fields,
+		filters=[[field, operator, fill(value)] for field, operator, value in filters],
+		order_by=order_by,
+		limit=limit,
+		distinct=distinct,
+		for_update=for_update,
+		validate_filters=validate_filters,
+		skip_locked=skip_locked,
+		wait=wait,
+	)
+
+	param_collector = NamedParameterWrapper()
+	sql = query.get_sql(param_wrapper=param_collector)
+	if QUERY_SLOT_PREFIX in sql:
+		return
+
+	params = []
+	for key, value in param_collector.get_parameters().items():
+		if isinstance(value, str) and QUERY_SLOT_PREFIX in value:
+			if not value.startswith(QUERY_SLOT_PREFIX):
+				return
+			params.append((key, True, int(value[len(QUERY_SLOT_PREFIX) :])))
+		else:
+			params.append((key, False, value))
+
+	return sql, tuple(params)
+
+
 def literal_eval_(literal):
 	try:
 		return literal_eval(literal)
@@ -0,0 +1,154 @@
+# Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Lag aware routing of reads to read replicas.
+
+When enabled on a connection (see `Database.route_reads_to_replica`), `SELECT` queries are
+sent to one of the replicas configured in site config while everything else goes to the
+primary. Once a query writes (or locks rows) on the primary, the rest of the request sticks to
+the primary so it always reads its own writes.
+
+Replicas that lag behind the primary by more than `replica_max_lag` seconds are skipped.
+
+Site config:
+
+        "read_replicas": [{"host": "10.0.0.2"}, {"host": "10.0.0.3", "port": 3307}],
+        "replica_max_lag": 10,
+        "route_reads_to_replica": 1
+
+`replica_host` / `replica_db_port` are used if `read_replicas` is not set. Credentials are the
+same as the ones used by `frappe.connect_replica`.
+"""
+
+import random
+from time import monotonic
+from typing import TYPE_CHECKING
+
+import frappe
+from frappe.database.utils import is_query_type
+from frappe.monitor import increment_monitor_counter
+
+if TYPE_CHECKING:
+	from frappe.database.database import Database
+
+DEFAULT_MAX_LAG = 10
+LAG_CHECK_INTERVAL = 5
+
+# queries that can run on a replica
+READ_QUERY_TYPES = ("select", "with")
+# queries that are sent to the primary but don't make the request stick to it
+NEUTRAL_QUERY_TYPES = ("begin", "start", "commit", "rollback", "savepoint", "release", "set", "show")
+LOCKING_CLAUSES = ("for update", "for share", "lock in share mode")
+
+# (host, port) -> (checked at, lag in seconds or None if replica is unusable)
+_replica_lag: dict[tuple[str, int | None], tuple[float, float | None]] = {}
+
+
+def get_replica_configs() -> list[dict]:
+	conf = frappe.conf
+	replicas = conf.read_replicas or []
+	if not replicas and conf.replica_host:
+		replicas = [{"host": conf.replica_host, "port": conf.replica_db_port}]
+
+	return [frappe._dict(replica) for replica in replicas if replica.get("host")]
+
+
+def is_routing_enabled() -> bool:
+	return bool(frappe.conf.route_reads_to_replica and get_replica_configs())
+
+
+class ReplicaRouter:
+	"""Picks the connection a query should run on for a primary `Database` connection."""
+
+	def __init__(self, primary: "Database"):
+		self.primary = primary
+		self.replicas = get_replica_configs()
+		self.max_lag = frappe.conf.replica_max_lag or DEFAULT_MAX_LAG
+		self.stick_to_primary = False
+		self._replica: "Database | None" = None
+		self._replica_label: str | None = None
+
+	def route(self, query: str) -> "Database | None":
+		"""Return replica connection that should run `query` or None to run it on primary."""
+		if self.stick_to_primary or not query:
+			return
+
+		if not is_query_type(query, READ_QUERY_TYPES):
+			if not is_query_type(query, NEUTRAL_QUERY_TYPES):
+				self.stick_to_primary = True
+			return
+
+		if any(clause in query.lower() for clause in LOCKING_CLAUSES):
+			self.stick_to_primary = True
+			return
+
+		if self.primary.transaction_writes:
+			self.stick_to_primary = True
+			return
+
+		replica = self.get_replica()
+		if replica:
+			increment_monitor_counter(f"replica_queries:{self._replica_label}")
+		return replica
+
+	def get_replica(self) -> "Database | None":
+		"""Connect to a random replica that is within allowed lag, reused for the whole request."""
+		if self._replica:
+			return self._replica
+
+		candidates = self.replicas.copy()
+		random.shuffle(candidates)
+
+		for config in candidates:
+			try:
+				replica = self.connect(config)
+			except Exception:
+				frappe.logger("database").exception(f"Failed to connect to replica {config.host}")
+				_replica_lag[(config.host, config.port)] = (monotonic(), None)
+				continue
+
+			if self.is_within_lag(replica, config):
+				self._replica = replica
+				self._replica_label = f"{config.host}:{config.port}" if config.port else config.host
+				return replica
+
+			replica.close()
+
+		# no usable replica, don't retry for every query of this request
+		self.stick_to_primary = True
+
+	def connect(self, config) -> "Database":
+		from frappe.database import get_db
+
+		conf = frappe.conf
+		user, password = conf.db_name, conf.db_password
+		if conf.different_credentials_for_replica:
+			user, password = conf.replica_db_name, conf.replica_db_password
+
+		return get_db(
+			socket=None,
+			host=config.host,
+			port=config.port,
+			user=user,
+			password=password,
+			cur_db_name=conf.db_name,
+		)
+
+	def is_within_lag(self, replica: "Database", config) -> bool:
+		key = (config.host, config.port)
+		checked_at, lag = _replica_lag.get(key, (None, None))
+
+		if checked_at is None or monotonic() - checked_at > LAG_CHECK_INTERVAL:
+			try:
+				lag = replica.get_replication_lag()
+			except Exception:
+				frappe.logger("database").exception(f"Failed to check lag of replica {config.host}")
+				lag = None
+			_replica_lag[key] = (monotonic(), lag)
+
+		return lag is not None and lag <= self.max_lag
+
+	def close(self):
+		if self._replica:
+			self._replica.close()
+			self._replica = None
@@ -1,16 +1,38 @@
 import json
+from collections import defaultdict
+from time import monotonic
 from typing import TYPE_CHECKING, Union
 
 import redis
 
 import frappe
-from frappe.utils import cstr
+from frappe.model.utils import prefetch_links
+from frappe.monitor import add_data_to_monitor, increment_monitor_counter
+from frappe.utils import cstr, now
 
 if TYPE_CHECKING:
 	from frappe.model.document import Document
 
 queue_prefix = "insert_queue_for_"
 
+# queue entries popped from redis at once, an entry can hold many records
+POP_BATCH_SIZE = 100
+INSERT_CHUNK_SIZE = 1000
+# seconds a flush may run for, remaining records are flushed by the next run
+DEFAULT_FLUSH_TIME_BUDGET = 5 * 60
+
+# methods which, if defined for a DocType, make its records go through `Document.insert`
+INSERT_EVENTS = (
+	"before_insert",
+	"before_naming",
+	"before_validate",
+	"validate",
+	"before_save",
+	"after_insert",
+	"on_update",
+	"on_change",
+)
+
 
 def deferred_insert(doctype: str, records: list[Union[dict, "Document"]] | str):
 	if isinstance(records, dict | list):
@@ -26,21 +48,153 @@ def deferred_insert(doctype: str, records: list[Union[dict, "Document"]] | str):
 
 
 def save_to_db():
-	queue_keys = frappe.cache.get_keys(queue_prefix)
-	for key in queue_keys:
-		record_count = 0
-		queue_key = get_key_name(key)
-		doctype = get_doctype_name(key)
-		while frappe.cache.llen(queue_key) > 0 and record_count <= 500:
-			records = frappe.cache.lpop(queue_key)
-			records = json.loads(records.decode("utf-8"))
-			if isinstance(records, dict):
-				record_count += 1
-				insert_record(records, doctype)
+	"""Flush queued records to database.
+
+	Queues are drained in turns, one batch per queue, until all of them are empty or
+	`deferred_insert_flush_time_budget` seconds (default 5 minutes) have passed."""
+	deadline = monotonic() + (frappe.conf.deferred_insert_flush_time_budget or DEFAULT_FLUSH_TIME_BUDGET)
+	queues = {get_key_name(key): get_doctype_name(key) for key in frappe.cache.get_keys(queue_prefix)}
+
+	while queues and monotonic() < deadline:
+		for queue_key, doctype in list(queues.items()):
+			records = pop_records(queue_key)
+			if not records:
+				del queues[queue_key]
 				continue
-			for record in records:
-				record_count += 1
-				insert_record(record, doctype)
+
+			insert_records(records, doctype)
+			increment_monitor_counter(f"deferred_inserts:{doctype}", len(records))
+			frappe.db.commit()
+
+			if monotonic() >= deadline:
+				break
+
+	add_data_to_monitor(deferred_insert_backlog=get_backlog())
+
+
+def pop_records(queue_key: str, count: int = POP_BATCH_SIZE) -> list[dict]:
+	"""Atomically pop upto `count` entries of a queue and return records in them."""
+	key = frappe.cache.make_key(queue_key)
+	pipeline = frappe.cache.pipeline()
+	pipeline.lrange(key, 0, count - 1)
+	pipeline.ltrim(key, count, -1)
+	entries = pipeline.execute()[0]
+
+	records = []
+	for entry in entries:
+		entry = json.loads(entry.decode("utf-8"))
+		if isinstance(entry, dict):
+			records.append(entry)
+		else:
+			records.extend(entry)
+	return records
+
+
+def get_backlog() -> dict[str, int]:
+	"""Return number of queued entries per DocType."""
+	backlog = {}
+	for key in frappe.cache.get_keys(queue_prefix):
+		if length := frappe.cache.llen(get_key_name(key)):
+			backlog[get_doctype_name(key)] = length
+	return backlog
+
+
+def insert_records(records: list[dict], doctype: str):
+	if not can_bulk_insert(doctype):
+		for record in records:
+			insert_record(record, doctype)
+		return
+
+	docs = prepare_records(records, doctype)
+	if not docs:
+		return
+
+	meta = frappe.get_meta(doctype)
+	columns = meta.get_valid_columns()
+
+	for start in range(0, len(docs), INSERT_CHUNK_SIZE):
+		chunk = docs[start : start + INSERT_CHUNK_SIZE]
+		values = []
+		for doc in chunk:
+			doc_values = doc.get_valid_dict(convert_dates_to_str=True, ignore_nulls=True, ignore_virtual=True)
+			values.append(tuple(doc_values.get(column) for column in columns))
+
+		frappe.db.savepoint("deferred_insert")
+		try:
+			frappe.db.bulk_insert(
+				doctype, columns, values, ignore_duplicates=True, chunk_size=INSERT_CHUNK_SIZE
+			)
+		except Exception:
+			# one bad record shouldn't lose the whole chunk
+			frappe.db.rollback(save_point="deferred_insert")
+			for doc in chunk:
+				insert_record(doc.get_valid_dict(convert_dates_to_str=True), doctype)
+
+
+def prepare_records(records: list[dict], doctype: str) -> list["Document"]:
+	"""Validate records like `Document.insert` does and return valid ones as documents.
+
+	Linked documents of all records are fetched upfront, one query per linked DocType."""
+	docs = []
+	for record in records:
+		try:
+			record.update({"doctype": doctype})
+			docs.append(frappe.get_doc(record))
+		except Exception as e:
+			frappe.logger().error(f"Error while inserting deferred {doctype} record: {e}")
+
+	prefetch_links(docs)
+
+	valid_docs = []
+	timestamp = now()
+	for doc in docs:
+		try:
+			doc.set("__islocal", True)
+			doc._set_defaults()
+			# records are queued with time and user of the request that created them
+			doc.creation = doc.creation or timestamp
+			doc.modified = doc.modified or doc.creation
+			doc.owner = doc.owner or frappe.session.user
+			doc.modified_by = doc.modified_by or doc.owner
+			doc.set_docstatus()
+			doc._validate_links()
+			doc.set_new_name()
+			doc._validate()
+		except Exception as e:
+			frappe.logger().error(f"Error while inserting deferred {doctype} record: {e}")
+		else:
+			valid_docs.append(doc)
+
+	return valid_docs
+
+
+def can_bulk_insert(doctype: str) -> bool:
+	"""Records of DocTypes without insert hooks of their own are validated and inserted in bulk.
+
+	Hooks registered for all DocTypes (`"*"` in `doc_events`) are not run for such records."""
+	from frappe.core.doctype.server_script.server_script_utils import EVENT_MAP, get_server_script_map
+	from frappe.integrations.doctype.webhook import get_all_webhooks
+	from frappe.model.base_document import get_controller
+
+	meta = frappe.get_meta(doctype)
+	if meta.issingle or meta.is_virtual or meta.get_table_fields():
+		return False
+
+	controller = get_controller(doctype)
+	if any(getattr(controller, event, None) for event in INSERT_EVENTS):
+		return False
+
+	if any(frappe.get_doc_hooks().get(doctype, {}).get(event) for event in INSERT_EVENTS):
+		return False
+
+	server_scripts = get_server_script_map().get(doctype, {})
+	if any(server_scripts.get(EVENT_MAP[event]) for event in INSERT_EVENTS if event in EVENT_MAP):
+		return False
+
+	if frappe.cache.get_value("webhooks", get_all_webhooks).get(doctype):
+		return False
+
+	return not frappe.db.exists("Notification", {"enabled": 1, "document_type": doctype})
 
 
 def insert_record(record: Union[dict, "Document"], doctype: str):
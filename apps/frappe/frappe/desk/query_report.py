@@ -10,6 +10,7 @@ import frappe
 import frappe.desk.reportview
 from frappe import _
 from frappe.core.utils import ljust_list
+from frappe.desk.report_cache import get_cached_result, get_result_key, set_cached_result
 from frappe.desk.reportview import clean_params, parse_json
 from frappe.model.utils import render_include
 from frappe.modules import get_module_path, scrub
@@ -82,6 +83,20 @@ def generate_report_result(
 	if filters and isinstance(filters, str):
 		filters = json.loads(filters)
 
+	cache_key = None
+	if report.get("cache_result"):
+		cache_key = get_result_key(
+			report,
+			filters,
+			user,
+			custom_report=report.get("custom_report"),
+			custom_columns=custom_columns,
+			is_tree=is_tree,
+			parent_field=parent_field,
+		)
+		if cached_result := get_cached_result(cache_key):
+			return cached_result
+
 	res = get_report_result(report, filters) or []
 
 	columns, result, message, chart, report_summary, skip_total_row = ljust_list(res, 6)
@@ -116,7 +131,7 @@ def generate_report_result(
 		total_row = cint(report.add_total_row) and result and not skip_total_row
 		result = translate_report_data(result, total_row)
 
-	return {
+	report_result = {
 		"result": result,
 		"columns": columns,
 		"message": message,
@@ -127,6 +142,11 @@ def generate_report_result(
 		"execution_time": frappe.cache.hget("report_execution_time", report.name) or 0,
 	}
 
+	if cache_key:
+		set_cached_result(report, cache_key, report_result)
+
+	return report_result
+
 
 def normalize_result(result, columns):
 	# Converts to list of dicts from list of lists/tuples
@@ -199,7 +219,9 @@ def run(
 	is_tree=False,
 	parent_field=None,
 	are_default_filters=True,
+	paged=False,
 ):
+	""":param paged: send only the first page of rows of large prepared report results."""
 	if not user:
 		user = frappe.session.user
 	validate_filters_permissions(report_name, filters, user)
@@ -224,7 +246,7 @@ def run(
 				dn = filters.pop("prepared_report_name", None)
 			else:
 				dn = ""
-			result = get_prepared_report_result(report, filters, dn, user)
+			result = get_prepared_report_result(report, filters, dn, user, paged=sbool(paged))
 		else:
 			result = generate_report_result(report, filters, user, custom_columns, is_tree, parent_field)
 			add_data_to_monitor(report=report.reference_report or report.name)
@@ -273,7 +295,8 @@ def add_custom_column_data(custom_columns, result):
 	return result
 
 
-def get_prepared_report_result(report, filters, dn="", user=None):
+def get_prepared_report_result(report, filters, dn="", user=None, paged=False):
+	from frappe.core.doctype.prepared_report.columnar import get_page_length
 	from frappe.core.doctype.prepared_report.prepared_report import get_completed_prepared_report
 
 	def get_report_data(doc, data):
@@ -300,7 +323,11 @@ def get_prepared_report_result(report, filters, dn="", user=None):
 	doc = frappe.get_doc("Prepared Report", dn) if dn else None
 	if doc:
 		try:
-			if data := json.loads(doc.get_prepared_data().decode("utf-8")):
+			if result := doc.get_columnar_result():
+				# the report view fetches large results a page at a time
+				with result:
+					report_data = get_report_data(doc, result.get_data(get_page_length() if paged else None))
+			elif data := json.loads(doc.get_prepared_data().decode("utf-8")):
 				report_data = get_report_data(doc, data)
 		except Exception as e:
 			doc.log_error("Prepared report render failed")
@@ -313,7 +340,8 @@ def get_prepared_report_result(report, filters, dn="", user=None):
 @frappe.whitelist()
 def export_query():
 	"""export from query reports"""
-	from frappe.desk.utils import get_csv_bytes, pop_csv_params, provide_binary_file
+	from frappe.desk.utils import pop_csv_params
+	from frappe.utils.streaming_export import get_export_writer, send_export
 
 	form_params = frappe._dict(frappe.local.form_dict)
 	csv_params = pop_csv_params(form_params)
@@ -346,18 +374,10 @@ def export_query():
 		return
 
 	format_fields(data)
-	xlsx_data, column_widths = build_xlsx_data(
-		data, visible_idx, include_indentation, include_filters=include_filters
+	writer = get_export_writer(
+		file_format_type, "Query Report", column_widths=get_xlsx_column_widths(data), csv_params=csv_params
 	)
-
-	if file_format_type == "CSV":
-		content = get_csv_bytes(xlsx_data, csv_params)
-		file_extension = "csv"
-	elif file_format_type == "Excel":
-		from frappe.utils.xlsxutils import make_xlsx
-
-		file_extension = "xlsx"
-		content = make_xlsx(xlsx_data, "Query Report", column_widths=column_widths).getvalue()
+	writer.write_rows(iter_xlsx_data(data, visible_idx, include_indentation, include_filters=include_filters))
 
 	if include_filters:
 		for value in (data.filters or {}).values():
@@ -370,7 +390,7 @@ def export_query():
 			if valid_report_name(report_name, suffix):
 				report_name += suffix
 
-	provide_binary_file(report_name, file_extension, content)
+	send_export(writer, report_name)
 
 
 def valid_report_name(report_name, suffix):
@@ -394,6 +414,24 @@ def format_fields(data: frappe._dict) -> None:
 
 
 def build_xlsx_data(data, visible_idx, include_indentation, include_filters=False, ignore_visible_idx=False):
+	result = list(iter_xlsx_data(data, visible_idx, include_indentation, include_filters, ignore_visible_idx))
+	return result, get_xlsx_column_widths(data)
+
+
+def get_xlsx_column_widths(data):
+	column_widths = []
+	for column in data.columns:
+		if column.get("hidden"):
+			continue
+		column_width = cint(column.get("width", 0))
+		# to convert into scale accepted by openpyxl
+		column_width /= 10
+		column_widths.append(column_width)
+	return column_widths
+
+
+def iter_xlsx_data(data, visible_idx, include_indentation, include_filters=False, ignore_visible_idx=False):
+	"""Yield rows of export of report `data`, without copying the whole result."""
 	EXCEL_TYPES = (
 		str,
 		bool,
@@ -413,11 +451,7 @@ def build_xlsx_data(data, visible_idx, include_indentation, include_filters=Fals
 		# Note: converted for faster lookups
 		visible_idx = set(visible_idx)
 
-	result = []
-	column_widths = []
-
 	if cint(include_filters):
-		filter_data = []
 		filters = data.filters
 		for filter_name, filter_value in filters.items():
 			if not filter_value:
@@ -427,20 +461,10 @@ def build_xlsx_data(data, visible_idx, include_indentation, include_filters=Fals
 				if isinstance(filter_value, list)
 				else cstr(filter_value)
 			)
-			filter_data.append([cstr(filter_name), filter_value])
-		filter_data.append([])
-		result += filter_data
+			yield [cstr(filter_name), filter_value]
+		yield []
 
-	column_data = []
-	for column in data.columns:
-		if column.get("hidden"):
-			continue
-		column_data.append(_(column.get("label")))
-		column_width = cint(column.get("width", 0))
-		# to convert into scale accepted by openpyxl
-		column_width /= 10
-		column_widths.append(column_width)
-	result.append(column_data)
+	yield [_(column.get("label")) for column in data.columns if not column.get("hidden")]
 
 	# build table from result
 	for row_idx, row in enumerate(data.result):
@@ -463,9 +487,7 @@ def build_xlsx_data(data, visible_idx, include_indentation, include_filters=Fals
 			elif row:
 				row_data = row
 
-			result.append(row_data)
-
-	return result, column_widths
+			yield row_data
 
 
 def add_total_row(result, columns, meta=None, is_tree=False, parent_field=None):
@@ -0,0 +1,134 @@
+# Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Cache of query and script report results.
+
+Reports with "Cache Result" checked keep their results in Redis for "Cache Expiry" seconds
+(default 300). Results are keyed by filters, user, roles and user permissions. With "Share Cached
+Result Between Users" checked the user is left out of the key, so that users with the same roles
+and user permissions share results.
+
+Cached results of a report are discarded when a document of its reference DocType, or of one of
+its "Source DocTypes", is changed through the document API. Every report has a version that is
+bumped on such changes and is part of the key of its results, stale results just expire.
+"""
+
+import hashlib
+from collections import defaultdict
+
+import frappe
+from frappe.utils import now
+
+RESULT_KEY_PREFIX = "report_result:"
+VERSIONS_KEY = "report_result_versions"
+SOURCES_KEY = "report_result_sources"
+DEFAULT_TTL = 5 * 60
+
+
+def get_result_key(report, filters, user: str, **options) -> str:
+	"""Return cache key of result of `report` for `filters` and permissions of `user`.
+
+	:param options: other arguments that change the result, like custom columns.
+	"""
+	from frappe.core.doctype.user_permission.user_permission import get_user_permissions
+
+	if isinstance(filters, dict):
+		# filters left empty in the report view are sent too
+		filters = {key: value for key, value in filters.items() if value not in (None, "", [])}
+
+	fingerprint = frappe.as_json(
+		{
+			"filters": filters,
+			"options": options,
+			"lang": frappe.local.lang,
+			# results can depend on the user through "If Owner" permissions, permission query
+			# conditions and has_permission hooks
+			"user": None if report.get("cache_shared") else user,
+			"roles": sorted(frappe.get_roles(user)),
+			"user_permissions": get_user_permissions(user),
+		},
+		indent=None,
+	)
+	digest = hashlib.sha256(fingerprint.encode()).hexdigest()
+	return f"{RESULT_KEY_PREFIX}{report.name}:{get_version(report.name)}:{digest}"
+
+
+def get_cached_result(key: str) -> dict | None:
+	if cached := frappe.cache.get_value(key, expires=True):
+		return cached["result"] | {"from_cache": True, "cached_at": cached["cached_at"]}
+
+
+def set_cached_result(report, key: str, result: dict):
+	frappe.cache.set_value(
+		key,
+		{"result": result, "cached_at": now()},
+		expires_in_sec=report.get("cache_ttl") or DEFAULT_TTL,
+	)
+
+
+def get_version(report_name: str) -> int:
+	version = frappe.cache.hmget(frappe.cache.make_key(VERSIONS_KEY), [report_name])[0]
+	return int(version or 0)
+
+
+def bump_versions(report_names):
+	key = frappe.cache.make_key(VERSIONS_KEY)
+	pipeline = frappe.cache.pipeline(transaction=False)
+	for report_name in report_names:
+		pipeline.hincrby(key, report_name, 1)
+	pipeline.execute()
+
+
+def get_reports_by_source() -> dict[str, list[str]]:
+	"""Return DocType -> names of reports with cached results that use the DocType."""
+	return frappe.cache.get_value(SOURCES_KEY, generator=_get_reports_by_source)
+
+
+def _get_reports_by_source() -> dict[str, list[str]]:
+	if not frappe.db.has_column("Report", "cache_result"):
+		# not migrated yet
+		return {}
+
+	reports_by_source = defaultdict(list)
+	for report in frappe.get_all(
+		"Report",
+		filters={"cache_result": 1, "disabled": 0},
+		fields=["name", "ref_doctype", "cache_source_doctypes"],
+	):
+		source_doctypes = (report.cache_source_doctypes or "").splitlines()
+		for doctype in {report.ref_doctype, *(d.strip() for d in source_doctypes)} - {""}:
+			reports_by_source[doctype].append(report.name)
+
+	return dict(reports_by_source)
+
+
+def clear_report_cache(report):
+	"""Discard cached results of `report` and forget which DocTypes it uses."""
+	frappe.cache.delete_value(SOURCES_KEY)
+	bump_versions([report.name])
+
+
+def clear_cached_results(doc, method=None, *args, **kwargs):
+	"""Discard cached results of reports that use the DocType of `doc`."""
+	if frappe.flags.in_install or frappe.flags.in_migrate:
+		return
+
+	if not (report_names := get_reports_by_source().get(doc.doctype)):
+		return
+
+	bump_versions(report_names)
+
+	# reports run by others before this transaction is committed would cache stale results
+	pending = frappe.flags.setdefault("report_results_to_clear", set())
+	if not pending:
+		frappe.db.after_commit.add(_clear_pending_results)
+		frappe.db.after_rollback.add(_forget_pending_results)
+	pending.update(report_names)
+
+
+def _clear_pending_results():
+	bump_versions(_forget_pending_results())
+
+
+def _forget_pending_results() -> set:
+	return frappe.flags.pop("report_results_to_clear", None) or set()
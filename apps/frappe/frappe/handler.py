@@ -81,6 +81,9 @@ def execute_cmd(cmd, from_async=False):
 		is_whitelisted(method)
 		is_valid_http_method(method)
 
+	if not from_async and is_read_request():
+		frappe.db.route_reads_to_replica()
+
 	return frappe.call(method, **frappe.form_dict)
 
 
@@ -104,6 +107,11 @@ def is_valid_http_method(method):
 		throw_permission_error()
 
 
+def is_read_request() -> bool:
+	request = getattr(frappe.local, "request", None)
+	return bool(request and request.method == "GET")
+
+
 def throw_permission_error():
 	frappe.throw(_("Not permitted"), frappe.PermissionError)
 
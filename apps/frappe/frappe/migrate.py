@@ -100,6 +100,11 @@ class SiteMigration:
 			print(f"Queued rebuilding of search index for {frappe.local.site}")
 			frappe.enqueue(build_index_for_all_routes, queue="long")
 
+		if frappe.conf.shared_meta_cache:
+			from frappe.model.meta_snapshot import enqueue_write_snapshot
+
+			enqueue_write_snapshot()
+
 		frappe.publish_realtime("version-update")
 		frappe.flags.touched_tables.clear()
 		frappe.flags.in_migrate = False
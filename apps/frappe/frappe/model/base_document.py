@@ -3,6 +3,7 @@
 import datetime
 import json
 import weakref
+from collections.abc import Iterable
 from functools import cached_property
 from typing import TYPE_CHECKING, TypeVar
 
@@ -22,6 +23,7 @@ from frappe.model.dynamic_links import invalidate_distinct_link_doctypes
 from frappe.model.naming import set_new_name
 from frappe.model.utils.link_count import notify_link_count
 from frappe.modules import load_doctype_module
+from frappe.monitor import increment_monitor_counter
 from frappe.utils import (
 	cast_fieldtype,
 	cint,
@@ -42,6 +44,7 @@ D = TypeVar("D", bound="Document")
 
 
 max_positive_value = {"smallint": 2**15 - 1, "int": 2**31 - 1, "bigint": 2**63 - 1}
+BATCH_INSERT_CHUNK_SIZE = 500
 
 DOCTYPE_TABLE_FIELDS = [
 	_dict(fieldname="fields", options="DocField"),
@@ -550,27 +553,13 @@ class BaseDocument:
 		                                        at database level (postgres)
 		                                        in python (mariadb)
 		"""
-		if not self.name:
-			# name will be set by document class in most cases
-			set_new_name(self)
-
 		conflict_handler = ""
 		# On postgres we can't implcitly ignore PK collision
 		# So instruct pg to ignore `name` field conflicts
 		if ignore_if_duplicate and frappe.db.db_type == "postgres":
 			conflict_handler = "on conflict (name) do nothing"
 
-		if not self.creation:
-			self.creation = self.modified = now()
-			self.owner = self.modified_by = frappe.session.user
-
-		# if doctype is "DocType", don't insert null values as we don't know who is valid yet
-		d = self.get_valid_dict(
-			convert_dates_to_str=True,
-			ignore_nulls=self.doctype in DOCTYPES_FOR_DOCTYPE,
-			ignore_virtual=True,
-		)
-
+		d = self.get_values_for_insert()
 		columns = list(d)
 		try:
 			frappe.db.sql(
@@ -611,6 +600,23 @@ class BaseDocument:
 
 		self.set("__islocal", False)
 
+	def get_values_for_insert(self) -> dict:
+		"""Set name and timestamps if missing and return the column values to be INSERTed."""
+		if not self.name:
+			# name will be set by document class in most cases
+			set_new_name(self)
+
+		if not self.creation:
+			self.creation = self.modified = now()
+			self.owner = self.modified_by = frappe.session.user
+
+		# if doctype is "DocType", don't insert null values as we don't know who is valid yet
+		return self.get_valid_dict(
+			convert_dates_to_str=True,
+			ignore_nulls=self.doctype in DOCTYPES_FOR_DOCTYPE,
+			ignore_virtual=True,
+		)
+
 	def db_update(self):
 		if self.get("__islocal") or not self.name:
 			self.db_insert()
@@ -626,7 +632,22 @@ class BaseDocument:
 		name = cstr(d["name"])
 		del d["name"]
 
+		# only write columns that changed since the values were loaded (set during save)
+		if (values_before_save := self.__dict__.pop("_values_before_save", None)) is not None:
+			d = {
+				column: value
+				for column, value in d.items()
+				if column not in values_before_save or values_before_save[column] != value
+			}
+
+			# child rows get a new `modified` on every save of the parent, that alone isn't a change
+			if not d or (self.meta.istable and d.keys() <= {"modified", "modified_by"}):
+				increment_monitor_counter("db_update_skipped_rows")
+				return
+
 		columns = list(d)
+		increment_monitor_counter("db_update_rows")
+		increment_monitor_counter("db_update_columns", len(columns))
 
 		try:
 			frappe.db.sql(
@@ -1301,6 +1322,59 @@ class BaseDocument:
 				extract_images_from_doc(self, df.fieldname)
 
 
+def db_insert_multiple(docs: Iterable[BaseDocument], chunk_size: int | None = None) -> None:
+	"""INSERT documents using one multi-row INSERT statement per doctype (and chunk).
+
+	Meant for child rows of a document being saved: rows are expected to be validated
+	already, this only replaces the per-row round trips of `db_insert`.
+
+	If a chunk fails with a duplicate / unique key error on MariaDB, the statement is
+	rolled back as a whole by the database, so its rows are inserted again one by one
+	using `db_insert` to report the offending row the usual way.
+
+	:param docs: documents to insert, can be of different doctypes.
+	:param chunk_size: max rows per INSERT statement, defaults to `batch_insert_chunk_size`
+	        from site config (or 500).
+	"""
+	chunk_size = cint(chunk_size or frappe.conf.batch_insert_chunk_size) or BATCH_INSERT_CHUNK_SIZE
+
+	grouped: dict[tuple, list[tuple[BaseDocument, dict]]] = {}
+	for doc in docs:
+		d = doc.get_values_for_insert()
+		# documents with `ignore_nulls` can have different column sets
+		grouped.setdefault((doc.doctype, tuple(d)), []).append((doc, d))
+
+	for (doctype, columns), rows in grouped.items():
+		for i in range(0, len(rows), chunk_size):
+			chunk = rows[i : i + chunk_size]
+			if len(chunk) == 1:
+				chunk[0][0].db_insert()
+				continue
+
+			row_placeholder = "({})".format(", ".join(["%s"] * len(columns)))
+			try:
+				frappe.db.sql(
+					"""INSERT INTO `tab{doctype}` ({columns}) VALUES {values}""".format(
+						doctype=doctype,
+						columns=", ".join("`" + c + "`" for c in columns),
+						values=", ".join([row_placeholder] * len(chunk)),
+					),
+					[value for _doc, d in chunk for value in d.values()],
+				)
+			except Exception as e:
+				if frappe.db.db_type == "postgres" or not (
+					frappe.db.is_primary_key_violation(e) or frappe.db.is_unique_key_violation(e)
+				):
+					raise
+
+				for doc, _d in chunk:
+					doc.db_insert()
+				continue
+
+			for doc, _d in chunk:
+				doc.set("__islocal", False)
+
+
 def _filter(data, filters, limit=None):
 	"""pass filters as:
 	{"key": "val", "key": ["!=", "val"],
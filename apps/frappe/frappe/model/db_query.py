@@ -109,6 +109,7 @@ class DatabaseQuery:
 		ignore_ddl=False,
 		*,
 		parent_doctype=None,
+		as_iterator=False,
 	) -> list:
 		if not ignore_permissions:
 			self.check_read_permission(self.doctype, parent_doctype=parent_doctype)
@@ -156,6 +157,7 @@ class DatabaseQuery:
 		self.strict = strict
 		self.ignore_ddl = ignore_ddl
 		self.parent_doctype = parent_doctype
+		self.as_iterator = as_iterator and run
 
 		# for contextual user permission check
 		# to determine which user permission is applicable on link field of specific doctype
@@ -191,6 +193,8 @@ class DatabaseQuery:
 		result = self.build_and_run()
 
 		if sbool(with_comment_count) and not as_list and self.doctype:
+			if self.as_iterator:
+				frappe.throw(_("`as_iterator` can not be used with `with_comment_count`"))
 			self.add_comment_count(result)
 
 		if save_user_settings:
@@ -198,6 +202,8 @@ class DatabaseQuery:
 			self.update_user_settings()
 
 		if pluck:
+			if self.as_iterator:
+				return (d[pluck] for d in result)
 			return [d[pluck] for d in result]
 
 		return result
@@ -229,6 +235,15 @@ from {tables}
 {order_by}
 {limit}""".format(**args)
 
+		if self.as_iterator:
+			return frappe.db.stream(
+				query,
+				as_dict=not self.as_list,
+				debug=self.debug,
+				update=self.update,
+				ignore_ddl=self.ignore_ddl,
+			)
+
 		return frappe.db.sql(
 			query,
 			as_dict=not self.as_list,
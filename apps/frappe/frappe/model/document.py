@@ -15,7 +15,12 @@ from frappe.core.doctype.server_script.server_script_utils import run_server_scr
 from frappe.desk.form.document_follow import follow_document
 from frappe.integrations.doctype.webhook import run_webhooks
 from frappe.model import optional_fields, table_fields
-from frappe.model.base_document import BaseDocument, get_controller
+from frappe.model.base_document import (
+	DOCTYPES_FOR_DOCTYPE,
+	BaseDocument,
+	db_insert_multiple,
+	get_controller,
+)
 from frappe.model.docstatus import DocStatus
 from frappe.model.naming import set_new_name, validate_name
 from frappe.model.utils import is_virtual_doctype
@@ -320,8 +325,11 @@ class Document(BaseDocument):
 			self.db_insert(ignore_if_duplicate=ignore_if_duplicate)
 
 		# children
-		for d in self.get_all_children():
-			d.db_insert()
+		if self._batch_child_inserts():
+			db_insert_multiple(self.get_all_children())
+		else:
+			for d in self.get_all_children():
+				d.db_insert()
 
 		self.run_method("after_insert")
 		self.flags.in_insert = True
@@ -425,6 +433,7 @@ class Document(BaseDocument):
 		if self.meta.issingle:
 			self.update_single(self.get_valid_dict())
 		else:
+			self.set_values_before_save()
 			self.db_update()
 
 		self.update_children()
@@ -496,9 +505,47 @@ class Document(BaseDocument):
 			qry.run()
 
 		# update / insert
+		batch_inserts = self._batch_child_inserts()
+		new_rows = []
 		for d in all_rows:
 			d: Document
-			d.db_update()
+			if batch_inserts and (d.is_new() or not d.name):
+				new_rows.append(d)
+			else:
+				d.db_update()
+
+		if new_rows:
+			db_insert_multiple(new_rows)
+
+	def _batch_child_inserts(self) -> bool:
+		"""Insert new child rows using multi-row INSERT statements.
+
+		Enabled per document with `doc.flags.batch_child_inserts` or for the site
+		with `batch_child_inserts` in site config."""
+		return bool(self.flags.batch_child_inserts or frappe.conf.batch_child_inserts)
+
+	def set_values_before_save(self):
+		"""Attach values of `_doc_before_save` to the document and its existing child rows,
+		so that `db_update` only writes columns that changed and skips untouched rows.
+
+		Disable with `disable_diff_based_updates` in site config."""
+		previous = self.get_doc_before_save()
+		if not previous or frappe.conf.disable_diff_based_updates:
+			return
+
+		def get_db_values(doc):
+			return doc.get_valid_dict(
+				convert_dates_to_str=True,
+				ignore_nulls=doc.doctype in DOCTYPES_FOR_DOCTYPE,
+				ignore_virtual=True,
+			)
+
+		self._values_before_save = get_db_values(previous)
+
+		previous_rows = {(d.doctype, d.name): d for d in previous.get_all_children()}
+		for d in self.get_all_children():
+			if not d.is_new() and (row := previous_rows.get((d.doctype, d.name))):
+				d._values_before_save = get_db_values(row)
 
 	def get_doc_before_save(self) -> "Document":
 		return getattr(self, "_doc_before_save", None)
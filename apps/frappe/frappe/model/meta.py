@@ -16,6 +16,7 @@ Example:
 """
 import json
 import os
+import pickle
 from datetime import datetime
 
 import click
@@ -62,8 +63,18 @@ LARGE_TABLE_SIZE_THRESHOLD = 100_000
 LARGE_TABLE_RECENCY_THRESHOLD = 30  # days
 
 
+META_CACHE_VERSION_KEY = "doctype_meta_version"
+
+# Process wide cache of pickled metas, used with `shared_meta_cache` enabled.
+# site -> (meta cache version, {doctype: pickled Meta})
+_process_meta_cache: dict[str, tuple[str, dict[str, bytes]]] = {}
+
+
 def get_meta(doctype, cached=True) -> "Meta":
 	cached = cached and isinstance(doctype, str)
+	if cached and frappe.conf.shared_meta_cache:
+		return _get_meta_from_process_cache(doctype)
+
 	if cached and (meta := frappe.cache.hget("doctype_meta", doctype)):
 		return meta
 
@@ -72,6 +83,51 @@ def get_meta(doctype, cached=True) -> "Meta":
 	return meta
 
 
+def _get_meta_from_process_cache(doctype: str) -> "Meta":
+	"""Get meta from the shared snapshot file or pickled metas kept across requests in this
+	process, falling back to Redis. Cache is dropped when meta cache version changes.
+
+	Metas are mutable, so every request unpickles its own copy."""
+	version = get_meta_cache_version()
+	request_metas = frappe.local.cache.setdefault("shared_meta_cache", {})
+	if meta := request_metas.get((version, doctype)):
+		return meta
+
+	meta = request_metas[(version, doctype)] = _load_shared_meta(doctype, version)
+	return meta
+
+
+def _load_shared_meta(doctype: str, version: str) -> "Meta":
+	from frappe.model.meta_snapshot import load_meta as load_meta_from_snapshot
+
+	if meta := load_meta_from_snapshot(doctype, version):
+		return meta
+
+	cached_version, pickled_metas = _process_meta_cache.get(frappe.local.site, (None, None))
+	if cached_version != version:
+		pickled_metas = {}
+		_process_meta_cache[frappe.local.site] = (version, pickled_metas)
+
+	if pickled := pickled_metas.get(doctype):
+		return pickle.loads(pickled)
+
+	if not (meta := frappe.cache.hget("doctype_meta", doctype)):
+		meta = Meta(doctype)
+		frappe.cache.hset("doctype_meta", meta.name, meta)
+
+	pickled_metas[doctype] = pickle.dumps(meta, protocol=pickle.HIGHEST_PROTOCOL)
+	return meta
+
+
+def get_meta_cache_version() -> str:
+	"""Version of cached metas of current site, changes on every `clear_doctype_cache`."""
+	return frappe.cache.get_value(META_CACHE_VERSION_KEY, generator=lambda: frappe.generate_hash(length=12))
+
+
+def bump_meta_cache_version():
+	frappe.cache.set_value(META_CACHE_VERSION_KEY, frappe.generate_hash(length=12))
+
+
 def load_meta(doctype):
 	return Meta(doctype)
 
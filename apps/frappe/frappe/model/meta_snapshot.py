@@ -0,0 +1,138 @@
+# Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Read-only snapshot of all `Meta` objects of a site, shared by all workers.
+
+The snapshot is a single file in the site directory which every worker memory-maps, so the
+pickled metas live once in the OS page cache instead of being fetched from Redis by every
+worker. Cold workers can load any DocType's meta without a Redis round trip.
+
+File layout:
+
+        | pickled Meta | pickled Meta | ... | index (JSON) | index length (8 bytes) |
+
+The index holds the meta cache version the snapshot was built for and the location of every
+pickled meta as `{doctype: [offset, length]}`. A snapshot is only used while its version
+matches the current version (see `frappe.model.meta.get_meta_cache_version`), so
+`clear_doctype_cache` invalidates it without touching the file.
+
+Enable with `shared_meta_cache` in site config.
+"""
+
+import json
+import mmap
+import os
+import pickle
+import struct
+
+import frappe
+
+SNAPSHOT_FILE = "meta_snapshot.bin"
+INDEX_LENGTH = struct.Struct("!Q")
+
+# site -> (mtime of snapshot file, opened snapshot or None)
+_snapshots: dict[str, tuple[float, "MetaSnapshot | None"]] = {}
+
+
+class MetaSnapshot:
+	__slots__ = ("version", "index", "_mmap")
+
+	def __init__(self, path: str):
+		with open(path, "rb") as f:
+			self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+		index_end = len(self._mmap) - INDEX_LENGTH.size
+		(index_length,) = INDEX_LENGTH.unpack_from(self._mmap, index_end)
+		index = json.loads(self._mmap[index_end - index_length : index_end])
+		self.version: str = index["version"]
+		self.index: dict[str, list[int]] = index["doctypes"]
+
+	def get(self, doctype: str):
+		if location := self.index.get(doctype):
+			offset, length = location
+			return pickle.loads(self._mmap[offset : offset + length])
+
+	def close(self):
+		self._mmap.close()
+
+
+def get_snapshot_path() -> str:
+	return frappe.get_site_path(SNAPSHOT_FILE)
+
+
+def get_snapshot(version: str) -> MetaSnapshot | None:
+	"""Return snapshot of current site if it was built for `version`."""
+	site = frappe.local.site
+	mtime, snapshot = _snapshots.get(site, (None, None))
+
+	if snapshot and snapshot.version == version:
+		return snapshot
+
+	try:
+		current_mtime = os.stat(get_snapshot_path()).st_mtime
+	except FileNotFoundError:
+		current_mtime = None
+
+	if current_mtime != mtime:
+		if snapshot:
+			snapshot.close()
+
+		snapshot = None
+		if current_mtime is not None:
+			try:
+				snapshot = MetaSnapshot(get_snapshot_path())
+			except Exception:
+				frappe.logger("meta").exception("Failed to open meta snapshot")
+
+		_snapshots[site] = (current_mtime, snapshot)
+
+	if snapshot and snapshot.version == version:
+		return snapshot
+
+
+def load_meta(doctype: str, version: str):
+	"""Return Meta for `doctype` from the snapshot if available and up to date."""
+	if snapshot := get_snapshot(version):
+		return snapshot.get(doctype)
+
+
+def write_snapshot():
+	"""Build metas of all DocTypes and write them to the site's snapshot file.
+
+	The file is written to a temporary path and atomically moved in place, workers that have
+	the old snapshot mapped keep reading it until they notice the change."""
+	from frappe.model.meta import get_meta, get_meta_cache_version
+
+	version = get_meta_cache_version()
+	index = {}
+	payload = bytearray()
+
+	for doctype in frappe.get_all("DocType", pluck="name", order_by="name"):
+		try:
+			meta = pickle.dumps(get_meta(doctype), protocol=pickle.HIGHEST_PROTOCOL)
+		except Exception:
+			frappe.logger("meta").exception(f"Failed to add {doctype} to meta snapshot")
+			continue
+
+		index[doctype] = [len(payload), len(meta)]
+		payload += meta
+
+	index = json.dumps({"version": version, "doctypes": index}, separators=(",", ":")).encode()
+
+	path = get_snapshot_path()
+	temp_path = f"{path}.{os.getpid()}.tmp"
+	with open(temp_path, "wb") as f:
+		f.write(payload)
+		f.write(index)
+		f.write(INDEX_LENGTH.pack(len(index)))
+
+	os.replace(temp_path, path)
+
+
+def enqueue_write_snapshot():
+	frappe.enqueue(
+		"frappe.model.meta_snapshot.write_snapshot",
+		queue="long",
+		job_id="meta_snapshot",
+		deduplicate=True,
+	)
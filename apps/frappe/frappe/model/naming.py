@@ -3,7 +3,9 @@
 
 import base64
 import datetime
+import os
 import re
+import threading
 import time
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Optional
@@ -35,6 +37,18 @@ NAMING_SERIES_PART_TYPES = (
 )
 
 
+# numbers of series reserved by this process: (site, series key) -> [next number, last number]
+_series_blocks: dict[tuple[str, str], list[int]] = {}
+_series_blocks_pid = os.getpid()
+# guards `_series_blocks`, held only to read or update it
+_series_blocks_lock = threading.Lock()
+# (site, series key) -> lock held while reserving a block, one reservation per series at a time
+_series_reservation_locks: dict[tuple[str, str], threading.Lock] = {}
+# seconds to wait for the series row when reserving a block, the row can be locked by the very
+# transaction that needs a name (e.g. after `revert_series_if_last`)
+SERIES_BLOCK_LOCK_TIMEOUT = 1
+
+
 class InvalidNamingSeriesError(frappe.ValidationError):
 	pass
 
@@ -110,7 +124,11 @@ class NamingSeries:
 		return generated_names
 
 	def update_counter(self, new_count: int) -> None:
-		"""Warning: Incorrectly updating series can result in unusable transactions"""
+		"""Warning: Incorrectly updating series can result in unusable transactions
+
+		Blocks of series numbers (see `get_series_block_size`) are only forgotten by this process,
+		other processes hand out numbers of their blocks till those run out. Restart them after
+		lowering the counter of a series with blocks."""
 		Series = frappe.qb.DocType("Series")
 		prefix = self.get_prefix()
 
@@ -119,6 +137,7 @@ class NamingSeries:
 			frappe.qb.into(Series).insert(prefix, 0).columns("name", "current").run()
 
 		(frappe.qb.update(Series).set(Series.current, cint(new_count)).where(Series.name == prefix)).run()
+		clear_series_blocks(prefix)
 
 	def get_current_value(self) -> int:
 		prefix = self.get_prefix()
@@ -382,6 +401,9 @@ def determine_consecutive_week_number(datetime):
 
 
 def getseries(key, digits):
+	if (block_size := get_series_block_size(key)) and (current := get_next_from_block(key, block_size)):
+		return ("%0" + str(digits) + "d") % current
+
 	# series created ?
 	# Using frappe.qb as frappe.get_values does not allow order_by=None
 	series = DocType("Series")
@@ -399,6 +421,122 @@ def getseries(key, digits):
 	return ("%0" + str(digits) + "d") % current
 
 
+def get_series_block_size(key: str) -> int:
+	"""Return number of series numbers a process reserves at once for series with counter `key`.
+
+	Set in site config, by start of series key (longest match wins) with "*" for all series:
+
+	        "naming_series_block_size": {"SINV-": 50, "*": 10}
+
+	Numbers are then taken from a block reserved in a short separate transaction, instead of
+	locking the series till the document is saved. Names aren't in order of creation across
+	processes and unused numbers of a block are skipped when the process exits, so the block size
+	is the gap a series can tolerate. Blocks aren't given back when the counter is updated, see
+	`NamingSeries.update_counter`. Returns 0 for series that are incremented one by one."""
+	block_sizes = frappe.conf.naming_series_block_size
+	if not block_sizes:
+		return 0
+
+	if not isinstance(block_sizes, dict):
+		return cint(block_sizes)
+
+	matches = [prefix for prefix in block_sizes if prefix != "*" and key.startswith(prefix)]
+	return cint(block_sizes[max(matches, key=len)] if matches else block_sizes.get("*"))
+
+
+def get_next_from_block(key: str, block_size: int) -> int | None:
+	"""Return next number of series from block of this process, or None if no block can be
+	reserved because the series is locked."""
+	global _series_blocks_pid
+
+	block_key = (frappe.local.site, key)
+	with _series_blocks_lock:
+		if _series_blocks_pid != os.getpid():
+			# blocks of parent process are also held by its other children
+			_series_blocks.clear()
+			_series_reservation_locks.clear()
+			_series_blocks_pid = os.getpid()
+
+		if (current := _take_from_block(block_key)) is not None:
+			return current
+		reservation_lock = _series_reservation_locks.setdefault(block_key, threading.Lock())
+
+	# other series aren't held up while this one waits for its row
+	with reservation_lock:
+		with _series_blocks_lock:
+			# reserved by another thread meanwhile
+			if (current := _take_from_block(block_key)) is not None:
+				return current
+
+		if not (last := reserve_series_block(key, block_size)):
+			return None
+
+		with _series_blocks_lock:
+			_series_blocks[block_key] = [last - block_size + 1, last]
+			return _take_from_block(block_key)
+
+
+def _take_from_block(block_key: tuple[str, str]) -> int | None:
+	block = _series_blocks.get(block_key)
+	if not block or block[0] > block[1]:
+		return None
+
+	current = block[0]
+	block[0] += 1
+	return current
+
+
+def reserve_series_block(key: str, size: int) -> int | None:
+	"""Reserve next `size` numbers of series in a separate transaction and return the last one.
+
+	Returns None if the series row stays locked for `SERIES_BLOCK_LOCK_TIMEOUT` seconds. The lock
+	may be held by the current transaction, which would then wait for itself."""
+	from frappe.database import get_db
+
+	conf = frappe.local.conf
+	db = get_db(
+		socket=conf.db_socket,
+		host=conf.db_host,
+		port=conf.db_port,
+		user=conf.db_name,
+		password=conf.db_password,
+		cur_db_name=conf.db_name,
+	)
+
+	try:
+		if db.db_type == "postgres":
+			db.sql(f"SET lock_timeout = '{SERIES_BLOCK_LOCK_TIMEOUT}s'")
+		else:
+			db.sql(f"SET SESSION innodb_lock_wait_timeout = {SERIES_BLOCK_LOCK_TIMEOUT}")
+
+		current = db.sql("SELECT `current` FROM `tabSeries` WHERE `name`=%s FOR UPDATE", (key,))
+		if current and current[0][0] is not None:
+			db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name`=%s", (size, key))
+			last = cint(current[0][0]) + size
+		else:
+			db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (key, size))
+			last = size
+		db.commit()
+		return last
+	except frappe.QueryTimeoutError:
+		db.rollback()
+		return None
+	except Exception:
+		db.rollback()
+		raise
+	finally:
+		db.close()
+
+
+def clear_series_blocks(key: str | None = None) -> None:
+	"""Forget numbers reserved by this process, of series with counter `key` or of all series."""
+	with _series_blocks_lock:
+		if key is None:
+			_series_blocks.clear()
+		else:
+			_series_blocks.pop((frappe.local.site, key), None)
+
+
 def revert_series_if_last(key, name, doc=None):
 	"""
 	Reverts the series for particular naming series:
@@ -1,6 +1,7 @@
 # Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 import re
+from typing import TYPE_CHECKING
 
 import frappe
 from frappe import _
@@ -8,6 +9,9 @@ from frappe.build import html_to_js_template
 from frappe.utils import cstr
 from frappe.utils.caching import site_cache
 
+if TYPE_CHECKING:
+	from frappe.model.document import Document
+
 STANDARD_FIELD_CONVERSION_MAP = {
 	"name": "Link",
 	"owner": "Data",
@@ -144,3 +148,35 @@ def is_single_doctype(doctype: str) -> bool:
 		return False
 
 	return frappe.db.get_value("DocType", doctype, "issingle")
+
+
+def prefetch_links(docs: list["Document"]) -> None:
+	"""Load linked documents of `docs` and their child rows with one query per linked DocType.
+
+	Link validation of these documents is then served from `frappe.db` value cache."""
+	lookups = []
+	link_fields = {}
+	for doc in docs:
+		for d in (doc, *doc.get_all_children()):
+			if d.doctype not in link_fields:
+				link_fields[d.doctype] = d.meta.get_link_fields() + d.meta.get(
+					"fields", {"fieldtype": ("=", "Dynamic Link")}
+				)
+
+			for df in link_fields[d.doctype]:
+				link_doctype = df.options if df.fieldtype == "Link" else d.get(df.options)
+				if (docname := d.get(df.fieldname)) and link_doctype:
+					lookups.append((link_doctype, docname, ["name"]))
+
+	linked_metas = {}
+	for link_doctype in {lookup[0] for lookup in lookups}:
+		try:
+			linked_metas[link_doctype] = frappe.get_meta(link_doctype)
+		except frappe.DoesNotExistError:
+			pass
+
+	frappe.db.prefetch(
+		lookup
+		for lookup in lookups
+		if (link_meta := linked_metas.get(lookup[0])) and not (link_meta.issingle or link_meta.is_virtual)
+	)
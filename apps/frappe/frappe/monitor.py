@@ -11,6 +11,7 @@ import pytz
 import rq
 
 import frappe
+from frappe.utils import sampling_profiler
 from frappe.utils.data import cint
 from frappe.utils.synchronization import filelock
 
@@ -35,6 +36,18 @@ def add_data_to_monitor(**kwargs) -> None:
 		frappe.local.monitor.add_custom_data(**kwargs)
 
 
+def increment_monitor_counter(counter: str, value: int = 1) -> None:
+	"""Increment a numeric counter logged along with monitor log."""
+	if monitor := getattr(frappe.local, "monitor", None):
+		monitor.increment_counter(counter, value)
+
+
+def add_query_to_monitor(query: str, duration: float) -> None:
+	"""Add time taken by a query to SQL time and count of current transaction."""
+	if monitor := getattr(frappe.local, "monitor", None):
+		monitor.add_query(query, duration)
+
+
 def get_trace_id() -> str | None:
 	"""Get unique ID for current transaction."""
 	if monitor := getattr(frappe.local, "monitor", None):
@@ -46,9 +59,10 @@ def log_file():
 
 
 class Monitor:
-	__slots__ = ("data",)
+	__slots__ = ("data", "profile")
 
 	def __init__(self, transaction_type, method, kwargs):
+		self.profile = None
 		try:
 			self.data = frappe._dict(
 				{
@@ -63,6 +77,9 @@ class Monitor:
 				self.collect_request_meta()
 			else:
 				self.collect_job_meta(method, kwargs)
+
+			if rate := cint(frappe.conf.monitor_sampling_rate):
+				self.profile = sampling_profiler.start_profile(rate)
 		except Exception:
 			traceback.print_exc()
 
@@ -88,11 +105,45 @@ class Monitor:
 			self.data.job_id = job.id
 			waitdiff = self.data.timestamp - job.enqueued_at.replace(tzinfo=pytz.UTC)
 			self.data.job.wait = int(waitdiff.total_seconds() * 1000000)
+			# to break down wait time by queue and priority
+			self.data.job.queue = job.origin
+			if priority := job.meta.get("priority"):
+				self.data.job.priority = priority
 
 	def add_custom_data(self, **kwargs):
 		if self.data:
 			self.data.update(kwargs)
 
+	def increment_counter(self, counter, value=1):
+		if self.data:
+			counters = self.data.setdefault("counters", frappe._dict())
+			counters[counter] = counters.get(counter, 0) + value
+
+	def add_query(self, query, duration):
+		if self.data:
+			query_type = (query[:32].split(maxsplit=1) or [""])[0].lower()
+			duration = int(duration * 1000000)
+
+			sql = self.data.setdefault("sql", frappe._dict(count=0, time=0, types=frappe._dict()))
+			sql.count += 1
+			sql.time += duration
+			breakdown = sql.types.setdefault(query_type, frappe._dict(count=0, time=0))
+			breakdown.count += 1
+			breakdown.time += duration
+
+	def get_endpoint(self):
+		if self.data.transaction_type == "request":
+			path = self.data.request.path
+			if path.startswith("/api/"):
+				# /api/resource/{doctype}/{name} -> /api/resource/{doctype}
+				return "/".join(path.split("/", 4)[:4])
+			# routes of desk and website pages are unbounded (/app/{doctype}/{name}, /blog/{slug}),
+			# group them to keep the number of endpoints small
+			if path == "/app" or path.startswith("/app/"):
+				return "/app"
+			return "website"
+		return self.data.job.method
+
 	def dump(self, response=None):
 		try:
 			timediff = datetime.datetime.now(pytz.UTC) - self.data.timestamp
@@ -112,6 +163,12 @@ class Monitor:
 					if limiter.rejected:
 						self.data.request.reset = limiter.reset
 
+			if self.profile is not None:
+				sampling_profiler.stop_profile()
+				rate = cint(frappe.conf.monitor_sampling_rate)
+				self.data.profile = sampling_profiler.summarize_profile(self.profile, rate)
+				sampling_profiler.aggregate_profile(self.get_endpoint(), self.profile)
+
 			self.store()
 		except Exception:
 			traceback.print_exc()
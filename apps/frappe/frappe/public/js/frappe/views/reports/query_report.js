@@ -664,6 +664,7 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 					is_tree: this.report_settings.tree,
 					parent_field: this.report_settings.parent_field,
 					are_default_filters: are_default_filters,
+					paged: 1,
 				},
 				callback: resolve,
 				always: () => this.page.btn_secondary.prop("disabled", false),
@@ -675,6 +676,7 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 				clearInterval(this.interval);
 
 				this.execution_time = data.execution_time || 0.1;
+				this.show_cache_indicator(data);
 
 				if (data.custom_filters) {
 					this.set_filters(data.custom_filters);
@@ -745,6 +747,21 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 			});
 	}
 
+	show_cache_indicator(data) {
+		if (!data.from_cache) {
+			this.page.clear_indicator();
+			return;
+		}
+
+		this.page.set_indicator(__("Cached"), "blue");
+		this.page.indicator.attr(
+			"title",
+			__("Result was generated {0} and is reused until its data changes.", [
+				frappe.datetime.prettyDate(data.cached_at),
+			])
+		);
+	}
+
 	render_summary(data) {
 		data.forEach((summary) => {
 			frappe.utils.build_summary_item(summary).appendTo(this.$summary);
@@ -957,12 +974,23 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 		this.data = this.prepare_data(data.result);
 		this.linked_doctypes = this.get_linked_doctypes();
 		this.tree_report = this.data.some((d) => "indent" in d);
+		// sorting and filters of paged results, applied on the server
+		this.paged_query = {};
+		this.paged_count = data.total_count;
 	}
 
 	render_datatable() {
 		let data = this.data;
 		let columns = this.columns.filter((col) => !col.hidden);
 
+		if (this.raw_data.paged && this.paged_query.sort_by) {
+			columns = columns.map((col) =>
+				col.id === this.paged_query.sort_by
+					? { ...col, sortOrder: this.paged_query.sort_order }
+					: col
+			);
+		}
+
 		if (data.length > (cint(frappe.boot.sysdefaults.max_report_rows) || 100000)) {
 			let msg = __(
 				"This report contains {0} rows and is too big to display in browser, you can {1} this report instead.",
@@ -999,7 +1027,11 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 				showTotalRow: this.raw_data.add_total_row && !this.report_settings.tree,
 				direction: frappe.utils.is_rtl() ? "rtl" : "ltr",
 				hooks: {
-					columnTotal: frappe.utils.report_column_total,
+					columnTotal: (values, column, type) => this.get_column_total(values, column, type),
+				},
+				events: {
+					// only some rows of paged results are loaded, they are sorted on the server
+					onSortColumn: (column) => this.raw_data.paged && this.sort_paged_rows(column),
 				},
 			};
 
@@ -1009,6 +1041,14 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 			this.datatable = new window.DataTable(this.$report[0], datatable_options);
 		}
 
+		// only some rows of paged results are loaded, they are filtered on the server
+		const filter_paged_rows = frappe.utils.debounce(
+			() => this.raw_data.paged && this.filter_paged_rows(),
+			300
+		);
+		this.$report.off("input.paged_filters");
+		this.$report.on("input.paged_filters", ".dt-filter", filter_paged_rows);
+
 		if (typeof this.report_settings.initial_depth == "number") {
 			this.datatable.rowmanager.setTreeDepth(this.report_settings.initial_depth);
 		}
@@ -1017,6 +1057,15 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 		}
 	}
 
+	get_column_total(values, column, type) {
+		if (this.raw_data.paged) {
+			// totals of paged results are computed over all rows on the server
+			const total_row = this.data[this.data.length - 1];
+			return column.column.disable_total ? "" : total_row[column.column.id];
+		}
+		return frappe.utils.report_column_total(values, column, type);
+	}
+
 	show_loading_screen() {
 		const loading_state = `<div class="msg-box no-border">
 			<div>
@@ -1557,7 +1606,9 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 					filters.prepared_report_name = this.prepared_report_name;
 				}
 
-				const visible_idx = this.datatable?.bodyRenderer.visibleRowIndices || [];
+				// only some rows of paged results are loaded, export all of their rows
+				const visible_idx =
+					(!this.raw_data?.paged && this.datatable?.bodyRenderer.visibleRowIndices) || [];
 				if (visible_idx.length + 1 === this.data?.length) {
 					visible_idx.push(visible_idx.length);
 				}
@@ -1990,6 +2041,24 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 			this.$tree_footer.find("[data-action=expand_all_rows]").hide();
 		}
 
+		if (this.raw_data && this.raw_data.paged) {
+			const loaded = this.get_loaded_row_count();
+			const total = this.paged_count;
+			let load_more_button = "";
+			if (loaded < total) {
+				load_more_button = `<button class="btn btn-xs btn-default" data-action="load_more_rows">
+					${__("Load More")}</button>`;
+			}
+
+			this.$report_footer.append(`<div class="col-md-12">
+				<span>${__("Showing {0} of {1} rows.", [
+					format_number(loaded, null, 0),
+					format_number(total, null, 0),
+				])}</span>
+				${load_more_button}
+			</div>`);
+		}
+
 		const message = __(
 			"For comparison, use >5, <10 or =324. For ranges, use 5:10 (for values between 5 & 10)."
 		);
@@ -2000,6 +2069,92 @@ frappe.views.QueryReport = class QueryReport extends frappe.views.BaseList {
 		</div>`);
 	}
 
+	get_loaded_row_count() {
+		return this.raw_data.add_total_row ? this.data.length - 1 : this.data.length;
+	}
+
+	get_paged_rows(start) {
+		// large prepared report results are fetched a page at a time
+		const request = (this.paged_request = (this.paged_request || 0) + 1);
+		return frappe
+			.xcall("frappe.core.doctype.prepared_report.prepared_report.get_prepared_report_page", {
+				dn: this.prepared_report_document.name,
+				start: start,
+				page_length: this.raw_data.page_length,
+				sort_by: this.paged_query.sort_by,
+				sort_order: this.paged_query.sort_order,
+				filters: this.paged_query.filters,
+			})
+			.then((page) => {
+				// a newer request for other sorting or filters was made meanwhile
+				if (request !== this.paged_request) return;
+
+				this.paged_count = page.total_count;
+				return this.prepare_data(page.result);
+			});
+	}
+
+	load_more_rows() {
+		return this.get_paged_rows(this.get_loaded_row_count()).then((rows) => {
+			if (!rows) return;
+
+			this.data.splice(this.get_loaded_row_count(), 0, ...rows);
+			const is_filtered = Object.keys(this.paged_query.filters || {}).length;
+			if (!is_filtered && this.get_loaded_row_count() >= this.raw_data.total_count) {
+				// all rows are loaded, they can be sorted and filtered in the browser again
+				this.raw_data.paged = false;
+			}
+			this.render_paged_rows();
+		});
+	}
+
+	sort_paged_rows(column) {
+		const sort_order = column.sortOrder === "none" ? null : column.sortOrder;
+		this.paged_query.sort_by = sort_order ? column.id : null;
+		this.paged_query.sort_order = sort_order;
+		return this.reload_paged_rows();
+	}
+
+	filter_paged_rows() {
+		const filters = {};
+		this.$report.find(".dt-filter").each((i, input) => {
+			const column = this.datatable.getColumn(input.dataset.colIndex);
+			if (column && column.id && input.value.trim()) {
+				filters[column.id] = input.value.trim();
+			}
+		});
+		this.paged_query.filters = filters;
+		return this.reload_paged_rows();
+	}
+
+	reload_paged_rows() {
+		return this.get_paged_rows(0).then((rows) => {
+			if (!rows) return;
+
+			const total_row = this.raw_data.add_total_row ? this.data.slice(-1) : [];
+			this.data = [...rows, ...total_row];
+			this.render_paged_rows();
+		});
+	}
+
+	render_paged_rows() {
+		const focused_filter = this.$report.find(".dt-filter:focus").attr("data-col-index");
+		this.render_datatable();
+
+		// filter inputs are rendered again with the rows
+		const filters = this.paged_query.filters || {};
+		this.$report.find(".dt-filter").each((i, input) => {
+			const column = this.datatable.getColumn(input.dataset.colIndex);
+			if (column && filters[column.id] && !input.value) {
+				input.value = filters[column.id];
+			}
+			if (input.dataset.colIndex === focused_filter) {
+				input.focus();
+			}
+		});
+		this.show_footer_message();
+	}
+
 	expand_all_rows() {
 		this.$tree_footer.find("[data-action=expand_all_rows]").hide();
 		this.datatable.rowmanager.expandAllNodes();
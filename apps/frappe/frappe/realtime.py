@@ -10,14 +10,21 @@ from frappe.utils.data import cstr
 
 
 def publish_progress(percent, title=None, doctype=None, docname=None, description=None, task_id=None):
-	publish_realtime(
-		"progress",
-		{"percent": percent, "title": title, "description": description},
-		user=None if doctype and docname else frappe.session.user,
-		doctype=doctype,
-		docname=docname,
-		task_id=task_id,
-	)
+	progress = {"percent": percent, "title": title, "description": description}
+	realtime_kwargs = {
+		"user": None if doctype and docname else frappe.session.user,
+		"doctype": doctype,
+		"docname": docname,
+		"task_id": task_id,
+	}
+
+	from frappe.utils.job_stream import get_current_job_id, publish_job_progress
+
+	if job_id := get_current_job_id():
+		# also kept in stream of the job, see `frappe.utils.job_stream`
+		publish_job_progress(job_id, progress, **realtime_kwargs)
+	else:
+		publish_realtime("progress", progress, **realtime_kwargs)
 
 
 def publish_realtime(
@@ -13,6 +13,7 @@ from frappe.utils.background_jobs import (
 	create_job_id,
 	execute_job,
 	generate_qname,
+	get_job,
 	get_redis_conn,
 )
 
@@ -53,6 +54,96 @@ class TestBackgroundJobs(FrappeTestCase):
 		# lesser is earlier
 		self.assertTrue(high_priority_job.get_position() < low_priority_job.get_position())
 
+	def test_enqueue_many(self):
+		job_ids = [frappe.generate_hash() for _ in range(3)]
+		jobs = [{"method": "frappe.handler.ping", "job_id": job_id} for job_id in job_ids]
+
+		enqueued = frappe.enqueue_many(jobs, queue="short", deduplicate=True)
+		self.assertEqual(enqueued, [create_job_id(job_id) for job_id in job_ids])
+		for job_id in job_ids:
+			job = get_job(job_id)
+			self.assertEqual(job.kwargs["method"], "frappe.handler.ping")
+			self.assertEqual(job.origin, generate_qname("short"))
+
+		# repeated jobs are enqueued once
+		job_id = frappe.generate_hash()
+		enqueued = frappe.enqueue_many(
+			[{"method": "frappe.handler.ping", "job_id": job_id}] * 2, queue="short", deduplicate=True
+		)
+		self.assertEqual(enqueued, [create_job_id(job_id)])
+
+	def test_fair_scheduling(self):
+		from frappe.utils.fair_scheduling import get_candidate_jobs
+
+		job_ids = ["a1", "a2", "a3", "b1", "c1"]
+		jobs = {"a1": ("a", 0), "a2": ("a", 5), "a3": ("a", 0), "b1": ("b", 0), "c1": ("c", 0)}
+
+		# site running fewer jobs first, least recently served among equals, higher priority within site
+		candidates = get_candidate_jobs(job_ids, jobs, {"b": 1}, {"a": 2.0, "c": 1.0}, {}, {})
+		self.assertEqual(candidates, [("c1", "c"), ("a2", "a"), ("b1", "b")])
+
+		# weights and concurrency limits
+		candidates = get_candidate_jobs(job_ids, jobs, {"a": 2, "b": 2}, {}, {"a": 4}, {"*": 2, "a": 3})
+		self.assertEqual(candidates, [("c1", "c"), ("a2", "a")])
+
+	def test_fair_worker_waits_for_jobs(self):
+		from frappe.utils.background_jobs import FairWorker
+
+		connection = get_redis_conn()
+		queue = Queue(generate_qname("test-fair-scheduling"), connection=connection)
+		self.addCleanup(connection.delete, queue.key)
+		worker = FairWorker([queue], connection=connection)
+
+		# idle workers block till a job is queued instead of polling the queues
+		with patch.object(connection, "lrange", wraps=connection.lrange) as lrange:
+			self.assertIsNone(worker.dequeue_job_and_maintain_ttl(timeout=10, max_idle_time=1))
+		self.assertLessEqual(lrange.call_count, 2)
+
+		# job that woke the worker stays in queue, to be picked fairly
+		connection.rpush(queue.key, "job-1", "job-2")
+		worker.wait_for_job(1)
+		self.assertEqual(connection.lrange(queue.key, 0, -1), [b"job-1", b"job-2"])
+
+	def test_job_stream(self):
+		from frappe.utils.job_stream import add_event, read_job_events, wait_for_job
+
+		job_id = frappe.generate_hash()
+		add_event(create_job_id(job_id), "progress", {"percent": 50})
+		events = read_job_events(job_id)
+		self.assertEqual(events[0].data, {"percent": 50})
+		self.assertIsNone(wait_for_job(job_id, timeout=0.1))
+
+		add_event(create_job_id(job_id), "finished", {"result": "pong"})
+		# resume after last read event
+		self.assertEqual([event.event for event in read_job_events(job_id, events[-1].id)], ["finished"])
+		self.assertEqual(wait_for_job(job_id, timeout=1), {"event": "finished", "data": {"result": "pong"}})
+
+		job_id = frappe.generate_hash()
+		frappe.enqueue("frappe.handler.ping", queue="short", job_id=job_id)
+		self.assertEqual(wait_for_job(job_id, timeout=20), {"event": "finished", "data": {"result": "pong"}})
+
+	def test_job_outcome(self):
+		import redis
+
+		from frappe.utils.job_stream import MAX_RESULT_SIZE, publish_job_outcome, read_job_events
+
+		job_id = frappe.generate_hash()
+		publish_job_outcome(create_job_id(job_id), "finished", {"result": "x" * MAX_RESULT_SIZE})
+		loop = []
+		loop.append(loop)
+		publish_job_outcome(create_job_id(job_id), "finished", {"result": loop})
+		self.assertEqual(
+			[event.data for event in read_job_events(job_id)],
+			[
+				{"result": None, "result_truncated": True},
+				{"result": None},
+			],
+		)
+
+		# job isn't failed if its outcome can't be published
+		with patch("frappe.utils.job_stream.add_event", side_effect=redis.exceptions.ResponseError("OOM")):
+			publish_job_outcome(create_job_id(job_id), "finished", {"result": "pong"})
+
 	def test_job_hooks(self):
 		self.addCleanup(lambda: _test_JOB_HOOK.clear())
 		with freeze_local() as locals, frappe.init_site(locals.site), patch(
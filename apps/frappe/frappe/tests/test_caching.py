@@ -1,5 +1,5 @@
 import time
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import frappe
 from frappe.tests.test_api import FrappeAPITestCase
@@ -271,5 +271,80 @@ class TestRedisWrapper(FrappeAPITestCase):
 		frappe.cache.delete_keys(prefix)
 		self.assertEqual(len(frappe.cache.get_keys(prefix)), 0)
 
+	def test_indexed_keys(self):
+		for name in ("a", "b"):
+			frappe.cache.set_value(f"document_cache::Test Index::{name}", name)
+			frappe.cache.set_value(f"document_cache::Test Index Other::{name}", name)
+			frappe.cache.set_value("test_index", name, user=f"{name}@example.com")
+
+		with patch.object(frappe.cache, "keys", side_effect=AssertionError("KEYS should not be used")):
+			self.assertEqual(len(frappe.cache.get_keys("document_cache::Test Index::")), 2)
+			frappe.cache.delete_keys("document_cache::Test Index::")
+			frappe.cache.delete_keys("user:a@example.com:")
+
+		frappe.local.cache.clear()
+		self.assertEqual(frappe.cache.get_keys("document_cache::Test Index::"), [])
+		self.assertIsNone(frappe.cache.get_value("document_cache::Test Index::a"))
+		self.assertEqual(frappe.cache.get_value("document_cache::Test Index Other::a"), "a")
+		self.assertIsNone(frappe.cache.get_value("test_index", user="a@example.com"))
+		self.assertEqual(frappe.cache.get_value("test_index", user="b@example.com"), "b")
+
+		# deleted keys are removed from index
+		frappe.cache.delete_value("document_cache::Test Index Other::a")
+		self.assertEqual(len(frappe.cache.get_keys("document_cache::Test Index Other::")), 1)
+
+		# expired keys and emptied lists are pruned from index when it is read
+		frappe.cache.set_value("document_cache::Test Index Other::c", "c", expires_in_sec=1)
+		frappe.cache.rpush("insert_queue_for_Test Index", "record")
+		frappe.cache.lpop("insert_queue_for_Test Index")
+		time.sleep(1.1)
+		self.assertEqual(len(frappe.cache.get_keys("document_cache::Test Index Other::")), 1)
+		queue_key = frappe.cache.make_key("insert_queue_for_Test Index")
+		self.assertNotIn(queue_key, frappe.cache.get_keys("insert_queue_for_"))
+		self.assertFalse(frappe.cache.sismember("key_index::insert_queue_for_", queue_key))
+
 	def test_backward_compat_cache(self):
 		self.assertEqual(frappe.cache, frappe.cache())
+
+	@patch.dict(frappe.conf, {"process_cache": 1})
+	def test_process_cache(self):
+		from frappe.utils.process_cache import get_process_cache
+
+		frappe.cache.set_value("test_process_cache", "value")
+		frappe.cache.hset("test_process_cache_hash", "key", "value")
+
+		for _ in range(2):
+			frappe.local.cache.clear()
+			self.assertEqual(frappe.cache.get_value("test_process_cache"), "value")
+			self.assertEqual(frappe.cache.hget("test_process_cache_hash", "key"), "value")
+
+		stats = get_process_cache(frappe.cache).get_info()["stats"]
+		self.assertGreaterEqual(stats["test_process_cache"]["hits"], 1)
+		self.assertGreaterEqual(stats["test_process_cache_hash"]["hits"], 1)
+
+		# writes and deletes evict values from process cache
+		frappe.cache.set_value("test_process_cache", "new value")
+		frappe.cache.delete_value("test_process_cache_hash")
+		frappe.local.cache.clear()
+		with self.assertRedisCallCounts(2):
+			self.assertEqual(frappe.cache.get_value("test_process_cache"), "new value")
+			self.assertIsNone(frappe.cache.hget("test_process_cache_hash", "key"))
+
+		# values don't outlive their expiry in redis, even if read without `expires`
+		frappe.cache.set_value("test_process_cache_expiry", "value", expires_in_sec=1)
+		self.assertEqual(frappe.cache.get_value("test_process_cache_expiry"), "value")
+		time.sleep(1.1)
+		frappe.local.cache.clear()
+		self.assertIsNone(frappe.cache.get_value("test_process_cache_expiry"))
+
+	def test_process_cache_eviction(self):
+		from frappe.utils.process_cache import ProcessCache
+
+		cache = ProcessCache(frappe.cache)
+		with patch.object(ProcessCache, "max_bytes", 40):
+			for field in range(10):
+				cache.set((b"hash", field), b"0123456789", cache.generation)
+
+		# fields of evicted entries are forgotten
+		self.assertEqual(len(cache.entries), 4)
+		self.assertEqual(cache.hash_fields[b"hash"], {6, 7, 8, 9})
@@ -140,6 +140,33 @@ class TestDB(FrappeTestCase):
 	def test_escape(self):
 		frappe.db.escape("香港濟生堂製藥有限公司 - IT".encode())
 
+	def test_prefetch_values(self):
+		countries = frappe.get_all("Country", fields=["name", "code", "time_zones"], limit=20)
+		names = [d.name for d in countries]
+		frappe.db.prefetch_values("Country", [*names, "not a country"], ["code", "time_zones"])
+
+		with self.assertQueryCount(0):
+			for country in countries:
+				self.assertEqual(frappe.get_cached_value("Country", country.name, "code"), country.code)
+				self.assertEqual(
+					frappe.db.get_value(
+						"Country", country.name, ["code", "time_zones"], as_dict=True, cache=True
+					),
+					{"code": country.code, "time_zones": country.time_zones},
+				)
+			self.assertIsNone(frappe.get_cached_value("Country", "not a country", "code"))
+
+		# loaded values are dropped with document cache
+		frappe.db.set_value("Country", names[0], "code", "zz")
+		self.assertEqual(frappe.get_cached_value("Country", names[0], "code"), "zz")
+
+		frappe.db.set_value("Country", names[0], "code", countries[0].code)
+
+		deferred = [frappe.db.defer_value("Currency", name, "symbol") for name in ("INR", "USD", "EUR")]
+		with self.assertQueryCount(1):
+			symbols = [d.get() for d in deferred]
+		self.assertEqual(symbols, [frappe.db.get_value("Currency", d.name, "symbol") for d in deferred])
+
 	def test_get_single_value(self):
 		# setup
 		values_dict = {
@@ -572,6 +599,14 @@ class TestDB(FrappeTestCase):
 		self.assertEqual(priority, "Low")
 		self.assertEqual(status, "Closed")  # should stay the same
 
+		# chunked updates share the same modified timestamp and clear cached documents
+		frappe.get_cached_doc("ToDo", record_names[0])
+		frappe.db.bulk_update("ToDo", {name: {"priority": "Medium"} for name in record_names}, chunk_size=7)
+
+		self.assertEqual(frappe.get_cached_doc("ToDo", record_names[0]).priority, "Medium")
+		modified = frappe.get_all("ToDo", filters={"name": ("in", record_names)}, pluck="modified")
+		self.assertEqual(len(set(modified)), 1)
+
 		# cleanup
 		frappe.db.delete("ToDo", {"name": ("in", record_names)})
 
@@ -1027,6 +1062,73 @@ class TestReplicaConnections(FrappeTestCase):
 			outer()
 			self.assertEqual(write_connection, db_id())
 
+	@patch.dict(frappe.conf, {"route_reads_to_replica": 1, "replica_host": "127.0.0.1"})
+	def test_routing_reads_to_replica(self):
+		frappe.db.rollback()
+		primary = frappe.db
+
+		@frappe.read_only()
+		def report():
+			router = frappe.db.replica_router
+			self.assertIs(frappe.db, primary)
+			self.assertIsNotNone(router)
+
+			frappe.db.sql("select name from tabUser limit 1")
+			replica = router._replica
+			self.assertIsNotNone(replica)
+			self.assertEqual(replica.last_query, "select name from tabUser limit 1")
+
+			# reads stick to primary after first write
+			frappe.db.set_value("User", "Administrator", "last_active", now())
+			frappe.db.sql("select name from tabUser limit 2")
+			self.assertTrue(router.stick_to_primary)
+			self.assertEqual(replica.last_query, "select name from tabUser limit 1")
+			self.assertEqual(primary.last_query, "select name from tabUser limit 2")
+
+		report()
+		self.assertIsNone(frappe.db.replica_router)
+		frappe.db.rollback()
+
+
+class TestConnectionPool(FrappeTestCase):
+	@patch.dict(frappe.conf, {"db_connection_pool": 1})
+	def test_connection_reuse(self):
+		from frappe.database import get_db
+		from frappe.database.pool import get_pool
+
+		def connect():
+			db = get_db(
+				socket=frappe.conf.db_socket,
+				host=frappe.conf.db_host,
+				port=frappe.conf.db_port,
+				user=frappe.conf.db_name,
+				password=frappe.conf.db_password,
+				cur_db_name=frappe.conf.db_name,
+			)
+			db.sql("select 1")
+			return db
+
+		db = connect()
+		conn = db._conn
+		db.sql("create temporary table `pool_test` (`value` int)")
+		db.sql("update tabUser set last_active = last_active where name = 'Administrator'")
+		db.close()
+
+		db = connect()
+		self.assertIs(db._conn, conn)
+		self.assertEqual(db.transaction_writes, 0)
+		# session state isn't passed on to the next user of the connection
+		db.sql("create temporary table `pool_test` (`value` int)")
+		db.close()
+
+		# expired connections are not reused
+		with patch.dict(frappe.conf, {"db_pool_max_lifetime": -1}):
+			db = connect()
+			self.assertIsNot(db._conn, conn)
+			db.close()
+
+		get_pool().clear()
+
 
 class TestConcurrency(FrappeTestCase):
 	@timeout(5, "There shouldn't be any lock wait")
@@ -1097,3 +1199,29 @@ class TestSqlIterator(FrappeTestCase):
 	def test_unbuffered_cursor(self):
 		with frappe.db.unbuffered_cursor():
 			self.test_db_sql_iterator()
+
+	def test_as_columns(self):
+		query = "select name, code from `tabCountry` order by name"
+		rows = frappe.db.sql(query, as_dict=True)
+		columns = frappe.db.sql(query, as_columns=True)
+
+		self.assertEqual(columns.name, [row.name for row in rows])
+		self.assertEqual(columns.code, [row.code for row in rows])
+		self.assertEqual(frappe.db.sql(query + " limit 0", as_columns=True), {"name": [], "code": []})
+
+		Country = frappe.qb.DocType("Country")
+		query = frappe.qb.from_(Country).select(Country.name).orderby(Country.name)
+		self.assertEqual(query.run(as_columns=True).name, columns.name)
+
+	def test_stream(self):
+		query = "select name, code from `tabCountry` order by name"
+		self.assertEqual(frappe.db.sql(query, as_dict=True), list(frappe.db.stream(query, as_dict=True)))
+		self.assertEqual(frappe.db.sql(query, pluck=True), list(frappe.db.stream(query, pluck=True)))
+
+		rows = frappe.db.sql(query, as_list=True)
+		batches = list(frappe.db.stream(query, batch_size=50))
+		self.assertTrue(all(len(batch) == 50 for batch in batches[:-1]))
+		self.assertEqual(rows, [row for batch in batches for row in batch])
+
+		# connection is usable after stream is consumed
+		self.assertEqual(frappe.db.sql("select 1")[0][0], 1)
@@ -805,6 +805,15 @@ class TestDBQuery(FrappeTestCase):
 		owners = DatabaseQuery("DocType").execute(filters={"name": "DocType"}, pluck="owner")
 		self.assertEqual(owners, ["Administrator"])
 
+	def test_as_iterator(self):
+		kwargs = {"fields": ["name", "module"], "filters": {"istable": 1}, "order_by": "name"}
+		doctypes = frappe.get_all("DocType", as_iterator=True, **kwargs)
+		self.assertNotIsInstance(doctypes, list)
+		self.assertEqual(list(doctypes), frappe.get_all("DocType", **kwargs))
+
+		names = frappe.get_all("DocType", filters={"istable": 1}, pluck="name", as_iterator=True)
+		self.assertEqual(sorted(names), sorted(frappe.get_all("DocType", {"istable": 1}, pluck="name")))
+
 	def test_prepare_select_args(self):
 		# frappe.get_all inserts modified field into order_by clause
 		# test to make sure this is inserted into select field when postgres
@@ -1,5 +1,5 @@
 import frappe
-from frappe.deferred_insert import deferred_insert, save_to_db
+from frappe.deferred_insert import deferred_insert, get_backlog, save_to_db
 from frappe.tests.utils import FrappeTestCase
 
 
@@ -16,3 +16,17 @@ class TestDeferredInsert(FrappeTestCase):
 		frappe.clear_cache()  # deferred_insert cache keys are supposed to be persistent
 		save_to_db()
 		self.assertTrue(frappe.db.exists("Route History", route_history))
+
+	def test_bulk_flush(self):
+		routes = [{"route": frappe.generate_hash(), "user": "Administrator"} for _ in range(250)]
+		invalid_route = {"route": frappe.generate_hash(), "user": frappe.generate_hash()}
+		deferred_insert("Route History", routes[:100])
+		deferred_insert("Route History", [invalid_route, *routes[100:]])
+		self.assertEqual(get_backlog()["Route History"], 2)
+
+		save_to_db()
+		self.assertNotIn("Route History", get_backlog())
+		self.assertEqual(
+			frappe.db.count("Route History", {"route": ("in", [route["route"] for route in routes])}), 250
+		)
+		self.assertFalse(frappe.db.exists("Route History", invalid_route))
@@ -98,6 +98,36 @@ class TestDocument(FrappeTestCase):
 
 		self.assertEqual(frappe.db.get_value(d.doctype, d.name, "subject"), "subject changed")
 
+	def test_diff_based_update(self):
+		note = frappe.new_doc("Note")
+		note.title = frappe.generate_hash()
+		note.append("seen_by", {"user": "Administrator"})
+		note.append("seen_by", {"user": "Guest"})
+		note.insert()
+		rows_modified = {d.name: frappe.db.get_value(d.doctype, d.name, "modified") for d in note.seen_by}
+
+		note.content = "changed"
+		orig_sql = frappe.db.__class__.sql
+		with patch.object(frappe.db.__class__, "sql", autospec=True, side_effect=orig_sql) as sql:
+			note.save()
+
+		updates = [c.args[1] for c in sql.call_args_list if c.args[1].strip().upper().startswith("UPDATE")]
+		self.assertEqual(len(updates), 1, "Only parent should be updated")
+		self.assertIn("`content`", updates[0])
+		self.assertNotIn("`title`", updates[0])
+
+		for name, modified in rows_modified.items():
+			self.assertEqual(frappe.db.get_value("Note Seen By", name, "modified"), modified)
+		self.assertEqual(frappe.db.get_value("Note", note.name, "content"), "changed")
+
+		note.seen_by[1].user = "Administrator"
+		note.save()
+		self.assertEqual(frappe.db.get_value("Note Seen By", note.seen_by[1].name, "user"), "Administrator")
+		self.assertEqual(
+			frappe.db.get_value("Note Seen By", note.seen_by[0].name, "modified"),
+			rows_modified[note.seen_by[0].name],
+		)
+
 	def test_value_changed(self):
 		d = self.test_insert()
 		d.subject = "subject changed again"
@@ -1,6 +1,10 @@
 # Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import gc
+import time
+from unittest.mock import patch
+
 import frappe
 import frappe.monitor
 from frappe.monitor import MONITOR_REDIS_KEY, get_trace_id
@@ -88,3 +92,59 @@ class TestMonitor(FrappeTestCase):
 		frappe.db.sql("select 1")
 		self.assertIn(get_trace_id(), str(frappe.db.last_query))
 		frappe.monitor.stop(response)
+
+	def test_endpoint(self):
+		for path, endpoint in (
+			("/api/method/frappe.ping", "/api/method/frappe.ping"),
+			("/api/resource/ToDo/some-todo", "/api/resource/ToDo"),
+			("/app/todo/some-todo", "/app"),
+			("/blog/some-category/some-post", "website"),
+		):
+			set_request(method="GET", path=path)
+			frappe.monitor.start()
+			self.assertEqual(frappe.local.monitor.get_endpoint(), endpoint)
+			del frappe.local.monitor
+
+	def test_sampling_profiler(self):
+		from frappe.utils.sampling_profiler import clear_profiles, export_collapsed_stacks
+
+		def busy_loop():
+			start = time.monotonic()
+			while time.monotonic() - start < 0.2:
+				sum(range(1000))
+
+		self.addCleanup(clear_profiles)
+		set_request(method="GET", path="/api/method/frappe.ping")
+		response = build_response("json")
+
+		with patch.dict(frappe.conf, {"monitor_sampling_rate": 200}):
+			frappe.monitor.start()
+			frappe.db.sql("select 1")
+			busy_loop()
+			frappe.monitor.stop(response)
+
+		log = frappe.parse_json(frappe.cache.lrange(MONITOR_REDIS_KEY, 0, -1)[0].decode())
+		self.assertGreaterEqual(log.sql["count"], 1)
+		self.assertGreaterEqual(log.sql["types"]["select"]["count"], 1)
+		self.assertTrue(log.profile["samples"])
+		self.assertTrue(any("busy_loop" in stack for stack in log.profile["stacks"]))
+
+		stacks = export_collapsed_stacks("/api/method/frappe.ping")
+		self.assertIn("busy_loop", stacks)
+		self.assertTrue(all(line.rpartition(" ")[2].isdigit() for line in stacks.splitlines()))
+
+	def test_sampling_profiler_labels(self):
+		from frappe.utils import sampling_profiler
+
+		code = compile("import sys\nframe = sys._getframe()", "<server script>", "exec")
+		scope = {}
+		exec(code, scope)
+		stack = sampling_profiler.get_stack(scope.pop("frame"))
+		self.assertTrue(stack.endswith(";<server script>:<module>"))
+		self.assertIn(code, sampling_profiler._labels)
+
+		# labels don't keep code of server scripts alive
+		labels = len(sampling_profiler._labels)
+		del code, scope
+		gc.collect()
+		self.assertEqual(len(sampling_profiler._labels), labels - 1)
@@ -419,6 +419,45 @@ class TestNaming(FrappeTestCase):
 			names.append(make_autoname("hash"))
 		self.assertEqual(names, sorted(names))
 
+	def test_series_block_reservation(self):
+		from unittest.mock import patch
+
+		from frappe.model.naming import clear_series_blocks
+
+		key = "TEST-BLOCK-"
+		self.addCleanup(clear_series_blocks)
+		self.addCleanup(frappe.db.commit)
+		self.addCleanup(frappe.db.delete, "Series", {"name": key})
+
+		with patch.dict(frappe.conf, {"naming_series_block_size": {"TEST-BLOCK": 5}}):
+			names = [make_autoname(f"{key}.###") for _ in range(7)]
+			self.assertEqual(names, [f"{key}{i:03}" for i in range(1, 8)])
+
+			# block is reserved in a separate transaction, rollback doesn't return it
+			frappe.db.rollback()
+			self.assertEqual(NamingSeries(f"{key}.###").get_current_value(), 10)
+
+			# other processes continue from the end of reserved blocks
+			clear_series_blocks()
+			self.assertEqual(make_autoname(f"{key}.###"), f"{key}011")
+
+	def test_series_block_locked_by_current_transaction(self):
+		from unittest.mock import patch
+
+		from frappe.model.naming import clear_series_blocks
+
+		key = "TEST-BLOCK-LOCKED-"
+		self.addCleanup(clear_series_blocks)
+		self.addCleanup(frappe.db.rollback)
+
+		# series row is locked by this transaction till it is committed
+		NamingSeries(f"{key}.###").update_counter(4)
+
+		# so numbers are taken in this transaction instead of waiting for it
+		with patch.dict(frappe.conf, {"naming_series_block_size": {"TEST-BLOCK": 5}}):
+			self.assertEqual(make_autoname(f"{key}.###"), f"{key}005")
+			self.assertEqual(NamingSeries(f"{key}.###").get_current_value(), 5)
+
 
 def parse_naming_series_variable(doc, variable):
 	if variable == "PM":
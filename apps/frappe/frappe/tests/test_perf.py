@@ -17,6 +17,7 @@ query. This test can be written like this.
 
 """
 import gc
+import os
 import sys
 import time
 from unittest.mock import patch
@@ -30,7 +31,7 @@ from frappe.query_builder.utils import db_type_is
 from frappe.tests.test_api import FrappeAPITestCase
 from frappe.tests.test_query_builder import run_only_if
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import cint
+from frappe.utils import cint, get_system_timezone, now_datetime
 from frappe.website.path_resolver import PathResolver
 
 TEST_USER = "test@example.com"
@@ -58,6 +59,35 @@ class TestPerformance(FrappeTestCase):
 		with self.assertQueryCount(0):
 			frappe.get_meta("User")
 
+	@patch.dict(frappe.conf, {"shared_meta_cache": 1})
+	def test_shared_meta_cache(self):
+		from frappe.model.meta import get_meta_cache_version
+		from frappe.model.meta_snapshot import get_snapshot_path, load_meta, write_snapshot
+
+		meta = frappe.get_meta("User")
+		self.assertIs(frappe.get_meta("User"), meta)
+		meta.flags.changed_in_request = True
+		frappe.local.cache.clear()  # simulate next request
+
+		# only the meta cache version is fetched from redis
+		with self.assertRedisCallCounts(1), self.assertQueryCount(0):
+			next_meta = frappe.get_meta("User")
+
+		# changes made by a request don't leak into others
+		self.assertIsNot(next_meta, meta)
+		self.assertFalse(next_meta.flags.changed_in_request)
+		self.assertEqual(next_meta.fields, meta.fields)
+
+		frappe.clear_cache(doctype="User")
+		self.assertIsNot(frappe.get_meta("User"), next_meta)
+
+		write_snapshot()
+		self.addCleanup(os.remove, get_snapshot_path())
+		self.assertEqual(load_meta("ToDo", get_meta_cache_version()).name, "ToDo")
+
+		frappe.clear_cache(doctype="ToDo")
+		self.assertIsNone(load_meta("ToDo", get_meta_cache_version()))
+
 	def test_permitted_fieldnames(self):
 		frappe.clear_cache()
 
@@ -203,6 +233,260 @@ class TestPerformance(FrappeTestCase):
 		with self.assertRedisCallCounts(1):
 			frappe.get_doc("User", "Administrator")
 
+	def test_cached_query_overhead(self):
+		"""Building SQL for repeated `get_value` queries of the same shape should skip pypika."""
+		from frappe.database.query import get_cached_query, get_query_cache_info
+
+		count = 1000
+		kwargs = dict(fields=["name", "email"], filters={"enabled": 1, "user_type": "System User"})
+
+		start = time.perf_counter()
+		for _ in range(count):
+			frappe.qb.get_query("User", **kwargs).walk()
+		uncached = time.perf_counter() - start
+
+		get_cached_query("User", **kwargs)
+		before = get_query_cache_info()
+		start = time.perf_counter()
+		for _ in range(count):
+			get_cached_query("User", **kwargs)
+		cached = time.perf_counter() - start
+		after = get_query_cache_info()
+
+		print(f"Built {count} queries in {uncached:.3f}s with pypika, {cached:.3f}s from cache")
+		# timings are only a benchmark, every repeated query must come from cache
+		self.assertEqual(after["hits"] - before["hits"], count)
+		self.assertEqual(after["misses"], before["misses"])
+		self.assertEqual(after["uncacheable"], before["uncacheable"])
+
+	def test_columnar_results(self):
+		"""Aggregating columns should be cheaper than aggregating rows as dicts."""
+		import tracemalloc
+
+		query = "select name, idx, creation from tabDocField"
+
+		def measure(**kwargs) -> tuple[float, int, int]:
+			tracemalloc.start()
+			start = time.perf_counter()
+			result = frappe.db.sql(query, **kwargs)
+			total = sum(result.idx) if kwargs.get("as_columns") else sum(row.idx for row in result)
+			elapsed = time.perf_counter() - start
+			peak = tracemalloc.get_traced_memory()[1]
+			tracemalloc.stop()
+			return total, elapsed, peak
+
+		dict_total, dict_time, dict_memory = measure(as_dict=True)
+		column_total, column_time, column_memory = measure(as_columns=True)
+
+		print(
+			f"as_dict: {dict_time:.3f}s, {dict_memory / 1024:.0f} KiB peak; "
+			f"as_columns: {column_time:.3f}s, {column_memory / 1024:.0f} KiB peak"
+		)
+		self.assertEqual(dict_total, column_total)
+		self.assertLess(column_memory, dict_memory)
+
+	def test_cache_codec(self):
+		"""Compare size and encode/decode time of cached values with each compression."""
+		from frappe.utils import cache_codec
+
+		frappe.get_meta("DocType")
+		frappe.get_cached_doc("User", "Administrator")
+
+		values = []
+		for key in frappe.cache.get_keys(""):
+			key_type = frappe.cache.type(key)
+			if key_type == b"string":
+				raw_values = [frappe.cache.get(key)]
+			elif key_type == b"hash":
+				raw_values = frappe.cache.hvals(key)
+			else:
+				continue
+			values.extend(
+				cache_codec.loads(raw) for raw in raw_values if raw[:1] == cache_codec.PICKLE_MARKER
+			)
+
+		results = {}
+		for compression in (None, "zlib"):
+			with patch.dict(frappe.conf, {"redis_cache_compression": compression}):
+				start = time.perf_counter()
+				encoded = [cache_codec.dumps(value) for value in values]
+				encode_time = time.perf_counter() - start
+
+				start = time.perf_counter()
+				for data in encoded:
+					cache_codec.loads(data)
+				decode_time = time.perf_counter() - start
+
+			results[compression] = size = sum(len(data) for data in encoded)
+			print(
+				f"{compression or 'pickle'}: {len(values)} values, {size / 1024:.0f} KiB, "
+				f"encode {encode_time:.3f}s, decode {decode_time:.3f}s"
+			)
+
+		self.assertLess(results["zlib"], results[None])
+
+	def test_warm_job_startup(self):
+		"""Compare per job overhead of warm workers with workers that start every job afresh."""
+		from frappe.database import pool
+		from frappe.tests.test_background_jobs import freeze_local
+		from frappe.utils.background_jobs import execute_job
+
+		site = frappe.local.site
+		count = 50
+
+		def run_jobs(count=count) -> tuple[float, int, int]:
+			"""Return time per job, site config loads and new database connections."""
+			with (
+				patch.object(frappe, "get_site_config", wraps=frappe.get_site_config) as get_site_config,
+				patch.object(pool, "PooledConnection", wraps=pool.PooledConnection) as new_connection,
+			):
+				start = time.perf_counter()
+				for _ in range(count):
+					execute_job(site, "frappe.ping", None, "frappe.ping", {}, user="Administrator")
+				elapsed = (time.perf_counter() - start) / count
+			return elapsed, get_site_config.call_count, new_connection.call_count
+
+		with freeze_local():
+			cold, cold_config_loads, _connections = run_jobs()
+			with patch.object(frappe, "_warm_worker", True):
+				run_jobs(count=1)
+				warm, warm_config_loads, warm_connections = run_jobs()
+			pool.get_pool().clear()
+
+		print(f"Job startup: {cold * 1000:.2f}ms, warm worker: {warm * 1000:.2f}ms")
+		# site config and database connection of the first job are reused by the next ones
+		self.assertGreaterEqual(cold_config_loads, count)
+		self.assertEqual(warm_config_loads, 0)
+		self.assertEqual(warm_connections, 0)
+
+	def test_scheduler_tick(self):
+		"""Scheduler tick over hundreds of sites should only connect to sites with due jobs."""
+		from datetime import timedelta
+
+		from frappe.tests.test_background_jobs import freeze_local
+		from frappe.utils import scheduler
+
+		job_types = [
+			frappe.get_doc(doctype="Scheduled Job Type", **job_type)
+			for job_type in frappe.get_all("Scheduled Job Type", filters={"stopped": 0}, fields="*")
+		]
+		now = now_datetime()
+		sites = [f"site-{i}.localhost" for i in range(300)]
+		schedules = {}
+		for i, site in enumerate(sites):
+			schedule = schedules[site] = scheduler.SiteSchedule()
+			schedule.loaded = True
+			schedule.time_zone = get_system_timezone()
+			schedule.heap = [(now + timedelta(hours=1), job_type.name) for job_type in job_types]
+			if i % 10 == 0:
+				schedule.heap[0] = (now - timedelta(minutes=1), job_types[0].name)
+
+		before = dict(schedules)
+		with (
+			freeze_local(),
+			patch.object(scheduler, "_site_schedules", schedules),
+			patch.object(scheduler, "get_sites", return_value=sites),
+			patch.object(scheduler, "enqueue_events_for_site") as enqueue_events_for_site,
+		):
+			start = time.perf_counter()
+			scheduler.enqueue_events_for_all_sites()
+			tick = time.perf_counter() - start
+
+		# what every tick used to do for each site, without counting database and redis reads
+		start = time.perf_counter()
+		for _ in sites:
+			for job_type in job_types:
+				job_type.is_event_due(now)
+		per_job = time.perf_counter() - start
+
+		print(f"Scheduler tick for {len(sites)} sites: {tick:.3f}s, evaluating every job: {per_job:.3f}s")
+		self.assertEqual(enqueue_events_for_site.call_count, len(sites) // 10)
+		# schedules with unchanged versions are kept, not rebuilt from Scheduled Job Types
+		self.assertTrue(all(schedules[site] is schedule for site, schedule in before.items()))
+		for call in enqueue_events_for_site.call_args_list:
+			self.assertIs(call.kwargs["schedule"], before[call.kwargs["site"]])
+			self.assertTrue(call.kwargs["schedule"].loaded)
+
+	def test_naming_series_contention(self):
+		"""Compare names generated per second by 32 parallel writers with and without block reservation."""
+		from concurrent.futures import ThreadPoolExecutor
+
+		from frappe.model import naming
+		from frappe.model.naming import clear_series_blocks, make_autoname
+
+		site = frappe.local.site
+		writers, names_per_writer = 32, 20
+
+		def write(series, block_sizes):
+			frappe.init(site)
+			frappe.connect()
+			frappe.local.conf.naming_series_block_size = block_sizes
+			try:
+				names = []
+				for _ in range(names_per_writer):
+					names.append(make_autoname(series))
+					# rest of the insert, series row stays locked till commit without blocks
+					time.sleep(0.002)
+					frappe.db.commit()
+				return names
+			finally:
+				frappe.destroy()
+
+		def run(series, block_sizes=None):
+			start = time.perf_counter()
+			with ThreadPoolExecutor(max_workers=writers) as executor:
+				results = executor.map(write, [series] * writers, [block_sizes] * writers)
+				names = [name for names in results for name in names]
+			self.assertEqual(len(names), len(set(names)))
+			return len(names) / (time.perf_counter() - start)
+
+		self.addCleanup(clear_series_blocks)
+		self.addCleanup(frappe.db.commit)
+		self.addCleanup(frappe.db.delete, "Series", {"name": ("like", "PERF-SERIES-%")})
+
+		locked = run("PERF-SERIES-LOCKED-.#####")
+		with patch.object(naming, "reserve_series_block", wraps=naming.reserve_series_block) as reserve:
+			blocks = run("PERF-SERIES-BLOCK-.#####", {"PERF-SERIES-BLOCK": 50})
+
+		print(f"Names per second with {writers} writers: {locked:.0f}, with block reservation: {blocks:.0f}")
+		# series row is locked once per name without blocks, once per 50 names with them
+		names = writers * names_per_writer
+		reservations = -(-names // 50)
+		self.assertEqual(reserve.call_count, reservations)
+		Series = frappe.qb.DocType("Series")
+		query = frappe.qb.from_(Series).select(Series.name, Series.current)
+		current = dict(query.where(Series.name.like("PERF-SERIES-%")).run())
+		self.assertEqual(current, {"PERF-SERIES-LOCKED-": names, "PERF-SERIES-BLOCK-": reservations * 50})
+
+	def test_batched_child_inserts(self):
+		"""Child rows of large documents should be inserted with few multi-row INSERTs."""
+		rows = 400
+
+		def insert_note(batch: bool) -> tuple[int, float]:
+			note = frappe.new_doc("Note")
+			note.title = frappe.generate_hash()
+			for _ in range(rows):
+				note.append("seen_by", {"user": "Administrator"})
+			note.flags.batch_child_inserts = batch
+
+			with patch.object(frappe.db.__class__, "sql", autospec=True, side_effect=orig_sql) as sql:
+				start = time.perf_counter()
+				note.insert()
+				elapsed = time.perf_counter() - start
+
+			self.assertEqual(frappe.db.count("Note Seen By", {"parent": note.name}), rows)
+			return sql.call_count, elapsed
+
+		orig_sql = frappe.db.__class__.sql
+		row_queries, row_time = insert_note(batch=False)
+		batch_queries, batch_time = insert_note(batch=True)
+
+		print(
+			f"Inserted {rows} child rows: {row_queries} queries in {row_time:.3f}s row-by-row, "
+			f"{batch_queries} queries in {batch_time:.3f}s batched"
+		)
+		self.assertLessEqual(batch_queries, row_queries - rows + 1)
+
 
 @run_only_if(db_type_is.MARIADB)
 class TestOverheadCalls(FrappeAPITestCase):
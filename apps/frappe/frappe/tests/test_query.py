@@ -455,3 +455,41 @@ class TestQuery(FrappeTestCase):
 
 		note1.delete()
 		note2.delete()
+
+	def test_cached_query(self):
+		from frappe.database.query import (
+			CachedQuery,
+			clear_query_cache,
+			get_cached_query,
+			get_query_cache_info,
+		)
+
+		clear_query_cache()
+		cases = [
+			dict(table="User", fields="name", filters="Administrator"),
+			dict(table="User", fields=["name", "email"], filters={"enabled": 1, "user_type": "System User"}),
+			dict(table="User", filters=[["name", "in", ["Administrator", "Guest"]]], order_by="name asc"),
+			dict(table="User", filters={"first_name": ("like", "Adm%"), "last_name": None}, limit=1),
+			dict(table="User", filters=[["User", "name", "!=", "Guest"]], for_update=True),
+		]
+
+		for kwargs in cases:
+			expected = frappe.qb.get_query(**kwargs).run()
+			self.assertEqual(get_cached_query(**kwargs).run(), expected)
+			cached = get_cached_query(**kwargs)
+			self.assertIsInstance(cached, CachedQuery)
+			self.assertEqual(cached.run(), expected)
+
+		# same shape with different values should reuse cached SQL
+		info = get_query_cache_info()
+		self.assertEqual(
+			get_cached_query("User", fields="name", filters="Guest").run(),
+			frappe.qb.get_query("User", fields="name", filters="Guest").run(),
+		)
+		self.assertEqual(get_query_cache_info()["hits"], info["hits"] + 1)
+
+		# uncacheable queries are built as usual
+		self.assertNotIsInstance(
+			get_cached_query("User", filters={"creation": ("timespan", "today")}), CachedQuery
+		)
+		self.assertNotIsInstance(get_cached_query("ToDo", fields=["allocated_to.email"]), CachedQuery)
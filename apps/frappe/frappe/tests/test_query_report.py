@@ -1,9 +1,18 @@
 # Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+from unittest.mock import patch
+
 import frappe
 import frappe.utils
-from frappe.desk.query_report import build_xlsx_data, export_query, run
+from frappe.desk.query_report import (
+	build_xlsx_data,
+	export_query,
+	generate_report_result,
+	get_report_doc,
+	run,
+)
+from frappe.desk.report_cache import get_result_key
 from frappe.tests.utils import FrappeTestCase
 from frappe.utils.xlsxutils import make_xlsx
 
@@ -246,6 +255,43 @@ data = columns, result
 			raise e
 			frappe.db.rollback()
 
+	def test_result_cache(self):
+		report = frappe.new_doc("Report")
+		report.report_name = "Test Cached Report"
+		report.ref_doctype = "ToDo"
+		report.report_type = "Query Report"
+		report.query = frappe.qb.from_("ToDo").select("name", "description").get_sql()
+		report.is_standard = "No"
+		report.cache_result = 1
+		report.insert()
+
+		report = get_report_doc(report.name)
+		result = generate_report_result(report)
+		self.assertFalse(result.get("from_cache"))
+
+		cached_result = generate_report_result(report)
+		self.assertTrue(cached_result["from_cache"])
+		self.assertTrue(cached_result["cached_at"])
+		self.assertEqual(cached_result["result"], result["result"])
+
+		# other filters are cached separately
+		self.assertFalse(generate_report_result(report, filters={"status": "Open"}).get("from_cache"))
+
+		# changing a document of reference doctype discards cached results
+		frappe.get_doc(doctype="ToDo", description="Discards cached report results").insert()
+		result = generate_report_result(report)
+		self.assertFalse(result.get("from_cache"))
+		self.assertEqual(len(result["result"]), len(cached_result["result"]) + 1)
+
+		# results are only shared by users with the same roles if the report allows it
+		def get_keys():
+			return {get_result_key(report, {}, user) for user in ("a@example.com", "b@example.com")}
+
+		with patch("frappe.get_roles", return_value=["System Manager"]):
+			self.assertEqual(len(get_keys()), 2)
+			report.cache_shared = 1
+			self.assertEqual(len(get_keys()), 1)
+
 
 def create_mock_data():
 	data = frappe._dict()
@@ -8,8 +8,11 @@ from frappe.core.doctype.scheduled_job_type.scheduled_job_type import ScheduledJ
 from frappe.utils import add_days, get_datetime
 from frappe.utils.doctor import purge_pending_jobs
 from frappe.utils.scheduler import (
+	SiteSchedule,
 	_get_last_modified_timestamp,
+	enqueue_due_events,
 	enqueue_events,
+	get_schedule_versions,
 	is_dormant,
 	schedule_jobs_based_on_activity,
 )
@@ -56,6 +59,32 @@ class TestScheduler(TestCase):
 			# 1st job is in the queue (or running), don't enqueue it again
 			self.assertFalse(job.enqueue())
 
+	def test_due_events_kept_on_error(self):
+		job = get_test_job()
+		schedule = SiteSchedule()
+		schedule.load()
+
+		with patch.object(ScheduledJobType, "enqueue", side_effect=ConnectionError):
+			self.assertRaises(ConnectionError, enqueue_due_events, schedule)
+
+		# job types that couldn't be enqueued stay due
+		self.assertIn(job.name, schedule.pop_due())
+
+	def test_schedule_version_bumped_on_commit(self):
+		job = get_test_job()
+		site = frappe.local.site
+		version = get_schedule_versions([site])[site]
+
+		job.save()
+		# schedule isn't rebuilt from rows of an uncommitted transaction
+		self.assertEqual(get_schedule_versions([site])[site], version)
+		frappe.db.rollback()
+		self.assertEqual(get_schedule_versions([site])[site], version)
+
+		job.save()
+		frappe.db.commit()
+		self.assertNotEqual(get_schedule_versions([site])[site], version)
+
 	@patch.object(frappe.utils.frappecloud, "on_frappecloud", return_value=True)
 	@patch.dict(frappe.conf, {"developer_mode": 0})
 	def test_is_dormant(self, _mock):
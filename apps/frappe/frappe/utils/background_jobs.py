@@ -12,7 +12,7 @@ from uuid import uuid4
 
 import redis
 from redis.exceptions import BusyLoadingError, ConnectionError
-from rq import Callback, Queue, Worker
+from rq import Callback, Queue, SimpleWorker, Worker
 from rq.exceptions import NoSuchJobError
 from rq.job import Job, JobStatus
 from rq.logutils import setup_loghandlers
@@ -26,6 +26,8 @@ from frappe import _
 from frappe.utils import CallbackManager, cint, get_bench_id
 from frappe.utils.commands import log
 from frappe.utils.deprecations import deprecation_warning
+from frappe.utils.fair_scheduling import FairSchedulingMixin
+from frappe.utils.job_stream import get_current_job_id, publish_job_outcome
 from frappe.utils.redis_queue import RedisQueue
 
 # TTL to keep RQ job logs in redis for.
@@ -34,6 +36,7 @@ RQ_FAILED_JOBS_LIMIT = 1000  # Only keep these many recent failed jobs around
 RQ_RESULTS_TTL = 10 * 60
 
 MAX_QUEUED_JOBS = 500  # frappe.enqueue will start failing when these many jobs exist in queue.
+WARM_WORKER_MAX_JOBS = 1000  # warm workers are replaced after running these many jobs
 
 _redis_queue_conn = None
 
@@ -71,6 +74,7 @@ def enqueue(
 	at_front: bool = False,
 	job_id: str | None = None,
 	deduplicate=False,
+	job_priority: int = 0,
 	**kwargs,
 ) -> Job | Any:
 	"""
@@ -86,6 +90,7 @@ def enqueue(
 	:param kwargs: keyword arguments to be passed to the method
 	:param deduplicate: do not re-queue job if it's already queued, requires job_id.
 	:param job_id: Assigning unique job id, which can be checked using `is_job_enqueued`
+	:param job_priority: jobs of a site with higher priority are picked first by workers using fair scheduling
 	"""
 	# To handle older implementations
 	is_async = kwargs.pop("async", is_async)
@@ -134,22 +139,7 @@ def enqueue(
 	if not timeout:
 		timeout = get_queues_timeout().get(queue) or 300
 
-	# Prepare a more readable name than <function $name at $address>
-	if isinstance(method, Callable):
-		method_name = f"{method.__module__}.{method.__qualname__}"
-	else:
-		method_name = method
-
-	queue_args = {
-		"site": frappe.local.site,
-		"user": frappe.session.user,
-		"method": method,
-		"event": event,
-		"job_name": job_name or method_name,
-		"is_async": is_async,
-		"kwargs": kwargs,
-	}
-
+	queue_args = _get_queue_args(method, event, job_name, is_async, kwargs)
 	on_failure = on_failure or truncate_failed_registry
 
 	def enqueue_call():
@@ -163,6 +153,7 @@ def enqueue(
 			failure_ttl=frappe.conf.get("rq_job_failure_ttl") or RQ_JOB_FAILURE_TTL,
 			result_ttl=frappe.conf.get("rq_results_ttl") or RQ_RESULTS_TTL,
 			job_id=job_id,
+			meta={"priority": job_priority} if job_priority else None,
 		)
 
 	if enqueue_after_commit:
@@ -172,6 +163,159 @@ def enqueue(
 	return enqueue_call()
 
 
+def enqueue_many(
+	jobs: list[dict],
+	queue: str = "default",
+	timeout: int | None = None,
+	is_async: bool = True,
+	now: bool = False,
+	enqueue_after_commit: bool = False,
+	*,
+	at_front: bool = False,
+	deduplicate: bool = False,
+) -> list[str]:
+	"""
+	Enqueue many methods to be executed using background workers, with a few round trips to redis
+
+	Jobs are dicts with `method` and optionally `kwargs` (passed to the method), `job_id`, `job_name`,
+	`event`, `queue`, `timeout`, `at_front`, `job_priority`, `on_success` and `on_failure` keys. Other arguments are
+	the same as `enqueue` and apply to all jobs that don't set them.
+
+	:param jobs: list of jobs
+	:param deduplicate: do not re-queue jobs that are already queued, requires `job_id` in all jobs.
+
+	Returns ids of enqueued jobs (namespaced to site).
+	"""
+	if deduplicate and not all(job.get("job_id") for job in jobs):
+		frappe.throw(_("`job_id` paramater is required for deduplication."))
+
+	if not is_async and not frappe.flags.in_test:
+		deprecation_warning(
+			"Using enqueue with is_async=False outside of tests is not recommended, use now=True instead."
+		)
+
+	def call_all():
+		for job in jobs:
+			frappe.call(job["method"], **(job.get("kwargs") or {}))
+		return []
+
+	if now or (not is_async and not frappe.flags.in_test):
+		return call_all()
+
+	jobs_by_queue = defaultdict(list)
+	for job in jobs:
+		jobs_by_queue[job.get("queue") or queue].append(job)
+
+	try:
+		queues = {qtype: get_queue(qtype, is_async=is_async) for qtype in jobs_by_queue}
+	except ConnectionError:
+		if frappe.local.flags.in_migrate:
+			print("Redis queue is unreachable: Executing jobs synchronously")
+			return call_all()
+
+		raise
+
+	for qtype, queued_jobs in jobs_by_queue.items():
+		_check_queue_size(queues[qtype], len(queued_jobs))
+
+	conn = get_redis_conn()
+	pipeline = conn.pipeline()
+	job_ids = [create_job_id(job.get("job_id")) for job in jobs]
+	skipped_ids = set()
+
+	if deduplicate:
+		for existing_job in Job.fetch_many(job_ids, connection=conn):
+			if not existing_job:
+				continue
+
+			if existing_job.get_status(refresh=False) in (JobStatus.QUEUED, JobStatus.STARTED):
+				frappe.logger().error(f"Not queueing job {existing_job.id} because it is in queue already")
+				skipped_ids.add(existing_job.id)
+			else:
+				# delete job to avoid argument issues related to job args
+				existing_job.delete(pipeline=pipeline)
+
+	failure_ttl = frappe.conf.get("rq_job_failure_ttl") or RQ_JOB_FAILURE_TTL
+	result_ttl = frappe.conf.get("rq_results_ttl") or RQ_RESULTS_TTL
+	job_datas = defaultdict(list)
+	enqueued_ids = []
+
+	for job, job_id in zip(jobs, job_ids, strict=True):
+		if job_id in skipped_ids:
+			continue
+
+		if deduplicate:
+			# same job repeated in `jobs`
+			skipped_ids.add(job_id)
+
+		qtype = job.get("queue") or queue
+		on_success = job.get("on_success")
+		on_failure = job.get("on_failure") or truncate_failed_registry
+
+		job_datas[qtype].append(
+			Queue.prepare_data(
+				execute_job,
+				kwargs=_get_queue_args(
+					job["method"], job.get("event"), job.get("job_name"), is_async, job.get("kwargs") or {}
+				),
+				timeout=job.get("timeout") or timeout or get_queues_timeout().get(qtype) or 300,
+				at_front=job.get("at_front", at_front),
+				failure_ttl=failure_ttl,
+				result_ttl=result_ttl,
+				job_id=job_id,
+				meta={"priority": job["job_priority"]} if job.get("job_priority") else None,
+				on_success=Callback(func=on_success) if on_success else None,
+				on_failure=Callback(func=on_failure),
+			)
+		)
+		enqueued_ids.append(job_id)
+
+	def enqueue_all():
+		if not is_async:
+			# jobs are run while being enqueued, they can't wait for the pipeline
+			pipeline.execute()
+			for qtype, datas in job_datas.items():
+				for data in datas:
+					queues[qtype].enqueue_call(**data._asdict())
+			return
+
+		for qtype, datas in job_datas.items():
+			queues[qtype].enqueue_many(datas, pipeline=pipeline)
+		pipeline.execute()
+
+	if enqueue_after_commit:
+		frappe.db.after_commit.add(enqueue_all)
+	else:
+		enqueue_all()
+
+	return enqueued_ids
+
+
+def _get_queue_args(
+	method: str | Callable, event, job_name: str | None, is_async: bool, kwargs: dict
+) -> dict:
+	# Prepare a more readable name than <function $name at $address>
+	if isinstance(method, Callable):
+		method_name = f"{method.__module__}.{method.__qualname__}"
+	else:
+		method_name = method
+
+	return {
+		"site": frappe.local.site,
+		"user": frappe.session.user,
+		"method": method,
+		"event": event,
+		"job_name": job_name or method_name,
+		"is_async": is_async,
+		"kwargs": kwargs,
+	}
+
+
+def _publish_job_outcome(event: str, data: dict):
+	if job_id := get_current_job_id():
+		publish_job_outcome(job_id, event, data)
+
+
 def enqueue_doc(doctype, name=None, method=None, queue="default", timeout=300, now=False, **kwargs):
 	"""Enqueue a method to be run on a document"""
 	return enqueue(
@@ -243,17 +387,20 @@ def execute_job(site, method, event, job_name, kwargs, user=None, is_async=True,
 
 		else:
 			frappe.log_error(title=method_name)
+			_publish_job_outcome("failed", {"exception": repr(e)})
 			raise
 
-	except Exception:
+	except Exception as e:
 		frappe.db.rollback()
 		frappe.log_error(title=method_name)
 		frappe.db.commit()
 		print(frappe.get_traceback())
+		_publish_job_outcome("failed", {"exception": repr(e)})
 		raise
 
 	else:
 		frappe.db.commit()
+		_publish_job_outcome("finished", {"result": retval})
 		return retval
 
 	finally:
@@ -284,15 +431,56 @@ class FrappeWorker(Worker):
 		Thread(target=start_scheduler, daemon=True).start()
 
 
+class WarmFrappeWorker(FrappeWorker, SimpleWorker):
+	"""Runs jobs in the worker process instead of forking a work horse for every job.
+
+	Modules imported by jobs, site config, pooled database connections and (if enabled for the
+	site) the process cache tier are kept across jobs. `frappe.local` is still initialised and
+	released for every job. Workers exit after `warm_worker_max_jobs` jobs and are replaced by the
+	worker pool."""
+
+	def work(self, *args, **kwargs):
+		frappe._warm_worker = True
+		kwargs.setdefault("max_jobs", frappe.get_conf().get("warm_worker_max_jobs") or WARM_WORKER_MAX_JOBS)
+		return super().work(*args, **kwargs)
+
+	def perform_job(self, job, queue):
+		try:
+			return super().perform_job(job, queue)
+		finally:
+			# don't leak state of a job that failed before releasing it
+			if getattr(frappe.local, "initialised", False):
+				frappe.destroy()
+
+
+class FairWorker(FairSchedulingMixin, Worker):
+	pass
+
+
+class FairFrappeWorker(FairSchedulingMixin, FrappeWorker):
+	pass
+
+
+class FairWarmFrappeWorker(FairSchedulingMixin, WarmFrappeWorker):
+	pass
+
+
 def start_worker(
 	queue: str | None = None,
 	quiet: bool = False,
 	rq_username: str | None = None,
 	rq_password: str | None = None,
 	burst: bool = False,
-	strategy: DequeueStrategy | None = DequeueStrategy.DEFAULT,
+	strategy: DequeueStrategy | str | None = DequeueStrategy.DEFAULT,
 ) -> None:  # pragma: no cover
-	"""Wrapper to start rq worker. Connects to redis and monitors these queues."""
+	"""Wrapper to start rq worker. Connects to redis and monitors these queues.
+
+	`strategy="fair"` picks jobs fairly across sites, see `frappe.utils.fair_scheduling`."""
+
+	worker_class = Worker
+	if strategy == "fair":
+		worker_class = FairWorker
+		strategy = None
 
 	if not strategy:
 		strategy = DequeueStrategy.DEFAULT
@@ -317,7 +505,7 @@ def start_worker(
 	if quiet:
 		logging_level = "WARNING"
 
-	worker = Worker(queues, connection=redis_connection)
+	worker = worker_class(queues, connection=redis_connection)
 	worker.work(
 		logging_level=logging_level,
 		burst=burst,
@@ -332,9 +520,14 @@ def start_worker_pool(
 	num_workers: int = 1,
 	quiet: bool = False,
 	burst: bool = False,
+	strategy: str | None = None,
+	warm: bool = False,
 ) -> NoReturn:
 	"""Start worker pool with specified number of workers.
 
+	`strategy="fair"` picks jobs fairly across sites, see `frappe.utils.fair_scheduling`.
+	`warm=True` runs jobs in the worker processes, see `WarmFrappeWorker`.
+
 	WARNING: This feature is considered "EXPERIMENTAL".
 	"""
 
@@ -372,7 +565,13 @@ def start_worker_pool(
 		queues=queues,
 		connection=redis_connection,
 		num_workers=num_workers,
-		worker_class=FrappeWorker,  # Auto starts scheduler with workerpool
+		# Auto starts scheduler with workerpool
+		worker_class={
+			(False, False): FrappeWorker,
+			(True, False): FairFrappeWorker,
+			(False, True): WarmFrappeWorker,
+			(True, True): FairWarmFrappeWorker,
+		}[(strategy == "fair", warm)],
 	)
 	pool.start(logging_level=logging_level, burst=burst)
 
@@ -618,12 +817,12 @@ def truncate_failed_registry(job, connection, type, value, traceback):
 				job_obj and fail_registry.remove(job_obj, delete_job=True)
 
 
-def _check_queue_size(q: Queue):
+def _check_queue_size(q: Queue, new_jobs: int = 1):
 	max_jobs = cint(frappe.conf.max_queued_jobs)
 	if not max_jobs:
 		return
 
-	if cint(q.count) >= max_jobs:
+	if cint(q.count) + new_jobs > max_jobs:
 		primary_action = {
 			"label": "Monitor System Health",
 			"client_action": "frappe.set_route",
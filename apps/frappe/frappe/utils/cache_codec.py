@@ -0,0 +1,74 @@
+# Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Encoding of values stored in Redis cache.
+
+Values are pickled, and pickles larger than `redis_cache_compression_threshold` bytes are
+compressed with the compression set as `redis_cache_compression` in site config:
+
+        "redis_cache_compression": "zlib",  # or "zstd", requires `zstandard` package
+        "redis_cache_compression_threshold": 4096
+
+Compressed values are prefixed with a marker byte of their compression, which never starts a
+pickle, so values are decoded correctly irrespective of the current configuration. Apps can
+add compressions to `COMPRESSIONS`.
+"""
+
+import functools
+import pickle
+import zlib
+from collections.abc import Callable
+from typing import Any
+
+import frappe
+
+DEFAULT_COMPRESSION_THRESHOLD = 4096
+PICKLE_MARKER = b"\x80"
+
+Compressor = Callable[[bytes], bytes]
+
+
+def _zlib() -> tuple[Compressor, Compressor]:
+	return functools.partial(zlib.compress, level=1), zlib.decompress
+
+
+def _zstd() -> tuple[Compressor, Compressor]:
+	import zstandard
+
+	return zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress
+
+
+# name -> (marker byte, function returning compress and decompress functions)
+COMPRESSIONS: dict[str, tuple[bytes, Callable[[], tuple[Compressor, Compressor]]]] = {
+	"zlib": (b"\x01", _zlib),
+	"zstd": (b"\x02", _zstd),
+}
+
+
+@functools.cache
+def get_compression(name: str) -> tuple[bytes, Compressor, Compressor]:
+	marker, setup = COMPRESSIONS[name]
+	return marker, *setup()
+
+
+def dumps(value: Any) -> bytes:
+	data = pickle.dumps(value)
+
+	if (name := frappe.conf.redis_cache_compression) and len(data) > (
+		frappe.conf.redis_cache_compression_threshold or DEFAULT_COMPRESSION_THRESHOLD
+	):
+		marker, compress, _ = get_compression(name)
+		return marker + compress(data)
+
+	return data
+
+
+def loads(data: bytes) -> Any:
+	marker = data[:1]
+	if marker != PICKLE_MARKER:
+		for name, (compression_marker, _) in COMPRESSIONS.items():
+			if marker == compression_marker:
+				_, _, decompress = get_compression(name)
+				return pickle.loads(decompress(data[1:]))
+
+	return pickle.loads(data)
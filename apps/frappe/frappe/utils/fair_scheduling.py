@@ -0,0 +1,257 @@
+# Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Fair scheduling of background jobs across sites of a bench.
+
+RQ workers pick jobs strictly in FIFO order, so a burst of jobs from one site keeps jobs of
+all other sites waiting behind it. Workers started with `--strategy fair` instead look at the
+first jobs of each queue and pick a job of the site that currently runs the fewest jobs
+relative to its weight, round robin between sites that are equal. Within a site, jobs with
+higher `job_priority` (see `frappe.enqueue`) are picked first.
+
+Configuration (common_site_config.json):
+
+        "job_site_weights": {"big.example.com": 2},  # default weight is 1
+        "job_site_concurrency": {"*": 4, "big.example.com": 8},  # max jobs running per site
+        "fair_scheduling_window": 100  # jobs looked at in each queue
+
+Running jobs are tracked per worker in redis, so weights and limits apply across all workers
+of the bench that use fair scheduling. Workers wait for jobs with a blocking pop while all their
+queues are empty, like RQ workers do, and only poll while jobs wait for sites to be below limit.
+"""
+
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+
+import redis
+from rq.exceptions import NoSuchJobError
+from rq.utils import as_text
+from rq.worker import Worker, WorkerStatus
+
+import frappe
+from frappe.utils import get_bench_id
+
+DEFAULT_WINDOW = 100
+# seconds to wait before looking at queues again when jobs are queued but none can be picked
+POLL_INTERVAL = 0.5
+# max seconds to block for a job while queues are empty, before heartbeats and maintenance
+IDLE_WAIT = 5
+# job id -> (site, priority) of jobs seen in queues
+MAX_KNOWN_JOBS = 10_000
+
+# Claim a job if its site is within limit: remove it from queue and mark this worker as running it.
+# KEYS: queue, running jobs (worker -> site), last served (site -> time)
+# ARGV: job id, worker name, site, time, limit of site (0 for no limit)
+CLAIM_SCRIPT = """
+local limit = tonumber(ARGV[5])
+if limit > 0 then
+	local running = 0
+	for _, site in ipairs(redis.call('HVALS', KEYS[2])) do
+		if site == ARGV[3] then running = running + 1 end
+	end
+	if running >= limit then return 0 end
+end
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then return 0 end
+redis.call('HSET', KEYS[2], ARGV[2], ARGV[3])
+redis.call('HSET', KEYS[3], ARGV[3], ARGV[4])
+return 1
+"""
+
+
+def get_running_jobs_key() -> str:
+	return f"{get_bench_id()}:fair_scheduling:running"
+
+
+def get_last_served_key() -> str:
+	return f"{get_bench_id()}:fair_scheduling:last_served"
+
+
+def get_candidate_jobs(
+	job_ids: Iterable[str],
+	jobs: dict[str, tuple[str, int]],
+	running: dict[str, int],
+	last_served: dict[str, float],
+	weights: dict[str, float],
+	limits: dict[str, int],
+) -> list[tuple[str, str]]:
+	"""Return `(job id, site)` candidates in order they should be picked, one per site.
+
+	:param job_ids: ids of queued jobs in queue order
+	:param jobs: job id -> (site, priority)
+	:param running: site -> number of running jobs
+	:param last_served: site -> time when a job of the site was last picked
+	:param weights: site -> weight, default is 1
+	:param limits: site -> max running jobs, "*" for all sites
+	"""
+	jobs_by_site: dict[str, list[tuple[int, int, str]]] = defaultdict(list)
+	for position, job_id in enumerate(job_ids):
+		if job_id in jobs:
+			site, priority = jobs[job_id]
+			jobs_by_site[site].append((priority, -position, job_id))
+
+	candidates = []
+	for site, site_jobs in jobs_by_site.items():
+		limit = limits.get(site, limits.get("*"))
+		if limit and running.get(site, 0) >= limit:
+			continue
+
+		share = running.get(site, 0) / (weights.get(site) or 1)
+		candidates.append(((share, last_served.get(site, 0)), max(site_jobs)[2], site))
+
+	return [(job_id, site) for _, job_id, site in sorted(candidates)]
+
+
+class FairSchedulingMixin:
+	"""Pick jobs fairly across sites instead of in FIFO order. Use with a `Worker` class."""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		conf = frappe.get_conf()
+		self.site_weights = conf.get("job_site_weights") or {}
+		self.site_limits = conf.get("job_site_concurrency") or {}
+		self.fair_scheduling_window = conf.get("fair_scheduling_window") or DEFAULT_WINDOW
+		self.known_jobs: dict[str, tuple[str, int]] = {}
+		self.running_jobs_key = get_running_jobs_key()
+		self.last_served_key = get_last_served_key()
+		self.claim_job = self.connection.register_script(CLAIM_SCRIPT)
+		# whether any queue had jobs when last looked at
+		self.has_queued_jobs = False
+
+	def dequeue_job_and_maintain_ttl(self, timeout: int | None, max_idle_time: int | None = None):
+		self.set_state(WorkerStatus.IDLE)
+		self.procline("Listening on " + ",".join(self.queue_names()))
+		idle_since = last_heartbeat = time.monotonic()
+		self.heartbeat()
+
+		while True:
+			if self.should_run_maintenance_tasks:
+				self.run_maintenance_tasks()
+
+			try:
+				result = self.pick_fair_job()
+			except redis.exceptions.ConnectionError as e:
+				self.log.error("Could not connect to Redis instance: %s Retrying in 1 second...", e)
+				result = None
+
+			if result:
+				job, queue = result
+				job.redis_server_version = self.get_redis_server_version()
+				self.log.info("%s: %s (%s)", queue.name, job.description, job.id)
+				break
+
+			idle_for = time.monotonic() - idle_since
+			if timeout is None or (max_idle_time is not None and idle_for >= max_idle_time):
+				# burst mode or idle for too long
+				break
+
+			if time.monotonic() - last_heartbeat >= timeout:
+				self.heartbeat()
+				last_heartbeat = time.monotonic()
+
+			if self.has_queued_jobs:
+				# jobs of sites at their limit wait for running jobs to finish
+				time.sleep(POLL_INTERVAL)
+			else:
+				wait = min(IDLE_WAIT, timeout - (time.monotonic() - last_heartbeat))
+				if max_idle_time is not None:
+					wait = min(wait, max_idle_time - idle_for)
+				self.wait_for_job(max(1, int(wait)))
+
+		self.heartbeat()
+		return result
+
+	def wait_for_job(self, timeout: int):
+		"""Block till a job is enqueued in one of the queues, for at most `timeout` seconds.
+
+		The job is put back at the front of its queue, to be picked fairly by any worker."""
+		try:
+			result = self.connection.blpop([queue.key for queue in self._ordered_queues], timeout)
+		except redis.exceptions.ConnectionError as e:
+			self.log.error("Could not connect to Redis instance: %s Retrying in 1 second...", e)
+			time.sleep(1)
+			return
+
+		if result:
+			queue_key, job_id = result
+			self.connection.lpush(queue_key, job_id)
+
+	def pick_fair_job(self):
+		self.has_queued_jobs = False
+		for queue in self._ordered_queues:
+			job_ids = self.connection.lrange(queue.key, 0, self.fair_scheduling_window - 1)
+			if not job_ids:
+				continue
+
+			self.has_queued_jobs = True
+			job_ids = [as_text(job_id) for job_id in job_ids]
+			self.load_job_sites(queue, job_ids)
+			running = Counter(as_text(site) for site in self.connection.hvals(self.running_jobs_key))
+			last_served = {
+				as_text(site): float(served)
+				for site, served in self.connection.hgetall(self.last_served_key).items()
+			}
+
+			for job_id, site in get_candidate_jobs(
+				job_ids, self.known_jobs, running, last_served, self.site_weights, self.site_limits
+			):
+				limit = self.site_limits.get(site, self.site_limits.get("*")) or 0
+				claimed = self.claim_job(
+					keys=[queue.key, self.running_jobs_key, self.last_served_key],
+					args=[job_id, self.name, site, time.time(), limit],
+				)
+				if not claimed:
+					# picked by another worker or site reached its limit meanwhile
+					continue
+
+				self.known_jobs.pop(job_id, None)
+				try:
+					job = self.job_class.fetch(job_id, connection=self.connection, serializer=self.serializer)
+				except NoSuchJobError:
+					self.release_site_slot()
+					continue
+
+				return job, queue
+
+	def load_job_sites(self, queue, job_ids: list[str]):
+		if len(self.known_jobs) > MAX_KNOWN_JOBS:
+			self.known_jobs.clear()
+
+		new_ids = [job_id for job_id in job_ids if job_id not in self.known_jobs]
+		if not new_ids:
+			return
+
+		for job_id, job in zip(
+			new_ids,
+			self.job_class.fetch_many(new_ids, connection=self.connection, serializer=self.serializer),
+			strict=True,
+		):
+			if job:
+				self.known_jobs[job_id] = (job.kwargs.get("site") or "", job.meta.get("priority") or 0)
+			else:
+				# RQ silently drops ids of deleted jobs when popping them
+				self.connection.lrem(queue.key, 1, job_id)
+
+	def execute_job(self, job, queue):
+		try:
+			return super().execute_job(job, queue)
+		finally:
+			self.release_site_slot()
+
+	def release_site_slot(self):
+		self.connection.hdel(self.running_jobs_key, self.name)
+
+	def run_maintenance_tasks(self, *args, **kwargs):
+		"""Forget running jobs of workers that died without releasing them."""
+		super().run_maintenance_tasks(*args, **kwargs)
+
+		workers = {
+			as_text(key).removeprefix(Worker.redis_worker_namespace_prefix)
+			for key in self.connection.smembers(Worker.redis_workers_keys)
+		}
+		if dead_workers := [
+			worker
+			for worker in map(as_text, self.connection.hkeys(self.running_jobs_key))
+			if worker not in workers
+		]:
+			self.connection.hdel(self.running_jobs_key, *dead_workers)
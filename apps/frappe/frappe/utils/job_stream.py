@@ -0,0 +1,168 @@
+# Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Progress and outcome of background jobs in Redis Streams.
+
+Every job run by `execute_job` appends its outcome to a stream of the job, and
+`frappe.publish_progress` called from a job appends progress to it. Consumers can read a job's
+stream from any point (by stream id) or wait for the job to finish without polling:
+
+        frappe.enqueue("app.tasks.long_task", job_id="long-task")
+        outcome = wait_for_job("long-task", timeout=60)  # {"event": "finished", "data": {"result": ...}}
+
+Progress updates are coalesced: at most one update per `job_progress_interval` seconds (default
+0.5) is written and sent to the browser, the last update is always sent.
+
+Results larger than `MAX_RESULT_SIZE` (serialized) or that can't be serialized are left out of the
+"finished" event, the full result is still kept by RQ.
+"""
+
+import json
+from time import monotonic
+from typing import Any
+
+import redis
+from rq import get_current_job
+from rq.utils import as_text
+
+import frappe
+from frappe import _
+
+STREAM_TTL = 10 * 60
+STREAM_MAXLEN = 1000
+DEFAULT_PROGRESS_INTERVAL = 0.5
+FINAL_EVENTS = ("finished", "failed")
+# bytes of serialized result stored in "finished" event
+MAX_RESULT_SIZE = 64 * 1024
+
+
+def get_stream_key(job_id: str) -> str:
+	"""Stream key of job with id `job_id` (namespaced to site)."""
+	return f"job_stream:{job_id}"
+
+
+def get_current_job_id() -> str | None:
+	if getattr(frappe.local, "job", None) and (job := get_current_job()):
+		return job.id
+
+
+def add_event(job_id: str, event: str, data: dict) -> str | None:
+	"""Append event to stream of job and return its stream id."""
+	from frappe.utils.background_jobs import get_redis_conn
+
+	key = get_stream_key(job_id)
+	fields = {"event": event, "data": frappe.as_json(data, indent=None), "user": frappe.session.user}
+	try:
+		pipeline = get_redis_conn().pipeline(transaction=False)
+		pipeline.xadd(key, fields, maxlen=STREAM_MAXLEN, approximate=True)
+		pipeline.expire(key, STREAM_TTL)
+		return as_text(pipeline.execute()[0])
+	except redis.exceptions.ConnectionError:
+		return None
+
+
+def publish_job_progress(job_id: str, progress: dict, **realtime_kwargs):
+	"""Publish progress of current job, coalesced with updates that come too fast."""
+	job = frappe.local.job
+	job.pending_progress = (progress, realtime_kwargs)
+
+	interval = frappe.conf.job_progress_interval or DEFAULT_PROGRESS_INTERVAL
+	if (progress.get("percent") or 0) < 100 and monotonic() - (job.progress_sent_at or 0) < interval:
+		return
+
+	flush_progress(job_id)
+
+
+def flush_progress(job_id: str):
+	"""Publish progress of current job held back by coalescing."""
+	job = getattr(frappe.local, "job", None)
+	if not (job and job.pending_progress):
+		return
+
+	progress, realtime_kwargs = job.pending_progress
+	job.pending_progress = None
+	job.progress_sent_at = monotonic()
+
+	add_event(job_id, "progress", progress)
+	frappe.publish_realtime("progress", progress, **realtime_kwargs)
+
+
+def publish_job_outcome(job_id: str, event: str, data: dict):
+	"""Publish final event of job. Never raises, work of the job is already committed."""
+	try:
+		flush_progress(job_id)
+		add_event(job_id, event, get_small_result(data))
+	except Exception:
+		frappe.logger("job_stream").error(f"Failed to publish outcome of job {job_id}", exc_info=True)
+
+
+def get_small_result(data: dict) -> dict:
+	if data.get("result") is None:
+		return data
+
+	try:
+		size = len(frappe.as_json(data["result"], indent=None))
+	except Exception:
+		# result isn't JSON serializable
+		return {**data, "result": None}
+
+	if size > MAX_RESULT_SIZE:
+		return {**data, "result": None, "result_truncated": True}
+	return data
+
+
+def read_job_events(
+	job_id: str, last_id: str = "0", count: int = 100, block: int | None = None
+) -> list[frappe._dict]:
+	"""Return events of job (id without site namespace) after stream id `last_id`.
+
+	:param block: milliseconds to wait for new events if there are none.
+	"""
+	from frappe.utils.background_jobs import create_job_id, get_redis_conn
+
+	key = get_stream_key(create_job_id(job_id))
+	response = get_redis_conn().xread({key: last_id}, count=count, block=block)
+
+	return [
+		frappe._dict(
+			id=as_text(stream_id),
+			event=as_text(fields[b"event"]),
+			data=json.loads(fields[b"data"]),
+			user=as_text(fields[b"user"]),
+		)
+		for _, entries in response
+		for stream_id, fields in entries
+	]
+
+
+@frappe.whitelist()
+def get_job_events(job_id: str, last_id: str = "0") -> list[dict]:
+	"""Return events of job after stream id `last_id`, to resume following a job."""
+	events = read_job_events(job_id, last_id)
+	if "System Manager" not in frappe.get_roles() and any(
+		event.user != frappe.session.user for event in events
+	):
+		frappe.throw(_("Not permitted to view this job"), frappe.PermissionError)
+
+	for event in events:
+		del event["user"]
+	return events
+
+
+def wait_for_job(job_id: str, timeout: float | None = None, last_id: str = "0") -> dict[str, Any] | None:
+	"""Block until job (id without site namespace) finishes or fails and return its final event.
+
+	Returns None if job doesn't finish within `timeout` seconds."""
+	deadline = monotonic() + timeout if timeout is not None else None
+
+	while True:
+		block = 0
+		if deadline is not None:
+			block = int((deadline - monotonic()) * 1000)
+			if block <= 0:
+				return None
+
+		for event in read_job_events(job_id, last_id, block=block):
+			last_id = event.id
+			if event.event in FINAL_EVENTS:
+				return {"event": event.event, "data": event.data}
@@ -0,0 +1,230 @@
+# Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Per process cache tier in front of Redis.
+
+`frappe.local.cache` only lives for one request, so every request fetches the same values
+(System Settings, defaults, metas...) from Redis again. With `process_cache` enabled in site
+config, values read by `RedisWrapper.get_value` / `hget` are also kept in a size bounded LRU
+which lives as long as the process.
+
+Every write or delete through `RedisWrapper` publishes the changed keys on a Redis pub/sub
+channel, and a listener thread in each process evicts them from its tier. Entries also expire
+after `process_cache_ttl` seconds so that values changed outside `RedisWrapper` are not served
+forever. The tier is bypassed whenever the listener isn't connected.
+
+Site config:
+
+        "process_cache": 1,
+        "process_cache_max_bytes": 33554432,
+        "process_cache_ttl": 300
+
+Warm job workers (`bench worker-pool --warm`) only use the tier if it is enabled for the site:
+processes without the tier don't publish invalidations, so a tier in workers alone would serve
+values changed by web workers till `process_cache_ttl`.
+"""
+
+import os
+import pickle
+import socket
+import threading
+from collections import OrderedDict, defaultdict
+from time import monotonic
+
+import redis
+
+import frappe
+
+INVALIDATION_CHANNEL = "process_cache_invalidation"
+INVALIDATE_ALL = "*"
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_TTL = 5 * 60
+# seconds to wait before trying to start a listener again after it failed
+LISTEN_RETRY_INTERVAL = 30
+
+_process_cache: "ProcessCache | None" = None
+
+
+class ProcessCache:
+	"""Byte budgeted LRU of pickled values.
+
+	Keys are made keys of `RedisWrapper` or `(name, key)` tuples for fields of hashes. Values
+	are stored pickled so that callers can't mutate values shared by all requests."""
+
+	def __init__(self, client: redis.Redis):
+		self.client = client
+		self.pid = os.getpid()
+		self.origin = f"{socket.gethostname()}:{self.pid}"
+		self.entries: OrderedDict[bytes | tuple, tuple[bytes, float]] = OrderedDict()
+		# hash name -> cached fields of the hash
+		self.hash_fields: dict[bytes, set] = defaultdict(set)
+		self.size = 0
+		# bumped on every invalidation, values read before an invalidation are not stored
+		self.generation = 0
+		self.stats: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+
+		self._lock = threading.RLock()
+		self._listener: threading.Thread | None = None
+		self._listen_failed_at: float | None = None
+
+	@property
+	def max_bytes(self) -> int:
+		return frappe.conf.process_cache_max_bytes or DEFAULT_MAX_BYTES
+
+	def is_usable(self) -> bool:
+		if self._listener is None or not self._listener.is_alive():
+			self.listen()
+		return self._listener is not None and self._listener.is_alive()
+
+	def get(self, key: bytes | tuple) -> bytes | None:
+		with self._lock:
+			entry = self.entries.get(key)
+			if entry is None:
+				self._record(key, hit=False)
+				return None
+
+			value, expires_at = entry
+			if expires_at < monotonic():
+				self._evict(key)
+				self._record(key, hit=False)
+				return None
+
+			self.entries.move_to_end(key)
+			self._record(key, hit=True)
+			return value
+
+	def set(self, key: bytes | tuple, value: bytes, generation: int, ttl: float | None = None):
+		""":param ttl: seconds till the value expires in Redis, entry doesn't outlive it."""
+		if len(value) > self.max_bytes // 4:
+			return
+
+		max_ttl = frappe.conf.process_cache_ttl or DEFAULT_TTL
+		ttl = max_ttl if ttl is None else min(ttl, max_ttl)
+		with self._lock:
+			if generation != self.generation:
+				return
+
+			self._evict(key)
+			self.entries[key] = (value, monotonic() + ttl)
+			self.size += len(value)
+			if isinstance(key, tuple):
+				self.hash_fields[key[0]].add(key[1])
+
+			max_bytes = self.max_bytes
+			while self.size > max_bytes:
+				self._evict(next(iter(self.entries)))
+
+	def invalidate(self, keys: list, publish: bool = True):
+		"""Evict `keys` from this process and (if `publish`) from all other processes.
+
+		A plain key also evicts all cached fields of the hash with that name."""
+		with self._lock:
+			self.generation += 1
+			for key in keys:
+				self._invalidate(key)
+
+		if publish:
+			try:
+				self.client.publish(INVALIDATION_CHANNEL, pickle.dumps((self.origin, keys)))
+			except redis.exceptions.ConnectionError:
+				pass
+
+	def clear(self):
+		with self._lock:
+			self.generation += 1
+			self.entries.clear()
+			self.hash_fields.clear()
+			self.size = 0
+
+	def get_info(self) -> dict:
+		with self._lock:
+			stats = {
+				prefix: {"hits": hits, "misses": misses} for prefix, (hits, misses) in self.stats.items()
+			}
+			return {"entries": len(self.entries), "bytes": self.size, "stats": stats}
+
+	def listen(self):
+		"""Start listener thread that evicts keys invalidated by other processes."""
+		with self._lock:
+			if self._listener is not None and self._listener.is_alive():
+				return
+
+			if self._listen_failed_at and monotonic() - self._listen_failed_at < LISTEN_RETRY_INTERVAL:
+				return
+
+			# nothing published while the listener was down is known, start afresh
+			self.clear()
+			try:
+				pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+				pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_message})
+				self._listener = pubsub.run_in_thread(
+					sleep_time=1, daemon=True, exception_handler=self._on_listener_error
+				)
+			except redis.exceptions.ConnectionError:
+				self._listener = None
+				self._listen_failed_at = monotonic()
+
+	def _on_message(self, message):
+		origin, keys = pickle.loads(message["data"])
+		if origin == self.origin:
+			return
+
+		if keys == INVALIDATE_ALL:
+			self.clear()
+		else:
+			self.invalidate(keys, publish=False)
+
+	def _on_listener_error(self, exc, pubsub, thread):
+		thread.stop()
+		pubsub.close()
+		self._listen_failed_at = monotonic()
+		self.clear()
+
+	def _invalidate(self, key):
+		if isinstance(key, tuple):
+			self._evict(key)
+			return
+
+		self._evict(key)
+		for field in self.hash_fields.pop(key, ()):
+			self._evict((key, field))
+
+	def _evict(self, key):
+		if entry := self.entries.pop(key, None):
+			self.size -= len(entry[0])
+
+		if isinstance(key, tuple) and (fields := self.hash_fields.get(key[0])):
+			fields.discard(key[1])
+			if not fields:
+				del self.hash_fields[key[0]]
+
+	def _record(self, key, hit: bool):
+		name = key[0] if isinstance(key, tuple) else key
+		prefix = name.split(b"|", 1)[-1].split(b":", 1)[0].decode(errors="replace")
+		self.stats[prefix][0 if hit else 1] += 1
+
+
+def get_process_cache(client: redis.Redis) -> ProcessCache | None:
+	"""Return process cache tier if enabled and usable."""
+	global _process_cache
+
+	if not frappe.conf.process_cache:
+		return None
+
+	if _process_cache is None or _process_cache.pid != os.getpid():
+		# threads and state of parent process are not usable after fork
+		_process_cache = ProcessCache(client)
+
+	if _process_cache.is_usable():
+		return _process_cache
+
+
+def clear_process_cache(client: redis.Redis):
+	"""Clear process cache tier of all processes."""
+	if cache := get_process_cache(client):
+		cache.clear()
+		try:
+			client.publish(INVALIDATION_CHANNEL, pickle.dumps((cache.origin, INVALIDATE_ALL)))
+		except redis.exceptions.ConnectionError:
+			pass
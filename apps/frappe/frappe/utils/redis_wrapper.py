@@ -1,13 +1,39 @@
 # Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
-import pickle
 import re
+from collections import defaultdict
 
 import redis
 from redis.commands.search import Search
 
 import frappe
-from frappe.utils import cstr
+from frappe.utils import cache_codec, cstr
+from frappe.utils.process_cache import get_process_cache
+
+# number of keys to inspect per SCAN call
+SCAN_COUNT = 1000
+
+# keys of these namespaces are tracked in index sets, see `get_key_namespace`
+KEY_INDEX_PREFIX = "key_index::"
+INDEXED_KEY_PREFIXES = ("insert_queue_for_",)
+
+
+def get_key_namespace(key: str) -> str | None:
+	"""Return namespace of an (unprefixed) key if keys of the namespace are tracked in an index set.
+
+	Indexed namespaces are documents of a DocType (`document_cache::{doctype}::`), keys of a user
+	(`user:{user}:`) and `INDEXED_KEY_PREFIXES`. Keys of an indexed namespace can be found or
+	deleted without scanning all keys of Redis."""
+	if key.startswith("user:"):
+		return key[: key.find(":", 5) + 1] or None
+
+	if key.startswith("document_cache::"):
+		doctype, separator, _ = key[16:].partition("::")
+		return f"document_cache::{doctype}::" if separator else None
+
+	for prefix in INDEXED_KEY_PREFIXES:
+		if key.startswith(prefix):
+			return prefix
 
 
 class RedisearchWrapper(Search):
@@ -49,6 +75,12 @@ class RedisWrapper(redis.Redis):
 
 		return f"{frappe.conf.db_name}|{key}".encode()
 
+	def get_index_key(self, key: bytes) -> bytes | None:
+		"""Return key of the index set that tracks made `key`, None if it isn't indexed."""
+		site, _, key = cstr(key).partition("|")
+		if key and (namespace := get_key_namespace(key)):
+			return f"{site}|{KEY_INDEX_PREFIX}{namespace}".encode()
+
 	def set_value(self, key, val, user=None, expires_in_sec=None, shared=False):
 		"""Sets cache value.
 
@@ -63,14 +95,22 @@ class RedisWrapper(redis.Redis):
 			frappe.local.cache[key] = val
 
 		try:
+			pipeline = self.pipeline(transaction=False)
 			if expires_in_sec:
-				self.setex(name=key, time=expires_in_sec, value=pickle.dumps(val))
+				pipeline.setex(name=key, time=expires_in_sec, value=cache_codec.dumps(val))
 			else:
-				self.set(key, pickle.dumps(val))
+				pipeline.set(key, cache_codec.dumps(val))
+
+			if index_key := self.get_index_key(key):
+				pipeline.sadd(index_key, key)
+			pipeline.execute()
 
 		except redis.exceptions.ConnectionError:
 			return None
 
+		if process_cache := get_process_cache(self):
+			process_cache.invalidate([key])
+
 	def get_value(self, key, generator=None, user=None, expires=False, shared=False):
 		"""Returns cache value. If not found and generator function is
 		        given, it will call the generator.
@@ -88,13 +128,29 @@ class RedisWrapper(redis.Redis):
 
 		else:
 			val = None
-			try:
-				val = self.get(key)
-			except redis.exceptions.ConnectionError:
-				pass
+			process_cache = None if expires else get_process_cache(self)
+			if process_cache:
+				val = process_cache.get(key)
+				generation = process_cache.generation
+
+			if val is None and process_cache:
+				try:
+					# keys set with `expires_in_sec` can be read without `expires`
+					val, ttl = self.pipeline(transaction=False).get(key).pttl(key).execute()
+				except redis.exceptions.ConnectionError:
+					pass
+				else:
+					if val is not None:
+						process_cache.set(key, val, generation, ttl=ttl / 1000 if ttl >= 0 else None)
+
+			elif val is None:
+				try:
+					val = self.get(key)
+				except redis.exceptions.ConnectionError:
+					pass
 
 			if val is not None:
-				val = pickle.loads(val)
+				val = cache_codec.loads(val)
 
 			if not expires:
 				if val is None and generator:
@@ -114,18 +170,41 @@ class RedisWrapper(redis.Redis):
 		return ret
 
 	def get_keys(self, key):
-		"""Return keys starting with `key`."""
+		"""Return keys starting with `key`.
+
+		Keys of indexed namespaces (see `get_key_namespace`) are read from their index set, others
+		are found with `SCAN` which doesn't block Redis like `KEYS`."""
 		try:
+			if get_key_namespace(key) == key:
+				return self._get_indexed_keys(self.make_key(KEY_INDEX_PREFIX + key))
+
 			key = self.make_key(key + "*")
-			return self.keys(key)
+			return list(self.scan_iter(match=key, count=SCAN_COUNT))
 
 		except redis.exceptions.ConnectionError:
 			regex = re.compile(cstr(key).replace("|", r"\|").replace("*", r"[\w]*"))
 			return [k for k in list(frappe.local.cache) if regex.match(cstr(k))]
 
+	def _get_indexed_keys(self, index_key: bytes) -> list[bytes]:
+		if not (keys := list(super().smembers(index_key))):
+			return keys
+
+		# keys that expired, or lists that were emptied, are gone without being removed from index
+		pipeline = self.pipeline(transaction=False)
+		for key in keys:
+			pipeline.exists(key)
+		exists = pipeline.execute()
+
+		if stale_keys := [key for key, key_exists in zip(keys, exists, strict=True) if not key_exists]:
+			super().srem(index_key, *stale_keys)
+		return [key for key, key_exists in zip(keys, exists, strict=True) if key_exists]
+
 	def delete_keys(self, key):
 		"""Delete keys with wildcard `*`."""
-		self.delete_value(self.get_keys(key), make_keys=False)
+		keys = self.get_keys(key)
+		if get_key_namespace(key) == key:
+			keys.append(self.make_key(KEY_INDEX_PREFIX + key))
+		self.delete_value(keys, make_keys=False)
 
 	def delete_key(self, *args, **kwargs):
 		self.delete_value(*args, **kwargs)
@@ -146,15 +225,39 @@ class RedisWrapper(redis.Redis):
 			local_cache.pop(key, None)
 
 		try:
-			self.delete(*keys)
+			pipeline = self.pipeline(transaction=False)
+			pipeline.delete(*keys)
+			for index_key, indexed_keys in self._group_by_index_key(keys).items():
+				pipeline.srem(index_key, *indexed_keys)
+			pipeline.execute()
 		except redis.exceptions.ConnectionError:
 			pass
 
+		if process_cache := get_process_cache(self):
+			process_cache.invalidate(list(keys))
+
+	def _group_by_index_key(self, keys) -> dict[bytes, list[bytes]]:
+		grouped = defaultdict(list)
+		for key in keys:
+			if index_key := self.get_index_key(key):
+				grouped[index_key].append(key)
+		return grouped
+
 	def lpush(self, key, value):
-		return super().lpush(self.make_key(key), value)
+		return self._push("lpush", key, value)
 
 	def rpush(self, key, value):
-		return super().rpush(self.make_key(key), value)
+		return self._push("rpush", key, value)
+
+	def _push(self, command, key, value):
+		key = self.make_key(key)
+		if not (index_key := self.get_index_key(key)):
+			return getattr(super(), command)(key, value)
+
+		pipeline = self.pipeline(transaction=False)
+		getattr(pipeline, command)(key, value)
+		pipeline.sadd(index_key, key)
+		return pipeline.execute()[0]
 
 	def lpop(self, key):
 		return super().lpop(self.make_key(key))
@@ -190,10 +293,13 @@ class RedisWrapper(redis.Redis):
 
 		# set in redis
 		try:
-			super().hset(_name, key, pickle.dumps(value), *args, **kwargs)
+			super().hset(_name, key, cache_codec.dumps(value), *args, **kwargs)
 		except redis.exceptions.ConnectionError:
 			pass
 
+		if process_cache := get_process_cache(self):
+			process_cache.invalidate([(_name, key)])
+
 	def hexists(self, name: str, key: str, shared: bool = False) -> bool:
 		if key is None:
 			return False
@@ -213,7 +319,7 @@ class RedisWrapper(redis.Redis):
 
 	def hgetall(self, name):
 		value = super().hgetall(self.make_key(name))
-		return {key: pickle.loads(value) for key, value in value.items()}
+		return {key: cache_codec.loads(value) for key, value in value.items()}
 
 	def hget(self, name, key, generator=None, shared=False):
 		_name = self.make_key(name, shared=shared)
@@ -229,13 +335,21 @@ class RedisWrapper(redis.Redis):
 			return local_cache[_name][key]
 
 		value = None
-		try:
-			value = super().hget(_name, key)
-		except redis.exceptions.ConnectionError:
-			pass
+		if process_cache := get_process_cache(self):
+			value = process_cache.get((_name, key))
+			generation = process_cache.generation
+
+		if value is None:
+			try:
+				value = super().hget(_name, key)
+			except redis.exceptions.ConnectionError:
+				pass
+
+			if process_cache and value is not None:
+				process_cache.set((_name, key), value, generation)
 
 		if value is not None:
-			value = pickle.loads(value)
+			value = cache_codec.loads(value)
 			local_cache[_name][key] = value
 		elif generator:
 			value = generator()
@@ -253,6 +367,9 @@ class RedisWrapper(redis.Redis):
 		except redis.exceptions.ConnectionError:
 			pass
 
+		if process_cache := get_process_cache(self):
+			process_cache.invalidate([(_name, key)])
+
 	def hdel_keys(self, name_starts_with, key):
 		"""Delete hash names with wildcard `*` and key"""
 		for name in self.get_keys(name_starts_with):
@@ -88,6 +88,7 @@ def build_response(response_type=None):
 		"page": as_page,
 		"redirect": redirect,
 		"binary": as_binary,
+		"stream": as_stream,
 	}
 
 	return response_type_map[frappe.response.get("type") or response_type]()
@@ -162,6 +163,17 @@ def as_binary():
 	return response
 
 
+def as_stream():
+	"""Send file object in `filecontent` in chunks, it's closed once the response is sent."""
+	response = Response(
+		wrap_file(frappe.local.request.environ, frappe.response["filecontent"]), direct_passthrough=True
+	)
+	filename = frappe.response["filename"].encode("utf-8").decode("unicode-escape", "ignore")
+	response.mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+	response.headers.add("Content-Disposition", "attachment", filename=filename)
+	return response
+
+
 def make_logs():
 	"""make strings for msgprint and errprint"""
 
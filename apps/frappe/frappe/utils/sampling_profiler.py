@@ -0,0 +1,173 @@
+# Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Statistical profiler for requests and jobs recorded by `frappe.monitor`.
+
+Unlike `frappe.recorder`, which captures a stack for every query, the profiler looks at the stack
+of each request or job thread a fixed number of times per second from a background thread, so
+it's cheap enough to keep on in production. Enable it along with monitor in site config:
+
+        "monitor": 1,
+        "monitor_sampling_rate": 100  # samples per second
+
+Most sampled stacks of a request are added to its monitor record, and stacks of all requests
+are also aggregated by endpoint in Redis. Aggregated stacks can be exported in collapsed stack
+format, which is read by flamegraph tools (flamegraph.pl, speedscope...):
+
+        bench --site {site} export-monitor-profile --endpoint /api/method/frappe.client.get_list
+"""
+
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from types import CodeType, FrameType
+
+import frappe
+
+PROFILE_KEY_PREFIX = "monitor-profile:"
+PROFILE_ENDPOINTS_KEY = "monitor-profile-endpoints"
+PROFILE_TTL = 24 * 60 * 60
+# stacks added to a monitor record, all stacks are aggregated
+MAX_RECORD_STACKS = 50
+MAX_STACK_DEPTH = 128
+
+_sampler: "Sampler | None" = None
+# code object -> label of its frames in collapsed stacks, code of server scripts and other
+# dynamically compiled code isn't kept alive by it
+_labels: "weakref.WeakKeyDictionary[CodeType, str]" = weakref.WeakKeyDictionary()
+
+
+class Sampler:
+	"""Background thread that samples stacks of profiled threads."""
+
+	def __init__(self, rate: int):
+		self.pid = os.getpid()
+		self.interval = 1 / rate
+		# thread id -> counts of sampled stacks
+		self.profiles: dict[int, Counter] = {}
+		self._lock = threading.Lock()
+		self._thread = threading.Thread(target=self.run, name="frappe-sampling-profiler", daemon=True)
+		self._thread.start()
+
+	def start(self, thread_id: int) -> Counter:
+		profile = Counter()
+		with self._lock:
+			self.profiles[thread_id] = profile
+		return profile
+
+	def stop(self, thread_id: int) -> Counter | None:
+		with self._lock:
+			return self.profiles.pop(thread_id, None)
+
+	def run(self):
+		while True:
+			time.sleep(self.interval)
+			with self._lock:
+				if not self.profiles:
+					continue
+
+				frames = sys._current_frames()
+				for thread_id, profile in self.profiles.items():
+					if frame := frames.get(thread_id):
+						profile[get_stack(frame)] += 1
+				# don't keep frames (and their locals) alive till next sample
+				frames = frame = None
+
+
+def get_stack(frame: FrameType) -> str:
+	"""Return stack of frame in collapsed stack format, outermost frame first."""
+	labels = []
+	while frame is not None and len(labels) < MAX_STACK_DEPTH:
+		code = frame.f_code
+		if (label := _labels.get(code)) is None:
+			label = _labels[code] = get_label(code)
+		labels.append(label)
+		frame = frame.f_back
+
+	return ";".join(reversed(labels))
+
+
+def get_label(code: CodeType) -> str:
+	filename = code.co_filename
+	for prefix in ("/apps/", "/site-packages/"):
+		filename = filename.rpartition(prefix)[2]
+
+	return f"{filename}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def start_profile(rate: int) -> Counter:
+	"""Start sampling current thread `rate` times per second and return its stack counts."""
+	global _sampler
+
+	if _sampler is None or _sampler.pid != os.getpid():
+		# sampler thread of parent process doesn't exist after fork
+		_sampler = Sampler(rate)
+
+	_sampler.interval = 1 / rate
+	return _sampler.start(threading.get_ident())
+
+
+def stop_profile() -> None:
+	if _sampler:
+		_sampler.stop(threading.get_ident())
+
+
+def summarize_profile(profile: Counter, rate: int) -> dict:
+	return {
+		"rate": rate,
+		"samples": sum(profile.values()),
+		"stacks": dict(profile.most_common(MAX_RECORD_STACKS)),
+	}
+
+
+def aggregate_profile(endpoint: str, profile: Counter) -> None:
+	"""Add sampled stacks to stacks of all requests (or jobs) of `endpoint`."""
+	if not profile:
+		return
+
+	key = frappe.cache.make_key(f"{PROFILE_KEY_PREFIX}{endpoint}")
+	endpoints_key = frappe.cache.make_key(PROFILE_ENDPOINTS_KEY)
+
+	pipeline = frappe.cache.pipeline(transaction=False)
+	for stack, count in profile.items():
+		pipeline.hincrby(key, stack, count)
+	pipeline.expire(key, PROFILE_TTL)
+	pipeline.sadd(endpoints_key, endpoint)
+	pipeline.expire(endpoints_key, PROFILE_TTL)
+	pipeline.execute()
+
+
+def get_endpoints() -> list[str]:
+	"""Return endpoints with aggregated stacks."""
+	return sorted(frappe.safe_decode(endpoint) for endpoint in frappe.cache.smembers(PROFILE_ENDPOINTS_KEY))
+
+
+def get_aggregated_profile(endpoint: str | None = None) -> Counter:
+	"""Return aggregated stack counts of `endpoint`, or of all endpoints."""
+	pipeline = frappe.cache.pipeline(transaction=False)
+	for _endpoint in [endpoint] if endpoint else get_endpoints():
+		pipeline.hgetall(frappe.cache.make_key(f"{PROFILE_KEY_PREFIX}{_endpoint}"))
+
+	profile = Counter()
+	for stacks in pipeline.execute():
+		for stack, count in stacks.items():
+			profile[frappe.safe_decode(stack)] += int(count)
+	return profile
+
+
+def to_collapsed_stacks(stacks: dict[str, int]) -> str:
+	return "\n".join(f"{stack} {count}" for stack, count in sorted(stacks.items()))
+
+
+def export_collapsed_stacks(endpoint: str | None = None) -> str:
+	"""Export aggregated stacks of `endpoint` (or all endpoints) in collapsed stack format."""
+	return to_collapsed_stacks(get_aggregated_profile(endpoint))
+
+
+def clear_profiles() -> None:
+	frappe.cache.delete_value(
+		[PROFILE_ENDPOINTS_KEY, *(f"{PROFILE_KEY_PREFIX}{endpoint}" for endpoint in get_endpoints())]
+	)
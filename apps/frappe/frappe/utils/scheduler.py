@@ -8,21 +8,86 @@ Events:
 	weekly
 """
 
+import heapq
 import os
 import random
 import time
+from datetime import datetime
 from typing import NoReturn
 
+import pytz
+import redis
 from croniter import CroniterBadCronError
 from filelock import FileLock, Timeout
 
 import frappe
-from frappe.utils import cint, get_bench_path, get_datetime, get_sites, now_datetime
+from frappe.utils import (
+	cint,
+	convert_utc_to_timezone,
+	get_bench_path,
+	get_datetime,
+	get_sites,
+	get_system_timezone,
+	now_datetime,
+)
 from frappe.utils.background_jobs import set_niceness
 from frappe.utils.caching import redis_cache
 
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# hash of site -> version of its scheduled job types, bumped whenever a job type changes
+SCHEDULE_VERSION_KEY = "scheduler:schedule_version"
+
+# site -> schedule of its job types, kept by the scheduler process across ticks
+_site_schedules: dict[str, "SiteSchedule"] = {}
+
+
+class SiteSchedule:
+	"""Next execution times of scheduled job types of a site, in a heap.
+
+	The scheduler process keeps one per site so that it doesn't have to connect to a site
+	until one of its jobs is due, and then only reads and enqueues the due job types."""
+
+	def __init__(self, version: bytes | None = None):
+		self.version = version
+		self.loaded = False
+		self.time_zone = None
+		# (next execution in system time zone of site, job type name)
+		self.heap: list[tuple[datetime, str]] = []
+
+	def load(self):
+		"""Build schedule from scheduled job types of current site."""
+		self.time_zone = get_system_timezone()
+		self.heap = []
+		for job_type in frappe.get_all("Scheduled Job Type", filters={"stopped": 0}, fields="*"):
+			self.add(frappe.get_doc(doctype="Scheduled Job Type", **job_type))
+		self.loaded = True
+
+	def add(self, job_type, last_execution: datetime | None = None):
+		if last_execution:
+			job_type.last_execution = last_execution
+
+		try:
+			heapq.heappush(self.heap, (job_type.get_next_execution(), job_type.name))
+		except CroniterBadCronError:
+			frappe.logger("scheduler").error(
+				f"Invalid Job on {frappe.local.site} - {job_type.name}", exc_info=True
+			)
+
+	def now(self) -> datetime:
+		return convert_utc_to_timezone(datetime.now(pytz.UTC), self.time_zone).replace(tzinfo=None)
+
+	def is_due(self) -> bool:
+		return not self.loaded or bool(self.heap and self.heap[0][0] <= self.now())
+
+	def pop_due(self) -> list[str]:
+		"""Remove job types that are due from schedule and return their names."""
+		now = self.now()
+		due = []
+		while self.heap and self.heap[0][0] <= now:
+			due.append(heapq.heappop(self.heap)[1])
+		return due
+
 
 def cprint(*args, **kwargs):
 	"""Prints only if called from STDOUT"""
@@ -78,18 +143,60 @@ def enqueue_events_for_all_sites() -> None:
 
 	with frappe.init_site():
 		sites = get_sites()
+		versions = get_schedule_versions(sites)
 
 	# Sites are sorted in alphabetical order, shuffle to randomize priorities
 	random.shuffle(sites)
 
 	for site in sites:
+		schedule = _site_schedules.get(site)
+		if schedule is None or schedule.version != versions.get(site):
+			schedule = _site_schedules[site] = SiteSchedule(versions.get(site))
+		elif not schedule.is_due():
+			continue
+
 		try:
-			enqueue_events_for_site(site=site)
+			enqueue_events_for_site(site=site, schedule=schedule)
 		except Exception:
 			frappe.logger("scheduler").debug(f"Failed to enqueue events for site: {site}", exc_info=True)
 
+	for site in set(_site_schedules).difference(sites):
+		del _site_schedules[site]
+
+
+def get_schedule_versions(sites: list[str]) -> dict[str, bytes | None]:
+	if not sites:
+		return {}
+
+	try:
+		return dict(zip(sites, frappe.cache.hmget(SCHEDULE_VERSION_KEY, sites), strict=True))
+	except redis.exceptions.ConnectionError:
+		return {}
+
+
+def bump_schedule_version():
+	"""Make scheduler process rebuild schedule of current site on its next tick, once the current
+	transaction is committed."""
+	# a schedule rebuilt before commit would be read from old rows and kept till the next bump
+	if not frappe.flags.schedule_version_bump_pending:
+		frappe.flags.schedule_version_bump_pending = True
+		frappe.db.after_commit.add(_bump_schedule_version)
+		frappe.db.after_rollback.add(_forget_schedule_version_bump)
+
+
+def _bump_schedule_version():
+	_forget_schedule_version_bump()
+	try:
+		frappe.cache.hincrby(SCHEDULE_VERSION_KEY, frappe.local.site, 1)
+	except redis.exceptions.ConnectionError:
+		pass
 
-def enqueue_events_for_site(site: str) -> None:
+
+def _forget_schedule_version_bump():
+	frappe.flags.pop("schedule_version_bump_pending", None)
+
+
+def enqueue_events_for_site(site: str, schedule: SiteSchedule | None = None) -> None:
 	def log_exc():
 		frappe.logger("scheduler").error(f"Exception in Enqueue Events for Site {site}", exc_info=True)
 
@@ -99,7 +206,10 @@ def enqueue_events_for_site(site: str) -> None:
 		if is_scheduler_inactive():
 			return
 
-		enqueue_events(site=site)
+		if schedule is None:
+			enqueue_events(site=site)
+		else:
+			enqueue_due_events(schedule)
 
 		frappe.logger("scheduler").debug(f"Queued events for site {site}")
 	except Exception as e:
@@ -129,6 +239,54 @@ def enqueue_events(site: str) -> list[str] | None:
 		return enqueued_jobs
 
 
+def enqueue_due_events(schedule: SiteSchedule) -> list[str] | None:
+	"""Enqueue job types of current site that are due as per `schedule`.
+
+	Unlike `enqueue_events`, only due job types are read from database and checked in queue."""
+	if not schedule.loaded:
+		schedule.load()
+
+	if not schedule_jobs_based_on_activity():
+		return
+
+	due = schedule.pop_due()
+	if not due:
+		return []
+
+	enqueued_jobs = []
+	now = now_datetime()
+	pending = set(due)
+	try:
+		for job_type in frappe.get_all(
+			"Scheduled Job Type", filters={"name": ("in", due), "stopped": 0}, fields="*"
+		):
+			job_type = frappe.get_doc(doctype="Scheduled Job Type", **job_type)
+			try:
+				if job_type.enqueue():
+					enqueued_jobs.append(job_type.method)
+					schedule.add(job_type, last_execution=now)
+				elif job_type.is_event_due(now):
+					# previous run is still queued, check again on next tick
+					heapq.heappush(schedule.heap, (now, job_type.name))
+				else:
+					schedule.add(job_type)
+			except CroniterBadCronError:
+				frappe.logger("scheduler").error(
+					f"Invalid Job on {frappe.local.site} - {job_type.name}", exc_info=True
+				)
+			pending.discard(job_type.name)
+
+		# the rest are stopped or deleted
+		pending.clear()
+	finally:
+		# job types not handled because of an error (e.g. redis or database down) are retried on
+		# next tick instead of dropping out of the schedule
+		for name in pending:
+			heapq.heappush(schedule.heap, (now, name))
+
+	return enqueued_jobs
+
+
 def is_scheduler_inactive(verbose=True) -> bool:
 	if frappe.local.conf.maintenance_mode:
 		if verbose:
@@ -0,0 +1,223 @@
+# Copyright (c) 2015, Nexelya Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+"""
+Export rows to CSV or XLSX files without keeping all of them in memory.
+
+Writers take rows in batches and write them to a temporary file, which stays in memory while it
+is small and moves to disk once it grows. Small files are sent in one piece as before, larger
+files are streamed to the browser in chunks straight from disk.
+
+Exports with more rows than `export_background_threshold` (site config, default 100000) can
+be run in a background job with `enqueue_export`, which saves the file as a private File and
+notifies the user when it is ready.
+"""
+
+import csv
+import hashlib
+import os
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from tempfile import SpooledTemporaryFile
+from typing import IO
+
+import openpyxl
+
+import frappe
+from frappe import _
+from frappe.utils import get_files_path, get_hook_method
+from frappe.utils.xlsxutils import create_sheet, get_clean_row
+
+# rows read from the database at once
+EXPORT_BATCH_SIZE = 1000
+# files up to this size are kept in memory and sent in one piece
+SPOOL_MAX_SIZE = 1024 * 1024
+# bytes copied at once when saving an export file
+COPY_CHUNK_SIZE = 64 * 1024
+DEFAULT_BACKGROUND_THRESHOLD = 100_000
+
+
+class ExportWriter(ABC):
+	"""Writes rows to a temporary file."""
+
+	extension: str
+
+	def __init__(self):
+		self.file = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+		self.rows = 0
+		self.size = 0
+
+	@abstractmethod
+	def write_rows(self, rows: Iterable[list]):
+		"""Write `rows` (lists of cell values) to the file."""
+
+	def close(self) -> IO[bytes]:
+		"""Finish the file and return it, positioned at the start."""
+		self.size = self.file.tell()
+		self.file.seek(0)
+		return self.file
+
+
+class CSVWriter(ExportWriter):
+	extension = "csv"
+
+	def __init__(self, csv_params: dict | None = None):
+		super().__init__()
+		self.writer = csv.writer(_EncodedFile(self.file), **(csv_params or {"quoting": csv.QUOTE_NONNUMERIC}))
+
+	def write_rows(self, rows: Iterable[list]):
+		for row in rows:
+			self.writer.writerow(row)
+			self.rows += 1
+
+
+class XLSXWriter(ExportWriter):
+	extension = "xlsx"
+
+	def __init__(self, sheet_name: str, column_widths: list | None = None):
+		super().__init__()
+		self.sheet_name = sheet_name
+		# write-only worksheets keep appended rows in a temporary file till the workbook is saved
+		self.workbook = openpyxl.Workbook(write_only=True)
+		self.sheet = create_sheet(self.workbook, sheet_name, column_widths)
+
+	def write_rows(self, rows: Iterable[list]):
+		for row in rows:
+			self.sheet.append(get_clean_row(row, self.sheet_name))
+			self.rows += 1
+
+	def close(self) -> IO[bytes]:
+		self.workbook.save(self.file)
+		return super().close()
+
+
+class _EncodedFile:
+	"""Binary file that `csv.writer` can write text to."""
+
+	def __init__(self, file: IO[bytes]):
+		self.file = file
+
+	def write(self, text: str) -> int:
+		return self.file.write(text.encode("utf-8"))
+
+
+def get_export_writer(
+	file_type: str, sheet_name: str, column_widths: list | None = None, csv_params: dict | None = None
+) -> ExportWriter:
+	""":param file_type: One of 'CSV' or 'Excel'"""
+	if file_type == "Excel":
+		return XLSXWriter(sheet_name, column_widths=column_widths)
+	return CSVWriter(csv_params)
+
+
+def send_export(writer: ExportWriter, filename: str) -> None:
+	"""Send export file as response, streamed from disk if it is too large to keep in memory."""
+	from frappe.desk.utils import provide_binary_file
+
+	file = writer.close()
+	if writer.size <= SPOOL_MAX_SIZE:
+		provide_binary_file(filename, writer.extension, file.read())
+		file.close()
+		return
+
+	frappe.response["type"] = "stream"
+	frappe.response["filecontent"] = file
+	frappe.response["filename"] = f"{_(filename)}.{writer.extension}"
+
+
+def is_large_export(rows: int) -> bool:
+	return rows > (frappe.conf.export_background_threshold or DEFAULT_BACKGROUND_THRESHOLD)
+
+
+def enqueue_export(export_method: str, filename: str, **export_kwargs) -> None:
+	"""Run export in a background job and notify the user when the file is ready.
+
+	:param export_method: Dotted path of function that returns an `ExportWriter` with all rows written.
+	:param filename: File name without extension.
+	"""
+	frappe.enqueue(
+		run_export,
+		queue="long",
+		export_method=export_method,
+		filename=filename,
+		export_kwargs=export_kwargs,
+		now=frappe.flags.in_test,
+	)
+	# exports are downloaded by posting a form to a new tab, which can't show a message
+	frappe.respond_as_web_page(
+		_("Export Started"),
+		_("The export will run in the background. You will be notified when the file is ready."),
+		indicator_color="green",
+		primary_action="/app",
+		primary_label=_("Continue"),
+	)
+
+
+def run_export(export_method: str, filename: str, export_kwargs: dict):
+	writer = frappe.get_attr(export_method)(**export_kwargs)
+	file = save_export(writer, filename)
+
+	from frappe.desk.doctype.notification_log.notification_log import enqueue_create_notification
+
+	enqueue_create_notification(
+		frappe.session.user,
+		{
+			"type": "Alert",
+			"document_type": "File",
+			"document_name": file.name,
+			"subject": _("Export {0} is ready to download").format(frappe.bold(file.file_name)),
+			"email_content": f'<a href="{file.file_url}">{file.file_name}</a>',
+		},
+	)
+
+
+def save_export(writer: ExportWriter, filename: str, **file_fields):
+	"""Save export file as a private File of the current user.
+
+	The file is copied to the private files folder in chunks instead of being read into memory,
+	unless files are stored elsewhere by a `write_file` hook.
+
+	:param file_fields: other fields of the File, like `attached_to_doctype`.
+	"""
+	from frappe.core.doctype.file.utils import generate_file_name
+
+	file_name = re.sub(r"[/\\%?#]", "_", f"{filename}.{writer.extension}")
+	with writer.close() as file:
+		if get_hook_method("write_file"):
+			return frappe.get_doc(
+				{
+					"doctype": "File",
+					"file_name": file_name,
+					"is_private": 1,
+					"content": file.read(),
+					**file_fields,
+				}
+			).insert(ignore_permissions=True)
+
+		file_name = generate_file_name(file_name, is_private=True)
+		file_path = get_files_path(file_name, is_private=True)
+		content_hash = hashlib.md5(usedforsecurity=False)  # nosec
+		with open(file_path, "wb") as f:
+			while chunk := file.read(COPY_CHUNK_SIZE):
+				content_hash.update(chunk)
+				f.write(chunk)
+
+	file_doc = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"file_url": f"/private/files/{file_name}",
+			"is_private": 1,
+			"file_size": writer.size,
+			"content_hash": content_hash.hexdigest(),
+			**file_fields,
+		}
+	)
+	file_doc.flags.written_to_disk = True
+	file_doc.flags.ignore_duplicate_entry_error = True
+	try:
+		return file_doc.insert(ignore_permissions=True)
+	except Exception:
+		if os.path.exists(file_path):
+			os.remove(file_path)
+		raise
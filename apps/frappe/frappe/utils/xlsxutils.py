@@ -18,39 +18,46 @@ ILLEGAL_CHARACTERS_RE = re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
 
 # return xlsx file object
 def make_xlsx(data, sheet_name, wb=None, column_widths=None):
-	column_widths = column_widths or []
 	if wb is None:
 		wb = openpyxl.Workbook(write_only=True)
 
+	ws = create_sheet(wb, sheet_name, column_widths)
+	for row in data:
+		ws.append(get_clean_row(row, sheet_name))
+
+	xlsx_file = BytesIO()
+	wb.save(xlsx_file)
+	return xlsx_file
+
+
+def create_sheet(wb, sheet_name, column_widths=None):
 	sheet_name_sanitized = INVALID_TITLE_REGEX.sub(" ", sheet_name)
 	ws = wb.create_sheet(sheet_name_sanitized, 0)
 
-	for i, column_width in enumerate(column_widths):
+	for i, column_width in enumerate(column_widths or []):
 		if column_width:
 			ws.column_dimensions[get_column_letter(i + 1)].width = column_width
 
 	row1 = ws.row_dimensions[1]
 	row1.font = Font(name="Calibri", bold=True)
+	return ws
 
-	for row in data:
-		clean_row = []
-		for item in row:
-			if isinstance(item, str) and (sheet_name not in ["Data Import Template", "Data Export"]):
-				value = handle_html(item)
-			else:
-				value = item
 
-			if isinstance(item, str) and next(ILLEGAL_CHARACTERS_RE.finditer(value), None):
-				# Remove illegal characters from the string
-				value = ILLEGAL_CHARACTERS_RE.sub("", value)
+def get_clean_row(row, sheet_name):
+	clean_row = []
+	for item in row:
+		if isinstance(item, str) and (sheet_name not in ["Data Import Template", "Data Export"]):
+			value = handle_html(item)
+		else:
+			value = item
 
-			clean_row.append(value)
+		if isinstance(item, str) and next(ILLEGAL_CHARACTERS_RE.finditer(value), None):
+			# Remove illegal characters from the string
+			value = ILLEGAL_CHARACTERS_RE.sub("", value)
 
-		ws.append(clean_row)
+		clean_row.append(value)
 
-	xlsx_file = BytesIO()
-	wb.save(xlsx_file)
-	return xlsx_file
+	return clean_row
 
 
 def handle_html(data):